@@ -0,0 +1,26 @@
+"""add lease columns to tasks
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("claimed_by", sa.String(), nullable=True))
+    op.add_column("tasks", sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("tasks", "lease_expires_at")
+    op.drop_column("tasks", "claimed_by")
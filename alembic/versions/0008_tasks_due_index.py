@@ -0,0 +1,34 @@
+"""add partial index for due-task polling
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:01
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with auto.scheduler.CLAIMABLE_STATUSES; the poll query renders
+# the same literal predicate so planners can match the partial index.
+CLAIMABLE_PREDICATE = "status IN ('pending', 'error', 'running')"
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tasks_status_scheduled_at",
+        "tasks",
+        ["status", "scheduled_at"],
+        postgresql_where=sa.text(CLAIMABLE_PREDICATE),
+        sqlite_where=sa.text(CLAIMABLE_PREDICATE),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_status_scheduled_at", table_name="tasks")
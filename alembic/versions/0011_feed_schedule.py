@@ -0,0 +1,31 @@
+"""add per-feed polling state
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 00:00:04
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0011"
+down_revision: Union[str, Sequence[str], None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("feeds", sa.Column("poll_interval", sa.Integer(), nullable=True))
+    op.add_column("feeds", sa.Column("last_success_at", sa.DateTime(), nullable=True))
+    op.add_column(
+        "feeds",
+        sa.Column("error_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("feeds", "error_count")
+    op.drop_column("feeds", "last_success_at")
+    op.drop_column("feeds", "poll_interval")
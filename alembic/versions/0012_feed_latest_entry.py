@@ -0,0 +1,24 @@
+"""add feeds.latest_entry_at for streaming ingestion
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:00:05
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0012"
+down_revision: Union[str, Sequence[str], None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("feeds", sa.Column("latest_entry_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("feeds", "latest_entry_at")
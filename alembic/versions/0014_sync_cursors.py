@@ -0,0 +1,34 @@
+"""add sync_cursors table for incremental syncs
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18 00:00:07
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0014"
+down_revision: Union[str, Sequence[str], None] = "0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_cursors",
+        sa.Column("name", sa.String(), primary_key=True, nullable=False),
+        sa.Column("position", sa.String(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sync_cursors")
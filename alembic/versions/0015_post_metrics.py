@@ -0,0 +1,58 @@
+"""add post_metrics table and engagement columns on post_status
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-18 00:00:08
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0015"
+down_revision: Union[str, Sequence[str], None] = "0014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+METRICS_DUE_PREDICATE = "metrics_due_at IS NOT NULL"
+
+
+def upgrade() -> None:
+    op.add_column("post_status", sa.Column("remote_id", sa.String(), nullable=True))
+    op.add_column(
+        "post_status", sa.Column("published_at", sa.DateTime(), nullable=True)
+    )
+    op.add_column(
+        "post_status", sa.Column("metrics_due_at", sa.DateTime(), nullable=True)
+    )
+    op.create_index(
+        "ix_post_status_metrics_due_at",
+        "post_status",
+        ["metrics_due_at"],
+        postgresql_where=sa.text(METRICS_DUE_PREDICATE),
+        sqlite_where=sa.text(METRICS_DUE_PREDICATE),
+    )
+    op.create_table(
+        "post_metrics",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("post_id", sa.String(), sa.ForeignKey("posts.id"), nullable=False),
+        sa.Column("network", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.Column("collected_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_post_metrics_series",
+        "post_metrics",
+        ["post_id", "network", "name", "collected_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_post_metrics_series", table_name="post_metrics")
+    op.drop_table("post_metrics")
+    op.drop_index("ix_post_status_metrics_due_at", table_name="post_status")
+    op.drop_column("post_status", "metrics_due_at")
+    op.drop_column("post_status", "published_at")
+    op.drop_column("post_status", "remote_id")
@@ -0,0 +1,27 @@
+"""add content_hash to instagram_pipeline_concepts
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-18 00:00:09
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0016"
+down_revision: Union[str, Sequence[str], None] = "0015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "instagram_pipeline_concepts",
+        sa.Column("content_hash", sa.String(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("instagram_pipeline_concepts", "content_hash")
@@ -0,0 +1,136 @@
+"""Content-addressed storage for exported artifacts.
+
+Files are stored once as blobs named by their SHA-256 digest under
+``blobs/<first two hex digits>/`` and grouped by small JSON manifests under
+``manifests/`` that map file names to digests. Identical files are shared,
+unchanged blobs and manifests are never rewritten, and every write goes
+through a temporary file and :func:`os.replace` so readers never see partial
+files. :meth:`ArtifactStore.gc` removes blobs no manifest refers to.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# ``os.umask`` can only be read by setting it, so read it once at import.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            # mkstemp creates 0600 files; give them the mode open() would.
+            os.fchmod(fh.fileno(), 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class ArtifactStore:
+    """Blobs and manifests below ``root``."""
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.manifest_dir = self.root / "manifests"
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def manifest_path(self, name: str) -> Path:
+        return self.manifest_dir / f"{name}.json"
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` unless an identical blob exists; return its digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        try:
+            # Refresh the mtime so ``gc`` treats the blob as recently written.
+            os.utime(path)
+        except FileNotFoundError:
+            _atomic_write(path, data)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        return self.blob_path(digest).read_bytes()
+
+    def write_manifest(
+        self, name: str, files: dict[str, bytes], **metadata: Any
+    ) -> bool:
+        """Store ``files`` and point manifest ``name`` at them.
+
+        Returns False when the manifest already had this content and was left
+        untouched.
+        """
+        manifest = {
+            **metadata,
+            "files": {filename: self.put(data) for filename, data in files.items()},
+        }
+        encoded = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        path = self.manifest_path(name)
+        if path.exists() and path.read_bytes() == encoded:
+            return False
+        _atomic_write(path, encoded)
+        return True
+
+    def read_manifest(self, name: str) -> Optional[dict[str, Any]]:
+        path = self.manifest_path(name)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def read_file(self, name: str, filename: str) -> bytes:
+        """Return ``filename`` from manifest ``name``."""
+        manifest = self.read_manifest(name)
+        if manifest is None or filename not in manifest["files"]:
+            raise FileNotFoundError(f"{filename} not in manifest {name}")
+        return self.get(manifest["files"][filename])
+
+    def _manifests(self) -> Iterator[dict[str, Any]]:
+        for path in self.manifest_dir.glob("*.json"):
+            try:
+                yield json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                # Collecting without this manifest could delete its blobs.
+                logger.error("Unreadable artifact manifest %s", path)
+                raise
+
+    def gc(self, *, grace_seconds: float = 3600, dry_run: bool = False) -> int:
+        """Delete blobs that no manifest references.
+
+        Blobs modified in the last ``grace_seconds`` are kept so a concurrent
+        export that has written its blobs but not yet its manifest is not
+        broken; leftover temporary files are collected the same way. With
+        ``dry_run`` nothing is deleted. Returns the number of unreferenced
+        blobs found.
+        """
+        referenced = {
+            digest
+            for manifest in self._manifests()
+            for digest in manifest.get("files", {}).values()
+        }
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        for path in self.blob_dir.glob("*/*"):
+            if path.name in referenced:
+                continue
+            if path.stat().st_mtime > cutoff:
+                continue
+            removed += 1
+            if not dry_run:
+                path.unlink()
+        return removed
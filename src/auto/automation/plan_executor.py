@@ -61,11 +61,10 @@ class StepExecutor:
 
     def _render(self, template: str) -> str:
         """Render a template string using variables from previous steps."""
-        from jinja2 import Template
+        from ..templating import render_template
 
         try:
-            tmpl = Template(template)
-            return tmpl.render(**self.variables)
+            return render_template(template, **self.variables)
         except Exception as e:
             logger.error(f"Template render failed for '{template}': {e}")
             return template
@@ -155,7 +154,7 @@ class StepExecutor:
                     if preview is None and step.post_id and step.network:
                         from ..db import SessionLocal
                         from ..models import Post, PostPreview
-                        from jinja2 import Template
+                        from ..templating import render_template
 
                         with SessionLocal() as session:
                             preview_obj = session.get(
@@ -164,8 +163,8 @@ class StepExecutor:
                             )
                             if preview_obj:
                                 post = session.get(Post, step.post_id)
-                                preview = Template(preview_obj.content).render(
-                                    post=post
+                                preview = render_template(
+                                    preview_obj.content, post=post
                                 )
                     if preview is None:
                         raise RuntimeError("preview text not found")
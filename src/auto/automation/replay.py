@@ -11,12 +11,11 @@ import time
 from pathlib import Path
 from typing import Optional
 
-from jinja2 import Template
-
 from ..db import SessionLocal
 from ..models import InstagramPipelineRun, PostPreview, Post, PostStatus
 from ..cli.helpers import _slow_print
 from ..html_helpers import fetch_dom as fetch_dom_html
+from ..templating import render_template
 from ..utils import project_root
 from .safari import SafariController
 
@@ -102,7 +101,7 @@ def replay_fixture(
 
     def _render(template: str) -> str:
         try:
-            return Template(template).render(**variables)
+            return render_template(template, **variables)
         except Exception:
             return template
 
@@ -241,11 +240,11 @@ def replay_fixture(
                 if isinstance(data, dict):
                     for key, value in data.items():
                         if isinstance(value, str):
-                            variables[key] = Template(value).render(post=post)
+                            variables[key] = render_template(value, post=post)
                     loaded = ", ".join(data.keys()) if data else ""
                     _slow_print(f"Preview loaded into variables: {loaded}")
                 else:
-                    variables["tweet"] = Template(raw).render(post=post)
+                    variables["tweet"] = render_template(raw, post=post)
                     _slow_print("Preview loaded into variables['tweet']")
             else:
                 logger.error("Post or preview not found")
@@ -8,8 +8,28 @@ from .helpers import add_async_command
 from auto import configure_logging
 
 
+def _profile_option(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Save a cProfile capture of the command to PROFILE_DIR.",
+    ),
+) -> None:
+    """Automate publishing Substack posts to social networks."""
+    from auto.config import get_profile_enabled
+    from auto.profiling import Profile
+
+    if not (profile or get_profile_enabled()):
+        return
+    capture = Profile(f"cli {ctx.invoked_subcommand or 'auto'}")
+    if capture.start():
+        ctx.call_on_close(capture.stop)
+
+
 def build_app() -> typer.Typer:
     app = typer.Typer()
+    app.callback()(_profile_option)
     add_async_command(app)
     app.add_typer(import_module("auto.cli.publish").app, name="publish")
     app.add_typer(import_module("auto.cli.automation").app, name="automation")
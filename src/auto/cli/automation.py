@@ -379,10 +379,10 @@ def _interactive_menu(
         variables = {}
 
     def _render(template: str) -> str:
-        from jinja2 import Template
+        from auto.templating import render_template
 
         try:
-            return Template(template).render(**variables)
+            return render_template(template, **variables)
         except Exception:
             return template
 
@@ -498,7 +498,7 @@ def _interactive_menu(
             network = input("Network [mastodon]: ").strip() or "mastodon"
             from auto.db import SessionLocal
             from auto.models import PostPreview, Post
-            from jinja2 import Template
+            from auto.templating import render_template
 
             with SessionLocal() as session:
                 preview = session.get(
@@ -526,11 +526,11 @@ def _interactive_menu(
                 if isinstance(data, dict):
                     for key, value in data.items():
                         if isinstance(value, str):
-                            variables[key] = Template(value).render(post=post)
+                            variables[key] = render_template(value, post=post)
                     loaded = ", ".join(data.keys()) if data else ""
                     logger.info("Preview loaded into variables: %s", loaded)
                 else:
-                    variables["tweet"] = Template(raw).render(post=post)
+                    variables["tweet"] = render_template(raw, post=post)
                     logger.info("Preview loaded into variables['tweet']")
                 collected.append(["load_post", post_id, network])
             else:
@@ -644,10 +644,10 @@ def replay(
         variables["network"] = network
 
     def _render(template: str) -> str:
-        from jinja2 import Template
+        from auto.templating import render_template
 
         try:
-            return Template(template).render(**variables)
+            return render_template(template, **variables)
         except Exception:
             return template
 
@@ -761,7 +761,7 @@ def replay(
         elif cmd == "load_post" and len(args) >= 2:
             from auto.db import SessionLocal
             from auto.models import PostPreview, Post
-            from jinja2 import Template
+            from auto.templating import render_template
 
             post_id = _render(args[0])
             network = _render(args[1])
@@ -792,11 +792,11 @@ def replay(
                 if isinstance(data, dict):
                     for key, value in data.items():
                         if isinstance(value, str):
-                            variables[key] = Template(value).render(post=post)
+                            variables[key] = render_template(value, post=post)
                     loaded = ", ".join(data.keys()) if data else ""
                     _slow_print(f"Preview loaded into variables: {loaded}")
                 else:
-                    variables["tweet"] = Template(raw).render(post=post)
+                    variables["tweet"] = render_template(raw, post=post)
                     _slow_print("Preview loaded into variables['tweet']")
             else:
                 typer.echo("Post or preview not found")
@@ -858,9 +858,11 @@ def queue_replay_fixture(name: str, post_id: str, network: str = "mastodon") ->
 
     from auto.db import SessionLocal
     from auto.models import Task
+    from auto.task_notify import notify_task_enqueued
 
     payload = json.dumps({"name": name, "post_id": post_id, "network": network})
     with SessionLocal() as session:
         session.add(Task(type="replay_fixture", payload=payload))
         session.commit()
+    notify_task_enqueued()
     typer.echo(f"Queued replay_fixture for {name}")
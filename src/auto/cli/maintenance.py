@@ -5,6 +5,7 @@ from __future__ import annotations
 import subprocess
 import os
 import sqlite3
+from typing import Optional
 
 import typer
 
@@ -69,6 +70,64 @@ def metrics(host: str = "localhost", port: int = 8000) -> None:
     subprocess.run(["curl", "-s", url], check=True)
 
 
+@app.command("archive-tasks")
+def archive_tasks(
+    older_than_days: Optional[float] = typer.Option(
+        None, help="Archive tasks finished this many days ago or earlier."
+    ),
+    batch_size: Optional[int] = typer.Option(
+        None, help="Number of tasks moved per transaction."
+    ),
+) -> None:
+    """Move old completed and failed tasks into ``tasks_archive``."""
+
+    from datetime import timedelta
+
+    from auto.config import (
+        get_max_attempts,
+        get_task_archive_batch_size,
+        get_task_retention_days,
+    )
+    from auto.db import SessionLocal
+    from auto.task_archive import archive_tasks as _archive_tasks
+
+    if older_than_days is None:
+        older_than_days = get_task_retention_days()
+    with SessionLocal() as session:
+        count = _archive_tasks(
+            session,
+            older_than=timedelta(days=older_than_days),
+            max_attempts=get_max_attempts(),
+            batch_size=batch_size or get_task_archive_batch_size(),
+        )
+    typer.echo(f"Archived {count} task(s)")
+
+
+@app.command("gc-artifacts")
+def gc_artifacts(
+    export_dir: Optional[str] = typer.Option(
+        None, help="Artifact store to clean (INSTAGRAM_PIPELINE_EXPORT_DIR)."
+    ),
+    grace_seconds: float = typer.Option(
+        3600, help="Keep unreferenced blobs written this recently."
+    ),
+    dry_run: bool = typer.Option(False, help="Only report unreferenced blobs."),
+) -> None:
+    """Delete exported artifact blobs that no manifest references."""
+
+    from auto.config import get_instagram_pipeline_export_dir
+    from auto.instagram_pipeline import get_instagram_pipeline_artifact_store
+
+    store = get_instagram_pipeline_artifact_store(
+        export_dir or get_instagram_pipeline_export_dir()
+    )
+    count = store.gc(grace_seconds=grace_seconds, dry_run=dry_run)
+    if dry_run:
+        typer.echo(f"Found {count} unreferenced blob(s)")
+    else:
+        typer.echo(f"Removed {count} unreferenced blob(s)")
+
+
 @app.command("dump-fixtures")
 def dump_fixtures(path: str = "tests/fixtures/db.sql") -> None:
     """Dump the SQLite schema and data to ``path``."""
@@ -10,8 +10,10 @@ import typer
 from sqlalchemy import select, case
 
 from auto.cli.helpers import _parse_when, add_async_command
+from auto.config import get_instagram_pipeline_batch_size
 from auto.db import SessionLocal
 from auto.models import Post, PostStatus, PostPreview, Task
+from auto.task_notify import notify_task_enqueued
 
 app = typer.Typer(help="Publishing commands")
 add_async_command(app)
@@ -123,6 +125,7 @@ def schedule(post_id: str, time: str, network: Optional[str] = None) -> None:
             task.last_error = None
             task.attempts = 0
         session.commit()
+    notify_task_enqueued()
     print(
         f"Scheduled {post_id} for {', '.join(networks)} at {scheduled_at.isoformat()}"
     )
@@ -130,12 +133,27 @@ def schedule(post_id: str, time: str, network: Optional[str] = None) -> None:
 
 @app.command("schedule-instagram-pipeline")
 def schedule_instagram_pipeline(
-    post_id: str,
+    post_id: Optional[str] = typer.Argument(None),
     time: str = "in 0s",
     pipeline_version: str = "v1",
     auto_publish: bool = False,
+    all_unpublished: bool = typer.Option(
+        False, help="Run the pipeline over every post not yet on Instagram"
+    ),
+    batch_size: Optional[int] = typer.Option(
+        None, help="Posts per batch task (INSTAGRAM_PIPELINE_BATCH_SIZE)"
+    ),
 ) -> None:
-    """Schedule an Instagram-native pipeline run task."""
+    """Schedule an Instagram-native pipeline run task.
+
+    With ``--all-unpublished`` every post without a published Instagram status
+    is queued in batch tasks of ``--batch-size`` posts instead of one task per
+    post.
+    """
+
+    if post_id is None and not all_unpublished:
+        print("Pass a post id or --all-unpublished")
+        return
 
     scheduled_at = _parse_when(time)
     if scheduled_at.tzinfo is None:
@@ -144,28 +162,61 @@ def schedule_instagram_pipeline(
         scheduled_at = scheduled_at.astimezone(timezone.utc)
 
     payload = {
-        "post_id": post_id,
         "network": "instagram",
         "pipeline_version": pipeline_version,
         "auto_publish": auto_publish,
     }
 
     with SessionLocal() as session:
-        if session.get(Post, post_id) is None:
+        if all_unpublished:
+            published = (
+                select(PostStatus.post_id)
+                .where(
+                    PostStatus.post_id == Post.id,
+                    PostStatus.network == "instagram",
+                    PostStatus.status == "published",
+                )
+                .exists()
+            )
+            post_ids = list(
+                session.scalars(
+                    select(Post.id).where(~published).order_by(Post.created_at, Post.id)
+                )
+            )
+            size = batch_size or get_instagram_pipeline_batch_size()
+            payloads = [
+                {**payload, "post_ids": post_ids[start : start + size]}
+                for start in range(0, len(post_ids), size)
+            ]
+        elif session.get(Post, post_id) is None:
             print(f"Post {post_id} not found")
             return
-
-        task = Task(
-            type="instagram_pipeline_run",
-            payload=json.dumps(payload),
-            scheduled_at=scheduled_at,
-            status="pending",
-            attempts=0,
-            last_error=None,
+        else:
+            post_ids = [post_id]
+            payloads = [{**payload, "post_id": post_id}]
+
+        session.add_all(
+            Task(
+                type="instagram_pipeline_run",
+                payload=json.dumps(task_payload),
+                scheduled_at=scheduled_at,
+                status="pending",
+                attempts=0,
+                last_error=None,
+            )
+            for task_payload in payloads
         )
-        session.add(task)
         session.commit()
-
+    if payloads:
+        notify_task_enqueued()
+
+    if all_unpublished:
+        print(
+            f"Scheduled instagram pipeline for {len(post_ids)} post(s) in "
+            f"{len(payloads)} batch task(s) at {scheduled_at.isoformat()} "
+            f"(version={pipeline_version}, auto_publish={auto_publish})"
+        )
+        return
     print(
         "Scheduled instagram pipeline for "
         f"{post_id} at {scheduled_at.isoformat()} (version={pipeline_version}, auto_publish={auto_publish})"
@@ -307,6 +358,49 @@ def generate_preview(
     print("Preview saved")
 
 
+@app.command("generate-previews")
+def generate_previews(
+    post_ids: Optional[list[str]] = typer.Argument(
+        None, help="Posts to generate previews for."
+    ),
+    network: str = "mastodon",
+    all_missing: bool = typer.Option(
+        False,
+        "--all-missing",
+        help="Generate previews for every scheduled post that has none.",
+    ),
+    use_llm: bool = True,
+    concurrency: Optional[int] = typer.Option(
+        None, help="LLM calls made at once (defaults to PREVIEW_CONCURRENCY)."
+    ),
+) -> None:
+    """Generate previews for many scheduled posts in one batch."""
+
+    import anyio
+    from functools import partial
+
+    from auto.preview import generate_previews as _generate_previews
+    from auto.preview import missing_preview_pairs
+
+    with SessionLocal() as session:
+        pairs = [(post_id, network) for post_id in post_ids or []]
+        if all_missing:
+            pairs += missing_preview_pairs(session)
+        if not pairs:
+            print("No previews to generate")
+            return
+        count = anyio.run(
+            partial(
+                _generate_previews,
+                session,
+                pairs,
+                use_llm=use_llm,
+                concurrency=concurrency,
+            )
+        )
+    print(f"Saved {count} previews")
+
+
 @app.command()
 def edit_preview(post_id: str, network: str = "mastodon") -> None:
     """Interactively edit a post preview."""
@@ -24,11 +24,92 @@ def get_database_url() -> str:
     return os.getenv("DATABASE_URL", "sqlite:///./substack.db")
 
 
+_SQLITE_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SQLITE_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def _env_choice(name: str, default: str, choices: set[str]) -> str:
+    load_env()
+    value = os.getenv(name, default).strip().upper()
+    if value not in choices:
+        raise ValueError(f"{name} must be one of {', '.join(sorted(choices))}")
+    return value
+
+
+def get_sqlite_journal_mode() -> str:
+    """Return the SQLite journal mode; WAL lets readers run beside a writer."""
+    return _env_choice("SQLITE_JOURNAL_MODE", "WAL", _SQLITE_JOURNAL_MODES)
+
+
+def get_sqlite_synchronous() -> str:
+    """Return the SQLite ``synchronous`` level."""
+    return _env_choice("SQLITE_SYNCHRONOUS", "NORMAL", _SQLITE_SYNCHRONOUS)
+
+
+def get_sqlite_busy_timeout() -> int:
+    """Return how many milliseconds SQLite waits for a lock before failing."""
+    load_env()
+    return max(0, int(os.getenv("SQLITE_BUSY_TIMEOUT", "30000")))
+
+
+def get_sqlite_cache_size() -> int:
+    """Return the SQLite page cache size per connection in KiB."""
+    load_env()
+    return max(0, int(os.getenv("SQLITE_CACHE_SIZE", "65536")))
+
+
+def get_sqlite_mmap_size() -> int:
+    """Return how many bytes of the SQLite file are memory-mapped."""
+    load_env()
+    return max(0, int(os.getenv("SQLITE_MMAP_SIZE", "268435456")))
+
+
+def get_db_pool_size() -> int:
+    """Return the number of pooled connections kept open for server databases."""
+    load_env()
+    return max(1, int(os.getenv("DB_POOL_SIZE", "5")))
+
+
+def get_db_max_overflow() -> int:
+    """Return how many connections may be opened beyond ``DB_POOL_SIZE``."""
+    load_env()
+    return max(0, int(os.getenv("DB_MAX_OVERFLOW", "10")))
+
+
+def get_db_pool_timeout() -> float:
+    """Return how long to wait for a pooled connection, in seconds."""
+    load_env()
+    return float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+
+def get_db_pool_recycle() -> int:
+    """Return the age in seconds after which pooled connections are replaced."""
+    load_env()
+    return int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+
+def get_db_pool_pre_ping() -> bool:
+    """Return True when pooled connections are checked before use."""
+    return _env_flag("DB_POOL_PRE_PING", "1")
+
+
 def get_feed_url() -> str:
     load_env()
     return os.getenv("SUBSTACK_FEED_URL", DEFAULT_FEED_URL)
 
 
+def get_feed_urls() -> list[str]:
+    """Return every feed to ingest.
+
+    ``SUBSTACK_FEED_URLS`` holds a comma-separated list of feeds. When it is
+    unset the single ``SUBSTACK_FEED_URL`` is used.
+    """
+    load_env()
+    raw = os.getenv("SUBSTACK_FEED_URLS", "")
+    urls = [url.strip() for url in raw.split(",") if url.strip()]
+    return list(dict.fromkeys(urls)) or [get_feed_url()]
+
+
 def get_mastodon_instance() -> str:
     load_env()
     return os.getenv("MASTODON_INSTANCE", "https://mastodon.social")
@@ -44,23 +125,244 @@ def get_poll_interval() -> int:
     return int(os.getenv("SCHEDULER_POLL_INTERVAL", "5"))
 
 
+def _env_mapping(name: str, default: str = "") -> dict[str, str]:
+    """Parse a comma-separated ``key=value`` list from ``name``."""
+    load_env()
+    raw = os.getenv(name, default)
+    mapping: dict[str, str] = {}
+    for item in raw.split(","):
+        key, sep, value = item.partition("=")
+        if sep and key.strip() and value.strip():
+            mapping[key.strip()] = value.strip()
+    return mapping
+
+
+def get_scheduler_concurrency() -> int:
+    """Return the maximum number of tasks the scheduler runs at once."""
+    load_env()
+    return max(1, int(os.getenv("SCHEDULER_CONCURRENCY", "1")))
+
+
+def get_scheduler_task_limits() -> dict[str, int]:
+    """Return per-task-type concurrency caps.
+
+    ``SCHEDULER_TASK_LIMITS`` holds ``type=limit`` pairs such as
+    ``ingest_feed=1,publish_post=4``. Replays drive a single Safari window so
+    they are capped at one unless overridden.
+    """
+    limits = _env_mapping("SCHEDULER_TASK_LIMITS", "replay_fixture=1")
+    return {name: max(1, int(value)) for name, value in limits.items()}
+
+
+def get_scheduler_event_driven() -> bool:
+    """Return True when the scheduler sleeps until the next due task."""
+    return _env_flag("SCHEDULER_EVENT_DRIVEN", "1")
+
+
+def get_scheduler_max_sleep() -> float:
+    """Return the longest an event-driven scheduler sleeps between checks."""
+    load_env()
+    return float(os.getenv("SCHEDULER_MAX_SLEEP", "300"))
+
+
+def get_scheduler_doorbell_dir() -> Optional[str]:
+    """Return the directory used to wake SQLite schedulers across processes."""
+    load_env()
+    return os.getenv("SCHEDULER_DOORBELL_DIR") or None
+
+
+def get_scheduler_batch_size() -> int:
+    """Return the maximum number of tasks claimed per scheduler iteration."""
+    load_env()
+    return max(1, int(os.getenv("SCHEDULER_BATCH_SIZE", "50")))
+
+
+def get_scheduler_lease_seconds() -> int:
+    """Return how long a claimed task stays leased to one scheduler."""
+    load_env()
+    return max(1, int(os.getenv("SCHEDULER_LEASE_SECONDS", "300")))
+
+
 def get_ingest_interval() -> int:
     """Return the delay in seconds between automatic feed ingestions."""
     load_env()
     return int(os.getenv("INGEST_INTERVAL", "600"))
 
 
+def get_ingest_concurrency() -> int:
+    """Return how many feeds one ingestion run fetches at once."""
+    load_env()
+    return max(1, int(os.getenv("INGEST_CONCURRENCY", "8")))
+
+
+def get_ingest_streaming() -> bool:
+    """Return True when feeds are parsed incrementally while downloading."""
+    return _env_flag("INGEST_STREAMING", "0")
+
+
 def get_replay_check_interval() -> int:
     """Return the delay in seconds between replay status scans."""
     load_env()
     return int(os.getenv("REPLAY_CHECK_INTERVAL", "3600"))
 
 
+def get_task_retention_days() -> float:
+    """Return how many days finished tasks stay in the ``tasks`` table."""
+    load_env()
+    return float(os.getenv("TASK_RETENTION_DAYS", "7"))
+
+
+def get_task_archive_interval() -> int:
+    """Return the delay in seconds between automatic task archival runs."""
+    load_env()
+    return int(os.getenv("TASK_ARCHIVE_INTERVAL", "86400"))
+
+
+def get_metrics_harvest_interval() -> int:
+    """Return the delay in seconds between engagement harvest runs."""
+    load_env()
+    return int(os.getenv("METRICS_HARVEST_INTERVAL", "300"))
+
+
+def get_metrics_poll_tiers() -> list[tuple[float, float]]:
+    """Return ``(max_age, interval)`` pairs in seconds for engagement polling.
+
+    ``METRICS_POLL_TIERS`` holds ``age=interval`` pairs such as the default
+    ``3600=300,86400=3600,604800=21600``: posts younger than an hour are polled
+    every five minutes, younger than a day hourly and younger than a week every
+    six hours. Older posts are no longer polled.
+    """
+    tiers = _env_mapping("METRICS_POLL_TIERS", "3600=300,86400=3600,604800=21600")
+    return sorted((float(age), float(interval)) for age, interval in tiers.items())
+
+
+def get_metrics_concurrency() -> int:
+    """Return how many engagement fetches run at once."""
+    load_env()
+    return max(1, int(os.getenv("METRICS_CONCURRENCY", "8")))
+
+
+def get_tracing_enabled() -> bool:
+    """Return True when OpenTelemetry spans should be recorded."""
+    return _env_flag("TRACING_ENABLED", "0")
+
+
+def get_profile_enabled() -> bool:
+    """Return True when scheduler runs and CLI commands are profiled."""
+    return _env_flag("PROFILE_ENABLED", "0")
+
+
+def get_profile_dir() -> str:
+    """Return the directory that receives ``.pstats`` profiles."""
+    load_env()
+    return os.getenv("PROFILE_DIR", "artifacts/profiles")
+
+
+def get_profile_threshold_ms() -> float:
+    """Return the minimum duration in milliseconds of a saved profile."""
+    load_env()
+    return float(os.getenv("PROFILE_THRESHOLD_MS", "500"))
+
+
+def get_profile_scope() -> str:
+    """Return whether the scheduler profiles whole iterations or each handler."""
+    return _env_choice("PROFILE_SCOPE", "iteration", {"ITERATION", "HANDLER"}).lower()
+
+
+def get_metrics_reconcile_interval() -> float:
+    """Return seconds between full recomputations of the ``/metrics`` gauges."""
+    load_env()
+    return float(os.getenv("METRICS_RECONCILE_INTERVAL", "60"))
+
+
+def get_metrics_batch_size() -> int:
+    """Return how many published posts one harvest run polls at most."""
+    load_env()
+    return max(1, int(os.getenv("METRICS_BATCH_SIZE", "200")))
+
+
+def get_task_archive_batch_size() -> int:
+    """Return how many tasks are archived per transaction."""
+    load_env()
+    return max(1, int(os.getenv("TASK_ARCHIVE_BATCH_SIZE", "500")))
+
+
+def get_http_timeout() -> float:
+    """Return the timeout in seconds for outbound HTTP requests."""
+    load_env()
+    return float(os.getenv("HTTP_TIMEOUT", "10"))
+
+
+def get_http_max_connections() -> int:
+    """Return the size of the shared HTTP connection pool."""
+    load_env()
+    return max(1, int(os.getenv("HTTP_MAX_CONNECTIONS", "100")))
+
+
+def get_http_max_keepalive() -> int:
+    """Return how many idle HTTP connections are kept alive for reuse."""
+    load_env()
+    return max(0, int(os.getenv("HTTP_MAX_KEEPALIVE", "20")))
+
+
+def get_http_max_per_host() -> int:
+    """Return the maximum number of concurrent requests to a single host."""
+    load_env()
+    return max(1, int(os.getenv("HTTP_MAX_PER_HOST", "10")))
+
+
 def get_post_delay() -> float:
     load_env()
     return float(os.getenv("POST_DELAY", "1"))
 
 
+def get_publish_delay(network: str) -> float:
+    """Return the minimum seconds between posts to ``network``.
+
+    ``PUBLISH_NETWORK_DELAYS`` holds ``network=seconds`` overrides such as
+    ``mastodon=2,medium=60``; other networks use ``POST_DELAY``.
+    """
+    delays = _env_mapping("PUBLISH_NETWORK_DELAYS")
+    if network in delays:
+        return float(delays[network])
+    return get_post_delay()
+
+
+def get_template_cache_size() -> int:
+    """Return how many compiled templates are kept in memory."""
+    load_env()
+    return max(1, int(os.getenv("TEMPLATE_CACHE_SIZE", "512")))
+
+
+def get_template_sandbox() -> bool:
+    """Return True when templates render in Jinja's sandboxed environment."""
+    return _env_flag("TEMPLATE_SANDBOX", "0")
+
+
+def get_preview_model() -> str:
+    """Return the LLM model used to write post previews."""
+    load_env()
+    return os.getenv("PREVIEW_LLM_MODEL", "ollama_chat/gemma3:12b")
+
+
+def get_preview_api_base() -> str:
+    """Return the API base URL of the preview LLM."""
+    load_env()
+    return os.getenv("PREVIEW_LLM_API_BASE", "http://localhost:11434")
+
+
+def get_preview_concurrency() -> int:
+    """Return how many preview LLM calls a batch runs at once."""
+    load_env()
+    return max(1, int(os.getenv("PREVIEW_CONCURRENCY", "4")))
+
+
+def get_publish_burst() -> int:
+    """Return how many posts a network may send back to back."""
+    load_env()
+    return max(1, int(os.getenv("PUBLISH_BURST", "1")))
+
+
 def get_max_attempts() -> int:
     load_env()
     return int(os.getenv("MAX_ATTEMPTS", "3"))
@@ -115,3 +417,48 @@ def get_instagram_pipeline_export_enabled() -> bool:
 def get_instagram_pipeline_export_dir() -> str:
     load_env()
     return os.getenv("INSTAGRAM_PIPELINE_EXPORT_DIR", "artifacts/instagram_pipeline")
+
+
+def get_instagram_pipeline_batch_size() -> int:
+    """Return how many posts a batch pipeline run commits at a time."""
+    load_env()
+    return max(1, int(os.getenv("INSTAGRAM_PIPELINE_BATCH_SIZE", "100")))
+
+
+def get_instagram_pipeline_workers() -> int:
+    """Return the pool size for batch concept generation and scoring."""
+    load_env()
+    return max(1, int(os.getenv("INSTAGRAM_PIPELINE_WORKERS", "4")))
+
+
+def get_instagram_pipeline_executor() -> str:
+    """Return ``THREAD`` or ``PROCESS``, the pool type for batch runs."""
+    return _env_choice("INSTAGRAM_PIPELINE_EXECUTOR", "thread", {"THREAD", "PROCESS"})
+
+
+def get_instagram_scoring_weights() -> dict[str, float]:
+    """Return the ``visual``/``engagement``/``risk`` concept score weights.
+
+    ``INSTAGRAM_SCORING_WEIGHTS`` overrides any of the defaults
+    ``visual=0.45,engagement=0.4,risk=0.15``.
+    """
+    weights = {"visual": 0.45, "engagement": 0.4, "risk": 0.15}
+    for name, value in _env_mapping("INSTAGRAM_SCORING_WEIGHTS").items():
+        if name not in weights:
+            raise ValueError(
+                "INSTAGRAM_SCORING_WEIGHTS keys must be visual, engagement or risk"
+            )
+        weights[name] = float(value)
+    return weights
+
+
+def get_artifact_export_workers() -> int:
+    """Return how many threads write artifact exports."""
+    load_env()
+    return max(1, int(os.getenv("ARTIFACT_EXPORT_WORKERS", "2")))
+
+
+def get_artifact_export_backlog() -> int:
+    """Return how many artifact exports may be queued before callers wait."""
+    load_env()
+    return max(1, int(os.getenv("ARTIFACT_EXPORT_BACKLOG", "256")))
@@ -1,32 +1,204 @@
 """Database utilities for creating engines and sessions."""
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+import asyncio
+from typing import Any, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.pool import NullPool
 
-from .config import get_database_url
+from .config import (
+    get_database_url,
+    get_db_max_overflow,
+    get_db_pool_pre_ping,
+    get_db_pool_recycle,
+    get_db_pool_size,
+    get_db_pool_timeout,
+    get_sqlite_busy_timeout,
+    get_sqlite_cache_size,
+    get_sqlite_journal_mode,
+    get_sqlite_mmap_size,
+    get_sqlite_synchronous,
+)
 
 _engine: Engine | None = None
+_session_factory: Optional[sessionmaker] = None
+# Async engines hold connections tied to one event loop, so they are cached
+# per (sync engine, loop) pair.
+_async_engines: dict[
+    tuple[Engine, asyncio.AbstractEventLoop],
+    tuple[AsyncEngine, async_sessionmaker],
+] = {}
+
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def sqlite_pragmas(database: Optional[str]) -> list[str]:
+    """Return the ``PRAGMA`` statements run on each new SQLite connection."""
+    pragmas = [
+        f"PRAGMA busy_timeout = {get_sqlite_busy_timeout()}",
+        f"PRAGMA synchronous = {get_sqlite_synchronous()}",
+        # Negative values are KiB rather than pages.
+        f"PRAGMA cache_size = -{get_sqlite_cache_size()}",
+        f"PRAGMA mmap_size = {get_sqlite_mmap_size()}",
+    ]
+    if database and database != ":memory:":
+        # In-memory databases cannot use WAL.
+        pragmas.insert(0, f"PRAGMA journal_mode = {get_sqlite_journal_mode()}")
+    return pragmas
+
+
+def engine_options(url: str) -> dict[str, Any]:
+    """Return ``create_engine`` keyword arguments for ``url``."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": get_db_pool_size(),
+        "max_overflow": get_db_max_overflow(),
+        "pool_timeout": get_db_pool_timeout(),
+        "pool_recycle": get_db_pool_recycle(),
+        "pool_pre_ping": get_db_pool_pre_ping(),
+    }
+
+
+def _install_sqlite_pragmas(engine: Engine) -> None:
+    pragmas = sqlite_pragmas(engine.url.database)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_conn, _record) -> None:
+        cursor = dbapi_conn.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def create_configured_engine(url: str) -> Engine:
+    """Create an engine with the pool and SQLite settings from config."""
+    engine = create_engine(url, **engine_options(url))
+    if engine.dialect.name == "sqlite":
+        _install_sqlite_pragmas(engine)
+    return engine
+
+
+def _is_sqlite_memory(url: URL) -> bool:
+    database = url.database or ""
+    return (
+        database in ("", ":memory:")
+        or database.startswith("file::memory:")
+        or url.query.get("mode") == "memory"
+    )
+
+
+def async_database_url(url: str | URL) -> URL:
+    """Return ``url`` rewritten to use the async driver for its backend.
+
+    In-memory SQLite databases are rejected: an ``aiosqlite`` connection would
+    open its own empty database instead of the one the sync engine uses.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    if backend == "sqlite" and _is_sqlite_memory(url):
+        raise ValueError(
+            "In-memory SQLite databases cannot be shared with async sessions; "
+            "use a file database"
+        )
+    return url.set(drivername=f"{backend}+{driver}")
+
+
+def create_configured_async_engine(url: str | URL) -> AsyncEngine:
+    """Create an async engine with the same settings as the sync engine.
+
+    SQLite connections are not pooled: opening one is cheap and each
+    ``aiosqlite`` connection owns a thread that should not outlive its loop.
+    """
+    url = async_database_url(url)
+    if url.get_backend_name() == "sqlite":
+        options: dict[str, Any] = {"poolclass": NullPool}
+    else:
+        options = engine_options(url.render_as_string(hide_password=False))
+    engine = create_async_engine(url, **options)
+    if engine.dialect.name == "sqlite":
+        _install_sqlite_pragmas(engine.sync_engine)
+    return engine
 
 
 def get_engine() -> Engine:
     """Return a cached SQLAlchemy engine instance."""
     global _engine
     if _engine is None:
-        url = get_database_url()
-        _engine = create_engine(
-            url,
-            connect_args=(
-                {"check_same_thread": False} if url.startswith("sqlite") else {}
-            ),
-        )
+        _engine = create_configured_engine(get_database_url())
     return _engine
 
 
+def get_sessionmaker() -> sessionmaker:
+    """Return the cached ``sessionmaker`` bound to :func:`get_engine`.
+
+    A new factory is built only when the engine changes, for example when
+    tests swap in their own database.
+    """
+    global _session_factory
+    engine = get_engine()
+    if _session_factory is None or _session_factory.kw.get("bind") is not engine:
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return _session_factory
+
+
 def SessionLocal() -> Session:
     """Return a new session bound to the engine from :func:`get_engine`."""
-    Session = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
-    return Session()
+    return get_sessionmaker()()
+
+
+def _async_engine_entry() -> tuple[AsyncEngine, async_sessionmaker]:
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _async_engines if key[1].is_closed()]:
+        del _async_engines[key]
+    engine = get_engine()
+    entry = _async_engines.get((engine, loop))
+    if entry is None:
+        async_engine = create_configured_async_engine(engine.url)
+        entry = (
+            async_engine,
+            async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False),
+        )
+        _async_engines[(engine, loop)] = entry
+    return entry
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the async engine for :func:`get_engine`'s database.
+
+    Must be called from a running event loop.
+    """
+    return _async_engine_entry()[0]
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Return a new ``AsyncSession`` for :func:`get_engine`'s database.
+
+    Objects are not expired on commit because async sessions cannot lazy-load
+    attributes afterwards.
+    """
+    return _async_engine_entry()[1]()
+
+
+async def dispose_async_engine() -> None:
+    """Dispose the async engines created on the running event loop."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _async_engines if key[1] is loop]:
+        async_engine, _ = _async_engines.pop(key)
+        await async_engine.dispose()
 
 
 Base = declarative_base()
@@ -0,0 +1,97 @@
+"""Background writer for artifact exports.
+
+Handlers running on the event loop hand blocking export writes to
+:func:`get_export_queue`, a small thread pool. At most
+``ARTIFACT_EXPORT_BACKLOG`` exports are queued; further submissions wait for a
+slot without blocking the loop. The scheduler flushes the queue when it stops.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+from .config import get_artifact_export_backlog, get_artifact_export_workers
+from .metrics import ARTIFACT_EXPORT_BACKLOG
+
+logger = logging.getLogger(__name__)
+
+
+class ExportQueue:
+    """Run blocking export writes on a thread pool with a bounded backlog."""
+
+    def __init__(self, workers: int, backlog: int) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="artifact-export"
+        )
+        self._slots = threading.BoundedSemaphore(backlog)
+        self._pending: set[Future] = set()
+        self._lock = threading.Lock()
+
+    async def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """Queue ``func(*args)``, waiting off the loop while the backlog is full."""
+        if not self._slots.acquire(blocking=False):
+            logger.debug("Export backlog full; waiting for a slot")
+            waiter = asyncio.ensure_future(asyncio.to_thread(self._slots.acquire))
+            try:
+                await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                # The thread still takes a slot; hand it back once it does.
+                waiter.add_done_callback(lambda _: self._slots.release())
+                raise
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        ARTIFACT_EXPORT_BACKLOG.inc()
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+        ARTIFACT_EXPORT_BACKLOG.dec()
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Artifact export failed", exc_info=future.exception())
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued exports; return False if some are still running."""
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def shutdown(self) -> None:
+        """Finish queued exports and stop the worker threads."""
+        self._executor.shutdown(wait=True)
+
+
+_queue: Optional[ExportQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_export_queue() -> ExportQueue:
+    """Return the shared export queue, creating it on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ExportQueue(
+                get_artifact_export_workers(), get_artifact_export_backlog()
+            )
+        return _queue
+
+
+async def close_export_queue() -> None:
+    """Write every queued export and shut the shared queue down."""
+    global _queue
+    with _queue_lock:
+        queue, _queue = _queue, None
+    if queue is not None:
+        await asyncio.to_thread(queue.shutdown)
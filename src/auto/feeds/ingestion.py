@@ -1,6 +1,8 @@
+import hashlib
 import logging
 import anyio
 import asyncio
+from datetime import datetime, timezone
 from typing import Optional
 
 import httpx
@@ -9,17 +11,28 @@ from alembic.config import Config
 from alembic import command
 from dateutil import parser
 from ..utils import project_root
-from contextlib import contextmanager
-from typing import Iterator
+from contextlib import aclosing, contextmanager
+from typing import AsyncIterator, Iterator, Sequence
 
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.engine import Engine
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from ..db import SessionLocal
 from .. import configure_logging
 
-from ..models import Post
-from ..config import get_feed_url
+from ..models import Feed, Post
+from ..config import (
+    get_feed_url,
+    get_feed_urls,
+    get_ingest_concurrency,
+    get_ingest_streaming,
+)
+from ..metrics import FEED_FETCHES, track_posts_added
+from ..http import get_http_client, with_http_client
+from ..tracing import span
+from .streaming import StreamedEntry, iter_entries
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +42,12 @@ BASE_DIR = project_root()
 DB_PATH = str(BASE_DIR / "substack.db")
 ALEMBIC_INI = BASE_DIR / "alembic.ini"
 
+# Ids per ``IN`` lookup, well below SQLite's bound-parameter limit.
+_LOOKUP_CHUNK = 500
+
+# Streamed entries saved per ``save_entries`` call.
+_STREAM_SAVE_CHUNK = 100
+
 
 @contextmanager
 def _session_for_path(
@@ -85,24 +104,126 @@ def init_db(
         raise
 
 
-async def fetch_feed_async(feed_url: Optional[str] = None):
-    """Fetch and parse the RSS feed asynchronously."""
+def _conditional_headers(feed: Optional[Feed]) -> dict[str, str]:
+    """Return validators from the previous fetch of ``feed``."""
+    headers = {}
+    if feed is not None:
+        if feed.etag:
+            headers["If-None-Match"] = feed.etag
+        if feed.last_modified:
+            headers["If-Modified-Since"] = feed.last_modified
+    return headers
+
+
+async def fetch_feed_async(
+    feed_url: Optional[str] = None, *, feed: Optional[Feed] = None
+):
+    """Fetch and parse the RSS feed asynchronously.
+
+    When ``feed`` is given its stored validators are sent with the request and
+    updated from the response. An empty list is returned without parsing when
+    the server answers ``304 Not Modified`` or the body hash is unchanged.
+    """
     if feed_url is None:
-        feed_url = get_feed_url()
+        feed_url = feed.url if feed is not None else get_feed_url()
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(feed_url)
-            response.raise_for_status()
+        with span("feed.fetch", url=feed_url) as current:
+            response = await get_http_client().get(
+                feed_url, headers=_conditional_headers(feed)
+            )
+            current.set_attribute("http.status_code", response.status_code)
+            if response.status_code != 304:
+                response.raise_for_status()
     except httpx.HTTPError as exc:
         logger.error("Failed to fetch feed %s: %s", feed_url, exc)
         raise
+
+    if feed is not None:
+        feed.last_fetched_at = datetime.now(timezone.utc)
+        if response.status_code == 304:
+            FEED_FETCHES.labels(result="not_modified").inc()
+            logger.info("Feed not modified: %s", feed_url)
+            return []
+        feed.etag = response.headers.get("ETag")
+        feed.last_modified = response.headers.get("Last-Modified")
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if content_hash == feed.content_hash:
+            FEED_FETCHES.labels(result="unchanged").inc()
+            logger.info("Feed unchanged: %s", feed_url)
+            return []
+        feed.content_hash = content_hash
+    FEED_FETCHES.labels(result="changed").inc()
     soup = BeautifulSoup(response.content, "xml")
     return soup.find_all("item")
 
 
 def fetch_feed(feed_url: Optional[str] = None):
     """Synchronous wrapper around :func:`fetch_feed_async`."""
-    return anyio.run(fetch_feed_async, feed_url)
+    return anyio.run(with_http_client, fetch_feed_async, feed_url)
+
+
+async def stream_feed_async(
+    feed_url: str, *, feed: Optional[Feed] = None
+) -> AsyncIterator[StreamedEntry]:
+    """Yield feed entries while the response body is still downloading.
+
+    Validators are sent and updated as in :func:`fetch_feed_async`, but the
+    body hash is cleared because callers may stop reading before the end.
+    Nothing is yielded on ``304 Not Modified``.
+    """
+    try:
+        async with get_http_client().stream(
+            "GET", feed_url, headers=_conditional_headers(feed)
+        ) as response:
+            if response.status_code != 304:
+                response.raise_for_status()
+            if feed is not None:
+                feed.last_fetched_at = datetime.now(timezone.utc)
+                if response.status_code == 304:
+                    FEED_FETCHES.labels(result="not_modified").inc()
+                    logger.info("Feed not modified: %s", feed_url)
+                    return
+                feed.etag = response.headers.get("ETag")
+                feed.last_modified = response.headers.get("Last-Modified")
+                feed.content_hash = None
+            FEED_FETCHES.labels(result="changed").inc()
+            async for entry in iter_entries(response.aiter_bytes()):
+                yield entry
+    except httpx.HTTPError as exc:
+        logger.error("Failed to fetch feed %s: %s", feed_url, exc)
+        raise
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+async def _ingest_streamed(feed_url: str, feed: Feed) -> None:
+    """Save streamed entries in chunks, stopping at already-seen entries.
+
+    Feeds list newest entries first, so reading stops at the first entry no
+    newer than ``feed.latest_entry_at``.
+    """
+    watermark = _as_utc(feed.latest_entry_at)
+    newest = watermark
+    chunk: list[StreamedEntry] = []
+    async with aclosing(stream_feed_async(feed_url, feed=feed)) as entries:
+        async for entry in entries:
+            created = _as_utc(_parse_entry(entry)[6])
+            if watermark is not None and created is not None and created <= watermark:
+                logger.info("Reached previously ingested entries in %s", feed_url)
+                break
+            if created is not None and (newest is None or created > newest):
+                newest = created
+            chunk.append(entry)
+            if len(chunk) >= _STREAM_SAVE_CHUNK:
+                save_entries(chunk)
+                chunk = []
+    if chunk:
+        save_entries(chunk)
+    feed.latest_entry_at = newest
 
 
 def _extract_text(item, name: str, default: str = ""):
@@ -160,61 +281,154 @@ def _parse_entry(item):
     )
 
 
+def _insert_ignoring_duplicates(session: Session):
+    """Return an ``INSERT`` into ``posts`` that skips ids already stored."""
+    table = Post.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite_insert(table).on_conflict_do_nothing(index_elements=["id"])
+    if dialect == "postgresql":
+        return postgresql_insert(table).on_conflict_do_nothing(index_elements=["id"])
+    return insert(table)
+
+
 def save_entries(items, db_path=DB_PATH, *, engine=None, session_factory=None):
-    """Save new entries from the feed into the database."""
+    """Save new entries from the feed into the database.
+
+    Existing ids are fetched with ``IN`` queries, new posts are inserted with a
+    single ``executemany`` and posts stored without ``content`` are backfilled
+    with one bulk ``UPDATE``.
+    """
     items_iter = getattr(items, "entries", items)
+    now = datetime.now(timezone.utc)
+
+    rows: dict[str, dict] = {}
+    for item in items_iter:
+        (
+            guid,
+            title,
+            link,
+            summary,
+            content,
+            published,
+            created_dt,
+            updated_dt,
+        ) = _parse_entry(item)
+        row = rows.get(guid)
+        if row is None:
+            rows[guid] = {
+                "id": guid,
+                "title": title,
+                "link": link,
+                "summary": summary,
+                "content": content,
+                "published": published,
+                "created_at": created_dt or now,
+                "updated_at": updated_dt or now,
+            }
+        elif not row["content"] and content:
+            row["content"] = content
+    if not rows:
+        return
 
     with _session_for_path(
         db_path, engine=engine, session_factory=session_factory
     ) as session:
         with session.begin():
-            for item in items_iter:
-                (
-                    guid,
-                    title,
-                    link,
-                    summary,
-                    content,
-                    published,
-                    created_dt,
-                    updated_dt,
-                ) = _parse_entry(item)
-
-                post = Post(
-                    id=guid,
-                    title=title,
-                    link=link,
-                    summary=summary,
-                    content=content,
-                    published=published,
-                    created_at=created_dt,
-                    updated_at=updated_dt,
+            ids = list(rows)
+            existing: dict[str, Optional[str]] = {}
+            for start in range(0, len(ids), _LOOKUP_CHUNK):
+                chunk = ids[start : start + _LOOKUP_CHUNK]
+                existing.update(
+                    session.execute(
+                        select(Post.id, Post.content).where(Post.id.in_(chunk))
+                    ).all()
                 )
 
-                try:
-                    with session.begin_nested():
-                        session.add(post)
-                        session.flush()
-                    logger.info("Saved post: %s", title)
-                except IntegrityError:
-                    existing = session.get(Post, guid)
-                    if existing is not None and not existing.content and content:
-                        existing.content = content
-                        logger.info("Backfilled post: %s", title)
-                    else:
-                        logger.info("Skipping existing post: %s", title)
-                except Exception as exc:
-                    logger.error("Failed to save post %s: %s", title, exc)
-
-
-async def run_ingest_async() -> None:
-    """Fetch the configured feed and store any new entries asynchronously."""
-    try:
-        items = await fetch_feed_async()
-        save_entries(items)
-    except Exception as exc:
-        logger.error("Ingestion failed: %s", exc)
-        raise
+            new_rows = [row for guid, row in rows.items() if guid not in existing]
+            backfill = [
+                {"post_id": guid, "new_content": row["content"]}
+                for guid, row in rows.items()
+                if guid in existing and not existing[guid] and row["content"]
+            ]
+
+            if new_rows:
+                session.execute(_insert_ignoring_duplicates(session), new_rows)
+                track_posts_added(session, len(new_rows))
+            if backfill:
+                table = Post.__table__
+                session.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("post_id"))
+                    .values(content=bindparam("new_content")),
+                    backfill,
+                )
+
+    for row in new_rows:
+        logger.debug("Saved post: %s", row["title"])
+    logger.info(
+        "Saved %d new post(s), backfilled %d, skipped %d existing",
+        len(new_rows),
+        len(backfill),
+        len(existing) - len(backfill),
+    )
+
+
+async def ingest_feed_async(feed_url: str) -> None:
+    """Fetch one feed and store any new entries.
+
+    The feed's validators and body hash are committed only after the entries
+    are saved so a failed save is retried on the next run. Failures increment
+    ``error_count`` and successes reset it.
+    """
+    with SessionLocal() as session:
+        feed = session.get(Feed, feed_url) or Feed(url=feed_url)
+        try:
+            with span("feed.ingest", url=feed_url):
+                if get_ingest_streaming():
+                    await _ingest_streamed(feed_url, feed)
+                else:
+                    items = await fetch_feed_async(feed_url, feed=feed)
+                    if items:
+                        save_entries(items)
+        except Exception:
+            # Discard validators from the failed attempt before recording it.
+            session.rollback()
+            failed = session.get(Feed, feed_url) or Feed(url=feed_url)
+            failed.error_count = (failed.error_count or 0) + 1
+            session.add(failed)
+            session.commit()
+            raise
+        feed.error_count = 0
+        feed.last_success_at = datetime.now(timezone.utc)
+        session.add(feed)
+        session.commit()
+
+
+async def run_ingest_async(feed_urls: Optional[Sequence[str]] = None) -> None:
+    """Ingest ``feed_urls`` (every configured feed by default) concurrently.
+
+    At most ``INGEST_CONCURRENCY`` feeds are fetched at once. Every feed is
+    attempted even if another fails; the first failure is re-raised afterwards.
+    """
+    if feed_urls is None:
+        feed_urls = get_feed_urls()
+    semaphore = asyncio.Semaphore(get_ingest_concurrency())
+
+    async def ingest(feed_url: str) -> None:
+        async with semaphore:
+            await ingest_feed_async(feed_url)
+
+    results = await asyncio.gather(
+        *(ingest(feed_url) for feed_url in feed_urls), return_exceptions=True
+    )
+    errors = []
+    for feed_url, result in zip(feed_urls, results):
+        if isinstance(result, BaseException):
+            logger.error("Ingestion failed for %s: %s", feed_url, result)
+            errors.append(result)
+    if errors:
+        raise errors[0]
 
 
 def run_ingest() -> None:
@@ -223,11 +437,11 @@ def run_ingest() -> None:
         anyio.from_thread.run(run_ingest_async)
     except RuntimeError:
         try:
-            anyio.run(run_ingest_async)
+            anyio.run(with_http_client, run_ingest_async)
         except RuntimeError:
             loop = asyncio.new_event_loop()
             try:
-                loop.run_until_complete(run_ingest_async())
+                loop.run_until_complete(with_http_client(run_ingest_async))
             finally:
                 loop.close()
 
@@ -235,7 +449,7 @@ def run_ingest() -> None:
 def main():
     configure_logging()
     init_db()
-    anyio.run(run_ingest_async)
+    anyio.run(with_http_client, run_ingest_async)
 
 
 if __name__ == "__main__":
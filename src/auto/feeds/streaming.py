@@ -0,0 +1,82 @@
+"""Incremental RSS/Atom parsing for streamed feed responses."""
+
+from __future__ import annotations
+
+from typing import AsyncIterable, AsyncIterator, Iterator
+
+from lxml import etree
+
+ENTRY_TAGS = {"item", "entry"}
+
+
+def _local_name(tag: str) -> str:
+    """Return ``tag`` without its namespace URI or prefix."""
+    if "}" in tag:
+        return tag.rsplit("}", 1)[1]
+    return tag.rsplit(":", 1)[-1]
+
+
+class StreamedEntry:
+    """Text of one feed entry's child elements, keyed by local name.
+
+    Only the first occurrence of each element is kept. ``findtext`` mirrors
+    :meth:`xml.etree.ElementTree.Element.findtext` so :func:`_parse_entry`
+    accepts these entries; prefixed names such as ``content:encoded`` are
+    looked up by their local part.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: dict[str, str]) -> None:
+        self.fields = fields
+
+    @classmethod
+    def from_element(cls, element) -> "StreamedEntry":
+        fields: dict[str, str] = {}
+        for child in element:
+            if not isinstance(child.tag, str):
+                continue  # comments and processing instructions
+            name = _local_name(child.tag)
+            if name in fields:
+                continue
+            text = "".join(child.itertext())
+            if not text.strip() and child.get("href"):
+                # Atom links carry the URL in an attribute.
+                text = child.get("href")
+            fields[name] = text
+        return cls(fields)
+
+    def findtext(self, name: str, default: str = "") -> str:
+        return self.fields.get(_local_name(name), default)
+
+
+def _drain(parser: etree.XMLPullParser) -> Iterator[StreamedEntry]:
+    for _event, element in parser.read_events():
+        if not isinstance(element.tag, str):
+            continue
+        if _local_name(element.tag) not in ENTRY_TAGS:
+            continue
+        yield StreamedEntry.from_element(element)
+        # Free the finished entry and everything before it so memory stays
+        # bounded by a single entry.
+        element.clear()
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+async def iter_entries(chunks: AsyncIterable[bytes]) -> AsyncIterator[StreamedEntry]:
+    """Yield entries from an RSS or Atom document as its bytes arrive.
+
+    The parser recovers from malformed input, such as undeclared namespace
+    prefixes, the way the BeautifulSoup path does.
+    """
+    parser = etree.XMLPullParser(events=("end",), recover=True)
+    async for chunk in chunks:
+        parser.feed(chunk)
+        for entry in _drain(parser):
+            yield entry
+    parser.close()
+    for entry in _drain(parser):
+        yield entry
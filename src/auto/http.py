@@ -0,0 +1,139 @@
+"""Shared, pooled HTTP clients for outbound requests.
+
+``httpx.AsyncClient`` instances are bound to the event loop that first used
+their connections, so one client is kept per running loop. The FastAPI
+lifespan and :class:`~auto.scheduler.Scheduler` close the client for their
+loop on shutdown; synchronous wrappers use :func:`with_http_client`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+import httpx
+
+from .config import (
+    get_http_max_connections,
+    get_http_max_keepalive,
+    get_http_max_per_host,
+    get_http_timeout,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that releases a per-host slot once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Cap concurrent requests to any single host.
+
+    The slot is held until the response body is closed so streamed responses
+    count against the limit for as long as they occupy a connection.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, per_host: int) -> None:
+        self._transport = transport
+        self._per_host = per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = f"{request.url.scheme}://{request.url.netloc.decode('ascii')}"
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self._per_host)
+        await semaphore.acquire()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                semaphore.release()
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=get_http_max_connections(),
+        max_keepalive_connections=get_http_max_keepalive(),
+    )
+    http2 = _http2_available()
+    transport = _HostLimitedTransport(
+        httpx.AsyncHTTPTransport(limits=limits, http2=http2),
+        get_http_max_per_host(),
+    )
+    logger.debug("Creating shared HTTP client (http2=%s)", http2)
+    return httpx.AsyncClient(transport=transport, timeout=get_http_timeout())
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    for other in [other for other in _clients if other.is_closed()]:
+        # Clients from finished loops cannot be closed any more; drop them.
+        del _clients[other]
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = _build_client()
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared client for the running event loop, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def with_http_client(func: Callable[..., Awaitable[T]], *args: Any) -> T:
+    """Await ``func(*args)`` and close the loop's shared client afterwards.
+
+    Use this as the entry point of ``anyio.run`` in synchronous wrappers so the
+    short-lived loop does not leave pooled connections behind.
+    """
+    try:
+        return await func(*args)
+    finally:
+        await close_http_client()
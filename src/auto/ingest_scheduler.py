@@ -1,28 +1,64 @@
-"""Handler for ingest_feed tasks."""
+"""Handler for ingest_feed tasks.
 
+Each configured feed has its own chain of ``ingest_feed`` tasks whose payload
+names the feed URL, so a slow feed never delays the others.
+"""
+
+import json
 import logging
 from datetime import datetime, timezone, timedelta
 
-from .feeds.ingestion import run_ingest_async
-from .config import get_ingest_interval
-from .models import Task
-from .scheduler import register_task_handler
+from .feeds.ingestion import ingest_feed_async, run_ingest_async
+from .config import get_feed_urls, get_ingest_interval
+from .models import Feed, Task
+from .scheduler import CLAIMABLE_STATUSES, register_task_handler
 
 logger = logging.getLogger(__name__)
 
 
 @register_task_handler("ingest_feed")
 async def handle_ingest_feed(task: Task, session) -> None:
-    """Run feed ingestion and schedule the next run."""
+    """Ingest the task's feed and schedule its next run."""
+    feed_url = json.loads(task.payload).get("feed_url") if task.payload else None
+    if feed_url is None:
+        # Tasks queued before per-feed scheduling ingest every feed once and
+        # hand over to per-feed tasks.
+        try:
+            await run_ingest_async()
+        finally:
+            ensure_initial_task(session)
+        return
+
     try:
-        await run_ingest_async()
+        await ingest_feed_async(feed_url)
     finally:
-        next_run = datetime.now(timezone.utc) + timedelta(seconds=get_ingest_interval())
-        session.add(Task(type="ingest_feed", scheduled_at=next_run))
+        if feed_url in get_feed_urls():
+            feed = session.get(Feed, feed_url)
+            interval = (feed.poll_interval if feed else None) or get_ingest_interval()
+            next_run = datetime.now(timezone.utc) + timedelta(seconds=interval)
+            session.add(
+                Task(
+                    type="ingest_feed",
+                    payload=json.dumps({"feed_url": feed_url}),
+                    scheduled_at=next_run,
+                )
+            )
+        else:
+            logger.info("Feed %s is no longer configured; not rescheduling", feed_url)
 
 
 def ensure_initial_task(session) -> None:
-    """Ensure at least one ingest_feed task exists."""
-    exists = session.query(Task).filter(Task.type == "ingest_feed").first()
-    if not exists:
-        session.add(Task(type="ingest_feed"))
+    """Ensure every configured feed has a row and a pending ingest_feed task."""
+    scheduled = set()
+    for (payload,) in session.query(Task.payload).filter(
+        Task.type == "ingest_feed", Task.status.in_(CLAIMABLE_STATUSES)
+    ):
+        if payload:
+            scheduled.add(json.loads(payload).get("feed_url"))
+    for feed_url in get_feed_urls():
+        if session.get(Feed, feed_url) is None:
+            session.add(Feed(url=feed_url))
+        if feed_url not in scheduled:
+            session.add(
+                Task(type="ingest_feed", payload=json.dumps({"feed_url": feed_url}))
+            )
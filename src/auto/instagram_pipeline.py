@@ -1,22 +1,40 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Optional
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from .config import (
+    get_instagram_pipeline_batch_size,
+    get_instagram_pipeline_executor,
+    get_instagram_pipeline_workers,
+    get_instagram_scoring_weights,
+)
 from .models import (
     InstagramPipelineConcept,
     InstagramPipelineRun,
     Post,
     PostStatus,
 )
+from .artifact_store import ArtifactStore
+from .export_queue import get_export_queue
 from .instagram_adapter import adapt_instagram_publish_payload
+from .instagram_scoring import score_instagram_concepts
 from .socials.registry import get_registry
 from .utils import project_root
 
+logger = logging.getLogger(__name__)
+
 
 def _build_instagram_hashtag_seed(post: Post) -> list[str]:
     tokens = [word.strip(".,!?;:()[]{}\"'").lower() for word in post.title.split()]
@@ -75,7 +93,11 @@ def score_instagram_concept_weighted(
     engagement_weight: float = 0.4,
     risk_weight: float = 0.15,
 ) -> dict[str, float]:
-    """Compute deterministic weighted scores for one concept."""
+    """Compute deterministic weighted scores for one concept.
+
+    This is the reference for :mod:`auto.instagram_scoring`, which the pipeline
+    uses to score many concepts at once.
+    """
     format_name = str(concept.get("format", ""))
     rhythm = concept.get("visual_rhythm") or []
     hashtag_count = len(concept.get("hashtags") or [])
@@ -183,42 +205,208 @@ async def execute_instagram_pipeline_run(
     if run.status == "published":
         return run
 
-    concepts = generate_instagram_native_concepts(post)
-    scored_concepts: list[dict[str, Any]] = []
-    for concept in concepts:
-        scores = score_instagram_concept_weighted(concept)
-        scored_concepts.append(
-            {
-                **concept,
-                "score_total": scores["total"],
-                "score_breakdown": {
-                    "visual": scores["visual"],
-                    "engagement": scores["engagement"],
-                    "risk": scores["risk"],
-                },
-            }
-        )
+    ranked_concepts = rank_instagram_concepts(_post_source(post))
+    concept_models = _sync_instagram_run_concepts(session, {run.id: ranked_concepts})[
+        run.id
+    ]
+    await _finish_instagram_pipeline_run(
+        session,
+        run=run,
+        post=post,
+        ranked_concepts=ranked_concepts,
+        selected=concept_models[0],
+        auto_publish=auto_publish,
+        quality_threshold=quality_threshold,
+        banned_terms=banned_terms,
+        pipeline_enabled=pipeline_enabled,
+        export_enabled=export_enabled,
+        export_dir=export_dir,
+    )
+    return run
 
-    ranked_concepts = select_instagram_publish_candidate(scored_concepts)
-    _replace_instagram_run_concepts(
-        session, run_id=run.id, ranked_concepts=ranked_concepts
+
+async def execute_instagram_pipeline_batch(
+    session: Session,
+    *,
+    post_ids: Iterable[str],
+    network: str,
+    pipeline_version: str,
+    auto_publish: bool,
+    quality_threshold: float,
+    banned_terms: set[str],
+    pipeline_enabled: bool,
+    export_enabled: bool,
+    export_dir: str,
+    chunk_size: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> list[InstagramPipelineRun]:
+    """Run the pipeline over many posts, committing once per chunk.
+
+    Posts, runs and concepts for up to ``chunk_size`` posts
+    (``INSTAGRAM_PIPELINE_BATCH_SIZE`` by default) are loaded and written with
+    a handful of statements, while concept generation and scoring run on
+    ``executor`` (a pool sized by ``INSTAGRAM_PIPELINE_WORKERS`` by default),
+    each worker scoring its share of the chunk in one vectorized pass.
+    Unknown post ids are skipped. Returns the runs in ``post_ids`` order.
+    """
+    post_ids = list(dict.fromkeys(post_ids))
+    chunk_size = chunk_size or get_instagram_pipeline_batch_size()
+    owned = executor is None
+    if executor is None:
+        executor = _pipeline_executor()
+    loop = asyncio.get_running_loop()
+    weights = get_instagram_scoring_weights()
+    runs: list[InstagramPipelineRun] = []
+    try:
+        for start in range(0, len(post_ids), chunk_size):
+            chunk = post_ids[start : start + chunk_size]
+            posts = {
+                post.id: post
+                for post in session.scalars(select(Post).where(Post.id.in_(chunk)))
+            }
+            for post_id in chunk:
+                if post_id not in posts:
+                    logger.warning("Post %s not found; skipping", post_id)
+            chunk_runs = _find_or_create_instagram_pipeline_runs(
+                session,
+                post_ids=[post_id for post_id in chunk if post_id in posts],
+                network=network,
+                pipeline_version=pipeline_version,
+            )
+            pending = [run for run in chunk_runs if run.status != "published"]
+            sources = [_post_source(posts[run.post_id]) for run in pending]
+            step = max(1, -(-len(sources) // get_instagram_pipeline_workers()))
+            slices = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        executor,
+                        partial(rank_instagram_concepts_batch, weights=weights),
+                        sources[offset : offset + step],
+                    )
+                    for offset in range(0, len(sources), step)
+                )
+            )
+            ranked = [concepts for ranked_slice in slices for concepts in ranked_slice]
+            models = _sync_instagram_run_concepts(
+                session, {run.id: concepts for run, concepts in zip(pending, ranked)}
+            )
+            for run, concepts in zip(pending, ranked):
+                await _finish_instagram_pipeline_run(
+                    session,
+                    run=run,
+                    post=posts[run.post_id],
+                    ranked_concepts=concepts,
+                    selected=models[run.id][0],
+                    auto_publish=auto_publish,
+                    quality_threshold=quality_threshold,
+                    banned_terms=banned_terms,
+                    pipeline_enabled=pipeline_enabled,
+                    export_enabled=export_enabled,
+                    export_dir=export_dir,
+                )
+            session.commit()
+            runs.extend(chunk_runs)
+    finally:
+        if owned:
+            executor.shutdown(wait=False)
+    return runs
+
+
+@dataclass(frozen=True)
+class _PostSource:
+    """The post fields concept generation reads, safe to send to a process."""
+
+    id: str
+    title: str
+    summary: Optional[str]
+    content: Optional[str]
+    link: str
+
+
+def _post_source(post: Post) -> _PostSource:
+    return _PostSource(
+        id=post.id,
+        title=post.title,
+        summary=post.summary,
+        content=post.content,
+        link=post.link,
     )
 
-    top_concept = ranked_concepts[0]
-    top_model = (
-        session.query(InstagramPipelineConcept)
-        .filter(
-            InstagramPipelineConcept.run_id == run.id,
-            InstagramPipelineConcept.concept_key == top_concept["concept_key"],
+
+def rank_instagram_concepts(
+    post: Post | _PostSource,
+    *,
+    weights: Optional[dict[str, float]] = None,
+) -> list[dict[str, Any]]:
+    """Generate, score and rank the concepts for ``post``.
+
+    Only plain data is read and returned, so this can run in a worker pool.
+    """
+    return rank_instagram_concepts_batch([post], weights=weights)[0]
+
+
+def rank_instagram_concepts_batch(
+    posts: list[Post | _PostSource],
+    *,
+    weights: Optional[dict[str, float]] = None,
+) -> list[list[dict[str, Any]]]:
+    """Rank the concepts of many posts, scoring all of them in one pass.
+
+    ``weights`` defaults to ``INSTAGRAM_SCORING_WEIGHTS``.
+    """
+    generated = [generate_instagram_native_concepts(post) for post in posts]
+    scores = iter(
+        score_instagram_concepts(
+            [concept for concepts in generated for concept in concepts],
+            weights=weights,
         )
-        .first()
     )
-    if top_model is None:
-        raise RuntimeError("failed to persist selected concept")
+    ranked: list[list[dict[str, Any]]] = []
+    for concepts in generated:
+        scored_concepts = []
+        for concept, concept_scores in zip(concepts, scores):
+            scored_concepts.append(
+                {
+                    **concept,
+                    "score_total": concept_scores["total"],
+                    "score_breakdown": {
+                        "visual": concept_scores["visual"],
+                        "engagement": concept_scores["engagement"],
+                        "risk": concept_scores["risk"],
+                    },
+                }
+            )
+        ranked.append(select_instagram_publish_candidate(scored_concepts))
+    return ranked
+
 
+def _pipeline_executor() -> Executor:
+    workers = get_instagram_pipeline_workers()
+    if get_instagram_pipeline_executor() == "PROCESS":
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="instagram-pipeline"
+    )
+
+
+async def _finish_instagram_pipeline_run(
+    session: Session,
+    *,
+    run: InstagramPipelineRun,
+    post: Post,
+    ranked_concepts: list[dict[str, Any]],
+    selected: InstagramPipelineConcept,
+    auto_publish: bool,
+    quality_threshold: float,
+    banned_terms: set[str],
+    pipeline_enabled: bool,
+    export_enabled: bool,
+    export_dir: str,
+) -> None:
+    top_concept = ranked_concepts[0]
     canonical_payload = build_instagram_canonical_payload(post, top_concept)
     publish_payload = adapt_instagram_publish_payload(canonical_payload)
-    run.selected_concept_id = top_model.id
+    run.selected_concept_id = selected.id
     run.score_summary = json.dumps(
         {
             "selected": top_concept["concept_key"],
@@ -240,48 +428,30 @@ async def execute_instagram_pipeline_run(
     if not pipeline_enabled:
         run.status = "disabled"
         run.last_error = "instagram pipeline disabled by environment"
-        session.flush()
-        if export_enabled:
-            export_instagram_pipeline_artifacts(
-                run=run,
-                ranked_concepts=ranked_concepts,
-                publish_payload=publish_payload,
-                export_dir=export_dir,
-            )
-        return run
-
-    if low_quality or policy_blocked:
+    elif low_quality or policy_blocked:
         run.status = "needs_review"
         run.last_error = (
             "quality threshold not met"
             if low_quality
             else "banned terms found in publish payload"
         )
-        session.flush()
-        if export_enabled:
-            export_instagram_pipeline_artifacts(
-                run=run,
-                ranked_concepts=ranked_concepts,
-                publish_payload=publish_payload,
-                export_dir=export_dir,
-            )
-        return run
-
-    run.status = "ready"
-    run.last_error = None
-
-    if auto_publish:
-        await _publish_instagram_pipeline_payload(session, run)
+    else:
+        run.status = "ready"
+        run.last_error = None
+        if auto_publish:
+            await _publish_instagram_pipeline_payload(session, run)
 
     session.flush()
     if export_enabled:
-        export_instagram_pipeline_artifacts(
+        # Snapshot the run here; serialising and writing happen off the loop.
+        export = build_instagram_pipeline_export(
             run=run,
             ranked_concepts=ranked_concepts,
             publish_payload=publish_payload,
-            export_dir=export_dir,
         )
-    return run
+        await get_export_queue().submit(
+            write_instagram_pipeline_export, export, export_dir
+        )
 
 
 def contains_instagram_banned_terms(text: str, banned_terms: set[str]) -> bool:
@@ -294,27 +464,44 @@ def contains_instagram_banned_terms(text: str, banned_terms: set[str]) -> bool:
     return False
 
 
-def export_instagram_pipeline_artifacts(
-    *,
-    run: InstagramPipelineRun,
-    ranked_concepts: list[dict[str, Any]],
-    publish_payload: dict[str, Any],
-    export_dir: str,
-) -> Path:
-    """Write pipeline artifacts to disk for inspection and debugging."""
+def get_instagram_pipeline_artifact_store(export_dir: str) -> ArtifactStore:
+    """Return the artifact store in ``export_dir``, relative to the project."""
     export_root = Path(export_dir).expanduser()
     if not export_root.is_absolute():
         export_root = project_root() / export_root
+    return ArtifactStore(export_root)
+
+
+def instagram_pipeline_manifest_name(run: InstagramPipelineRun) -> str:
+    """Return the artifact manifest name for ``run``."""
+    return ".".join(
+        [
+            _safe_path_token(run.post_id),
+            _safe_path_token(run.network),
+            _safe_path_token(run.pipeline_version),
+            f"run_{run.id}",
+        ]
+    )
 
-    safe_post_id = _safe_path_token(run.post_id)
-    safe_network = _safe_path_token(run.network)
-    safe_version = _safe_path_token(run.pipeline_version)
 
-    artifact_dir = (
-        export_root / safe_post_id / safe_network / safe_version / f"run_{run.id}"
-    )
-    artifact_dir.mkdir(parents=True, exist_ok=True)
+@dataclass(frozen=True)
+class InstagramPipelineExport:
+    """Plain-data snapshot of a run's artifacts, safe to write from a thread."""
+
+    name: str
+    run_doc: dict[str, Any]
+    concepts_doc: list[dict[str, Any]]
+    publish_payload: dict[str, Any]
+    preview_md: str
 
+
+def build_instagram_pipeline_export(
+    *,
+    run: InstagramPipelineRun,
+    ranked_concepts: list[dict[str, Any]],
+    publish_payload: dict[str, Any],
+) -> InstagramPipelineExport:
+    """Collect the artifact contents of ``run`` while its session is usable."""
     run_doc = {
         "id": run.id,
         "post_id": run.post_id,
@@ -348,31 +535,68 @@ def export_instagram_pipeline_artifacts(
         for idx, concept in enumerate(ranked_concepts, start=1)
     ]
 
-    (artifact_dir / "run.json").write_text(
-        json.dumps(run_doc, indent=2, sort_keys=True),
-        encoding="utf-8",
-    )
-    (artifact_dir / "concepts_ranked.json").write_text(
-        json.dumps(concepts_doc, indent=2, sort_keys=True),
-        encoding="utf-8",
-    )
-    (artifact_dir / "publish_payload.json").write_text(
-        json.dumps(publish_payload, indent=2, sort_keys=True),
-        encoding="utf-8",
-    )
-
-    preview_md = render_instagram_pipeline_preview_markdown(
-        run=run,
-        ranked_concepts=concepts_doc,
+    return InstagramPipelineExport(
+        name=instagram_pipeline_manifest_name(run),
+        run_doc=run_doc,
+        concepts_doc=concepts_doc,
         publish_payload=publish_payload,
+        preview_md=render_instagram_pipeline_preview_markdown(
+            run=run,
+            ranked_concepts=concepts_doc,
+            publish_payload=publish_payload,
+        ),
     )
-    (artifact_dir / "preview.md").write_text(preview_md, encoding="utf-8")
-    (artifact_dir / "preview.html").write_text(
-        render_instagram_pipeline_preview_html(preview_md),
-        encoding="utf-8",
+
+
+def write_instagram_pipeline_export(
+    export: InstagramPipelineExport, export_dir: str
+) -> Path:
+    """Write ``export`` to the artifact store and return its manifest path.
+
+    The files go to the content-addressed store in ``export_dir`` under the
+    run's manifest, so unchanged files are not rewritten.
+    """
+    files = {
+        "run.json": json.dumps(export.run_doc, indent=2, sort_keys=True),
+        "concepts_ranked.json": json.dumps(
+            export.concepts_doc, indent=2, sort_keys=True
+        ),
+        "publish_payload.json": json.dumps(
+            export.publish_payload, indent=2, sort_keys=True
+        ),
+        "preview.md": export.preview_md,
+        "preview.html": render_instagram_pipeline_preview_html(export.preview_md),
+    }
+
+    store = get_instagram_pipeline_artifact_store(export_dir)
+    store.write_manifest(
+        export.name,
+        {filename: text.encode("utf-8") for filename, text in files.items()},
+        run_id=export.run_doc["id"],
+        post_id=export.run_doc["post_id"],
+        network=export.run_doc["network"],
+        pipeline_version=export.run_doc["pipeline_version"],
     )
+    return store.manifest_path(export.name)
 
-    return artifact_dir
+
+def export_instagram_pipeline_artifacts(
+    *,
+    run: InstagramPipelineRun,
+    ranked_concepts: list[dict[str, Any]],
+    publish_payload: dict[str, Any],
+    export_dir: str,
+) -> Path:
+    """Write pipeline artifacts to disk for inspection and debugging.
+
+    This writes synchronously; the pipeline itself queues
+    :func:`write_instagram_pipeline_export` on the background export queue.
+    Returns the manifest path.
+    """
+    export = build_instagram_pipeline_export(
+        run=run, ranked_concepts=ranked_concepts, publish_payload=publish_payload
+    )
+    return write_instagram_pipeline_export(export, export_dir)
 
 
 def render_instagram_pipeline_preview_markdown(
@@ -479,40 +703,112 @@ def _find_or_create_instagram_pipeline_run(
     return run
 
 
-def _replace_instagram_run_concepts(
+def _find_or_create_instagram_pipeline_runs(
     session: Session,
     *,
-    run_id: int,
-    ranked_concepts: list[dict[str, Any]],
-) -> None:
-    session.query(InstagramPipelineConcept).filter(
-        InstagramPipelineConcept.run_id == run_id
-    ).delete()
-
-    for idx, concept in enumerate(ranked_concepts, start=1):
-        model = InstagramPipelineConcept(
-            run_id=run_id,
-            concept_key=str(concept["concept_key"]),
-            concept_payload=json.dumps(
-                {
-                    "format": concept.get("format"),
-                    "hook": concept.get("hook"),
-                    "visual_rhythm": concept.get("visual_rhythm") or [],
-                    "caption_seed": concept.get("caption_seed"),
-                    "hashtags": concept.get("hashtags") or [],
-                    "alt_text": concept.get("alt_text"),
-                    "cta_strategy": concept.get("cta_strategy"),
-                },
-                sort_keys=True,
-            ),
-            score_total=float(concept.get("score_total") or 0.0),
-            score_breakdown=json.dumps(
-                concept.get("score_breakdown") or {}, sort_keys=True
-            ),
-            rank=idx,
+    post_ids: list[str],
+    network: str,
+    pipeline_version: str,
+) -> list[InstagramPipelineRun]:
+    existing = {
+        run.post_id: run
+        for run in session.scalars(
+            select(InstagramPipelineRun).where(
+                InstagramPipelineRun.post_id.in_(post_ids),
+                InstagramPipelineRun.network == network,
+                InstagramPipelineRun.pipeline_version == pipeline_version,
+            )
+        )
+    }
+    created = [
+        InstagramPipelineRun(
+            post_id=post_id,
+            network=network,
+            pipeline_version=pipeline_version,
+            status="pending",
+        )
+        for post_id in post_ids
+        if post_id not in existing
+    ]
+    session.add_all(created)
+    session.flush()
+    existing.update((run.post_id, run) for run in created)
+    return [existing[post_id] for post_id in post_ids]
+
+
+def _instagram_concept_columns(rank: int, concept: dict[str, Any]) -> dict[str, Any]:
+    columns = {
+        "concept_payload": json.dumps(
+            {
+                "format": concept.get("format"),
+                "hook": concept.get("hook"),
+                "visual_rhythm": concept.get("visual_rhythm") or [],
+                "caption_seed": concept.get("caption_seed"),
+                "hashtags": concept.get("hashtags") or [],
+                "alt_text": concept.get("alt_text"),
+                "cta_strategy": concept.get("cta_strategy"),
+            },
+            sort_keys=True,
+        ),
+        "score_total": float(concept.get("score_total") or 0.0),
+        "score_breakdown": json.dumps(
+            concept.get("score_breakdown") or {}, sort_keys=True
+        ),
+        "rank": rank,
+    }
+    columns["content_hash"] = instagram_concept_hash(columns)
+    return columns
+
+
+def instagram_concept_hash(columns: dict[str, Any]) -> str:
+    """Return the hash of a concept row's stored payload, scores and rank."""
+    digest = hashlib.sha256()
+    for name in ("concept_payload", "score_total", "score_breakdown", "rank"):
+        digest.update(f"{name}={columns[name]!r}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _sync_instagram_run_concepts(
+    session: Session,
+    ranked_by_run: dict[int, list[dict[str, Any]]],
+) -> dict[int, list[InstagramPipelineConcept]]:
+    """Bring each run's concept rows in line with its ranked concepts.
+
+    Rows are matched by ``concept_key`` and only written when their
+    ``content_hash`` changed, so reruns with identical concepts keep row ids
+    and ``updated_at`` and issue no writes. Returns the rows per run in rank
+    order.
+    """
+    existing: dict[int, dict[str, InstagramPipelineConcept]] = {
+        run_id: {} for run_id in ranked_by_run
+    }
+    for model in session.scalars(
+        select(InstagramPipelineConcept).where(
+            InstagramPipelineConcept.run_id.in_(list(ranked_by_run))
         )
-        session.add(model)
+    ):
+        existing[model.run_id][model.concept_key] = model
+
+    synced: dict[int, list[InstagramPipelineConcept]] = {}
+    for run_id, ranked_concepts in ranked_by_run.items():
+        rows = existing[run_id]
+        models = []
+        for idx, concept in enumerate(ranked_concepts, start=1):
+            key = str(concept["concept_key"])
+            columns = _instagram_concept_columns(idx, concept)
+            model = rows.pop(key, None)
+            if model is None:
+                model = InstagramPipelineConcept(run_id=run_id, concept_key=key)
+                session.add(model)
+            if model.content_hash != columns["content_hash"]:
+                for name, value in columns.items():
+                    setattr(model, name, value)
+            models.append(model)
+        for stale in rows.values():
+            session.delete(stale)
+        synced[run_id] = models
     session.flush()
+    return synced
 
 
 async def _publish_instagram_pipeline_payload(
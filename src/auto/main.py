@@ -4,13 +4,17 @@ from contextlib import asynccontextmanager
 import asyncio
 from .feeds.ingestion import init_db, run_ingest
 from .scheduler import Scheduler
+from .http import close_http_client
+from .db import dispose_async_engine
 from . import configure_logging
-from .metrics import router as metrics_router
+from .config import get_metrics_reconcile_interval
+from .metrics import refresh_metrics, router as metrics_router
 from .web_posts import router as posts_router
 from .socials.registry import get_registry
 from .socials.mastodon_client import MastodonClient
 from .socials.medium_client import MediumClient
 from .socials.twitter_client import TwitterClient
+from .utils.periodic import PeriodicWorker
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,10 +30,17 @@ async def lifespan(app: FastAPI):
     reg.register(TwitterClient())
     sched = Scheduler()
     await sched.start()
+    # Reconcile once before serving so the first scrape is accurate.
+    await asyncio.to_thread(refresh_metrics)
+    metrics_worker = PeriodicWorker(refresh_metrics, get_metrics_reconcile_interval)
+    await metrics_worker.start()
     try:
         yield
     finally:
+        await metrics_worker.stop()
         await sched.stop()
+        await close_http_client()
+        await dispose_async_engine()
 
 
 app = FastAPI(lifespan=lifespan)
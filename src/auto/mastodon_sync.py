@@ -1,25 +1,110 @@
+import html
 import logging
+import re
+from typing import Iterable
+from urllib.parse import urlsplit, urlunsplit
 
+from sqlalchemy import or_, select, update
 from sqlalchemy.orm import Session
 
-from .socials.mastodon_client import MastodonClient
+from .socials.mastodon_client import MastodonClient, status_id_key
 from .scheduler import register_task_handler
-from .models import Post, PostStatus, Task
-from .config import get_mastodon_sync_debug
+from .models import Post, PostStatus, SyncCursor, Task
+from .config import get_mastodon_instance, get_mastodon_sync_debug
 
 logger = logging.getLogger(__name__)
 
+_HREF_RE = re.compile(r"""href=["']([^"']+)["']""")
+_URL_RE = re.compile(r"https?://[^\s<>\"']+")
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[\w.\-]+")
+# Bound on the values in one ``IN`` clause.
+_LOOKUP_CHUNK = 500
 
-async def _fetch_status_texts(client: MastodonClient) -> list[str]:
-    statuses = await client.fetch_all_statuses()
-    return [s.get("content", "") for s in statuses]
+
+def _cursor_name() -> str:
+    return f"mastodon_statuses:{get_mastodon_instance()}"
+
+
+def _url_variants(url: str) -> set[str]:
+    """Return ``url`` as written and without its query, fragment and final ``/``."""
+    parts = urlsplit(url)
+    bare = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+    return {url, url.rstrip("/"), bare, bare.rstrip("/")}
+
+
+def status_index(texts: Iterable[str]) -> set[str]:
+    """Return the URLs and words in status HTML for exact lookups.
+
+    Links come from ``href`` attributes and bare URLs in the text and are also
+    indexed without tracking parameters or fragments; words let plain post ids
+    match as well.
+    """
+    index: set[str] = set()
+    for text in texts:
+        plain = html.unescape(_TAG_RE.sub(" ", text))
+        urls = [html.unescape(u) for u in _HREF_RE.findall(text)]
+        urls += _URL_RE.findall(plain)
+        for url in urls:
+            index.update(_url_variants(url.rstrip(".,;:!?)")))
+        index.update(_TOKEN_RE.findall(plain))
+    return index
+
+
+def _chunks(values: list[str]) -> Iterable[list[str]]:
+    for start in range(0, len(values), _LOOKUP_CHUNK):
+        yield values[start : start + _LOOKUP_CHUNK]
+
+
+def _matching_post_ids(session: Session, index: set[str]) -> list[str]:
+    values = sorted(index)
+    post_ids: set[str] = set()
+    for chunk in _chunks(values):
+        post_ids.update(
+            session.scalars(
+                select(Post.id).where(or_(Post.link.in_(chunk), Post.id.in_(chunk)))
+            )
+        )
+    return sorted(post_ids)
+
+
+def _mark_published(session: Session, post_ids: list[str]) -> None:
+    for chunk in _chunks(post_ids):
+        existing = set(
+            session.scalars(
+                select(PostStatus.post_id).where(
+                    PostStatus.network == "mastodon", PostStatus.post_id.in_(chunk)
+                )
+            )
+        )
+        session.execute(
+            update(PostStatus)
+            .where(
+                PostStatus.network == "mastodon",
+                PostStatus.post_id.in_(existing),
+                PostStatus.status != "published",
+            )
+            .values(status="published")
+        )
+        session.add_all(
+            PostStatus(post_id=post_id, network="mastodon", status="published")
+            for post_id in chunk
+            if post_id not in existing
+        )
 
 
 @register_task_handler("sync_mastodon_posts")
 async def handle_sync_mastodon_posts(task: Task, session: Session) -> None:
-    """Mark posts as published if they already appear on Mastodon."""
+    """Mark posts as published if they already appear on Mastodon.
+
+    Only statuses newer than the stored ``since_id`` cursor are fetched; the
+    first run reads the whole account.
+    """
     client = MastodonClient()
-    texts = await _fetch_status_texts(client)
+    cursor = session.get(SyncCursor, _cursor_name())
+    since_id = cursor.position if cursor else None
+    statuses = await client.fetch_all_statuses(since_id=since_id)
+    texts = [s.get("content", "") for s in statuses]
 
     print(f"Fetched {len(texts)} Mastodon statuses")
     if get_mastodon_sync_debug():
@@ -27,19 +112,15 @@ async def handle_sync_mastodon_posts(task: Task, session: Session) -> None:
             snippet = text.replace("\n", " ")
             print(f"STATUS: {snippet}")
 
-    posts = session.query(Post).all()
+    post_ids = _matching_post_ids(session, status_index(texts))
+    for post_id in post_ids:
+        print(f"Post {post_id} already published")
+    _mark_published(session, post_ids)
 
-    for post in posts:
-        if any(post.link in t or post.id in t for t in texts):
-            print(f"Post {post.id} already published")
-            status = session.get(
-                PostStatus, {"post_id": post.id, "network": "mastodon"}
-            )
-            if status is None:
-                status = PostStatus(
-                    post_id=post.id, network="mastodon", status="published"
-                )
-                session.add(status)
-            else:
-                status.status = "published"
+    if statuses:
+        newest = str(max((s["id"] for s in statuses), key=status_id_key))
+        if cursor is None:
+            session.add(SyncCursor(name=_cursor_name(), position=newest))
+        elif status_id_key(newest) > status_id_key(cursor.position):
+            cursor.position = newest
     session.commit()
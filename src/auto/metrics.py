@@ -1,12 +1,31 @@
+"""Prometheus metrics and the ``/metrics`` route.
+
+Scrapes only render values held in memory. Counts of posts, tasks and pipeline
+runs are adjusted when sessions commit inserts, deletes and status changes, and
+:func:`reconcile_metrics` periodically recomputes every gauge from the database
+to correct drift from bulk statements or other processes.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
 from fastapi import APIRouter, Response
 from prometheus_client import (
     Counter,
     Gauge,
+    Histogram,
     generate_latest,
     CONTENT_TYPE_LATEST,
 )
-from .db import SessionLocal
-from .models import Post
+from sqlalchemy import and_, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from .models import InstagramPipelineRun, Post, PostMetric, Task
+
+logger = logging.getLogger(__name__)
 
 POSTS_PUBLISHED = Counter(
     "posts_published_total", "Total posts successfully published", ["network"]
@@ -15,14 +34,244 @@ POSTS_FAILED = Counter(
     "posts_failed_total", "Total posts that failed to publish", ["network"]
 )
 POSTS_COLLECTED = Gauge("posts_collected_total", "Total posts collected")
+FEED_FETCHES = Counter(
+    "feed_fetches_total",
+    "Feed fetches by result: changed, unchanged (same body) or not_modified (304)",
+    ["result"],
+)
+ENGAGEMENT_FETCHES = Counter(
+    "engagement_fetches_total",
+    "Engagement metric fetches by network and result (ok or error)",
+    ["network", "result"],
+)
+POST_ENGAGEMENT = Gauge(
+    "post_engagement",
+    "Latest engagement summed over all posts, by network and metric",
+    ["network", "metric"],
+)
+TASKS = Gauge(
+    "tasks", "Tasks in the tasks table by type and status", ["type", "status"]
+)
+TASK_QUEUE_DEPTH = Gauge("task_queue_depth", "Tasks that are due and claimable")
+TASK_OLDEST_DUE_AGE = Gauge(
+    "task_oldest_due_age_seconds",
+    "Seconds since the oldest claimable task became due",
+)
+PIPELINE_RUNS = Gauge(
+    "instagram_pipeline_runs", "Instagram pipeline runs by status", ["status"]
+)
+ARTIFACT_EXPORT_BACKLOG = Gauge(
+    "artifact_export_backlog", "Artifact exports queued or being written"
+)
+TASK_DURATION = Histogram(
+    "task_handler_duration_seconds",
+    "Time spent in task handlers by task type",
+    ["type"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+TASK_QUEUE_WAIT = Histogram(
+    "task_queue_wait_seconds",
+    "Delay between a task's scheduled time and the start of its handler",
+    ["type"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 300, 900, 1800, 3600, 7200),
+)
+TASK_COMMIT_DURATION = Histogram(
+    "task_commit_duration_seconds",
+    "Time spent committing a task's final state by task type",
+    ["type"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
 
 router = APIRouter()
 
+_oldest_due_at: Optional[float] = None
+TASK_OLDEST_DUE_AGE.set_function(
+    lambda: 0.0 if _oldest_due_at is None else max(0.0, time.time() - _oldest_due_at)
+)
+
+_DELTAS_KEY = "auto.metrics.deltas"
+
+
+def _pending_deltas(session: Session) -> defaultdict:
+    return session.info.setdefault(_DELTAS_KEY, defaultdict(float))
+
+
+def _status(obj) -> str:
+    # Read from ``__dict__`` so unloaded server defaults never trigger a query.
+    return obj.__dict__.get("status") or "pending"
+
+
+def _gauge_key(obj, status: Optional[str] = None):
+    if isinstance(obj, Post):
+        return POSTS_COLLECTED, ()
+    if isinstance(obj, Task):
+        task_type = obj.__dict__.get("type")
+        if task_type is None:
+            return None
+        return TASKS, (task_type, status or _status(obj))
+    if isinstance(obj, InstagramPipelineRun):
+        return PIPELINE_RUNS, (status or _status(obj),)
+    return None
+
+
+def track_task_status(
+    session: Session, task_type: str, old: str, new: str, count: int = 1
+) -> None:
+    """Record a task status change made with a bulk ``UPDATE``.
+
+    The gauges are adjusted when ``session`` commits.
+    """
+    deltas = _pending_deltas(session)
+    deltas[(TASKS, (task_type, old))] -= count
+    deltas[(TASKS, (task_type, new))] += count
+
+
+def track_tasks_deleted(
+    session: Session, counts: Iterable[tuple[str, str, int]]
+) -> None:
+    """Record tasks removed with a bulk ``DELETE``, applied on commit.
+
+    ``counts`` holds ``(type, status, count)`` rows for the deleted tasks.
+    """
+    deltas = _pending_deltas(session)
+    for task_type, status, count in counts:
+        deltas[(TASKS, (task_type, status))] -= count
+
+
+def track_posts_added(session: Session, count: int) -> None:
+    """Record posts inserted with a bulk ``INSERT``, applied on commit."""
+    _pending_deltas(session)[(POSTS_COLLECTED, ())] += count
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, _flush_context) -> None:
+    deltas = _pending_deltas(session)
+    for obj in session.new:
+        key = _gauge_key(obj)
+        if key is not None:
+            deltas[key] += 1
+    for obj in session.deleted:
+        key = _gauge_key(obj)
+        if key is not None:
+            deltas[key] -= 1
+    for obj in session.dirty:
+        if not isinstance(obj, (Task, InstagramPipelineRun)):
+            continue
+        history = inspect(obj).attrs.status.history
+        if history.deleted and history.added:
+            old_key = _gauge_key(obj, history.deleted[0])
+            if old_key is not None:
+                deltas[old_key] -= 1
+                deltas[_gauge_key(obj, history.added[0])] += 1
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_deltas(session: Session) -> None:
+    deltas = session.info.pop(_DELTAS_KEY, None)
+    for (gauge, labels), delta in (deltas or {}).items():
+        if delta:
+            (gauge.labels(*labels) if labels else gauge).inc(delta)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_deltas(session: Session) -> None:
+    session.info.pop(_DELTAS_KEY, None)
+
+
+def _engagement_totals_query():
+    """Sum the latest sample of each post's metrics per network and metric."""
+    latest = (
+        select(
+            PostMetric.post_id,
+            PostMetric.network,
+            PostMetric.name,
+            func.max(PostMetric.collected_at).label("collected_at"),
+        )
+        .group_by(PostMetric.post_id, PostMetric.network, PostMetric.name)
+        .subquery()
+    )
+    return (
+        select(PostMetric.network, PostMetric.name, func.sum(PostMetric.value))
+        .join(
+            latest,
+            and_(
+                PostMetric.post_id == latest.c.post_id,
+                PostMetric.network == latest.c.network,
+                PostMetric.name == latest.c.name,
+                PostMetric.collected_at == latest.c.collected_at,
+            ),
+        )
+        .group_by(PostMetric.network, PostMetric.name)
+    )
+
+
+def refresh_queue_metrics(session: Session, *, now: Optional[datetime] = None) -> None:
+    """Recompute ``task_queue_depth`` and ``task_oldest_due_age_seconds``.
+
+    Whether a task is claimable depends on the clock as well as on writes, so
+    these gauges are not adjusted on commit. The scheduler refreshes them after
+    every iteration and :func:`reconcile_metrics` on its interval.
+    """
+    from .config import get_max_attempts
+    from .scheduler import _claimable
+
+    global _oldest_due_at
+    if now is None:
+        now = datetime.now(timezone.utc)
+    depth, oldest = session.execute(
+        select(func.count(), func.min(Task.scheduled_at)).where(
+            _claimable(now, get_max_attempts())
+        )
+    ).one()
+    TASK_QUEUE_DEPTH.set(depth)
+    if oldest is not None and oldest.tzinfo is None:
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    _oldest_due_at = oldest.timestamp() if oldest is not None else None
+
+
+def reconcile_metrics(session: Session, *, now: Optional[datetime] = None) -> None:
+    """Recompute every database-backed gauge from ``session``'s database."""
+    if now is None:
+        now = datetime.now(timezone.utc)
+
+    POSTS_COLLECTED.set(session.scalar(select(func.count()).select_from(Post)))
+
+    task_counts = session.execute(
+        select(Task.type, Task.status, func.count()).group_by(Task.type, Task.status)
+    ).all()
+    TASKS.clear()
+    for task_type, status, count in task_counts:
+        TASKS.labels(task_type, status).set(count)
+
+    refresh_queue_metrics(session, now=now)
+
+    run_counts = session.execute(
+        select(InstagramPipelineRun.status, func.count()).group_by(
+            InstagramPipelineRun.status
+        )
+    ).all()
+    PIPELINE_RUNS.clear()
+    for status, count in run_counts:
+        PIPELINE_RUNS.labels(status).set(count)
+
+    engagement = session.execute(_engagement_totals_query()).all()
+    POST_ENGAGEMENT.clear()
+    for network, name, value in engagement:
+        POST_ENGAGEMENT.labels(network=network, metric=name).set(value)
+
+
+def refresh_metrics() -> None:
+    """Run :func:`reconcile_metrics` in a new session, logging failures."""
+    from .db import SessionLocal
+
+    try:
+        with SessionLocal() as session:
+            reconcile_metrics(session)
+    except Exception as exc:
+        logger.warning("Failed to reconcile metrics: %s", exc)
+
 
 @router.get("/metrics")
-def metrics() -> Response:
-    """Return Prometheus metrics."""
-    with SessionLocal() as session:
-        total = session.query(Post).count()
-        POSTS_COLLECTED.set(total)
+async def metrics() -> Response:
+    """Return Prometheus metrics from memory without touching the database."""
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,128 @@
+"""Collect engagement metrics for published posts.
+
+Each published post with a remote id is polled on a schedule that decays with
+its age (see ``METRICS_POLL_TIERS``), so fresh posts are sampled often and the
+number of API calls stays bounded as the catalogue grows.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .config import (
+    get_metrics_batch_size,
+    get_metrics_concurrency,
+    get_metrics_harvest_interval,
+    get_metrics_poll_tiers,
+)
+from .metrics import ENGAGEMENT_FETCHES
+from .models import PostMetric, PostStatus, Task
+from .scheduler import register_task_handler
+from .socials.registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+
+def next_metrics_due(
+    published_at: datetime, now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """Return when a post published at ``published_at`` should next be polled.
+
+    Returns ``None`` once the post is older than the last poll tier.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    age = (now - published_at).total_seconds()
+    for max_age, interval in get_metrics_poll_tiers():
+        if age < max_age:
+            return now + timedelta(seconds=interval)
+    return None
+
+
+async def harvest_metrics(session: Session, *, now: Optional[datetime] = None) -> int:
+    """Fetch and store engagement for published posts that are due.
+
+    Up to ``METRICS_BATCH_SIZE`` posts are fetched, ``METRICS_CONCURRENCY`` at
+    a time, and each sample is stored as ``post_metrics`` rows. Returns the
+    number of posts polled.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    due = session.scalars(
+        select(PostStatus)
+        .where(
+            PostStatus.metrics_due_at <= now,
+            PostStatus.status == "published",
+            PostStatus.remote_id.is_not(None),
+        )
+        .order_by(PostStatus.metrics_due_at)
+        .limit(get_metrics_batch_size())
+    ).all()
+    if not due:
+        return 0
+
+    registry = get_registry()
+    semaphore = asyncio.Semaphore(get_metrics_concurrency())
+
+    async def fetch(status: PostStatus) -> Optional[dict[str, int]]:
+        plugin = registry.get(status.network)
+        if plugin is None:
+            return None
+        async with semaphore:
+            try:
+                metrics = await plugin.fetch_metrics(status.remote_id)
+            except Exception as exc:
+                logger.warning(
+                    "Failed to fetch metrics for %s on %s: %s",
+                    status.post_id,
+                    status.network,
+                    exc,
+                )
+                ENGAGEMENT_FETCHES.labels(network=status.network, result="error").inc()
+                return None
+        ENGAGEMENT_FETCHES.labels(network=status.network, result="ok").inc()
+        return metrics
+
+    results = await asyncio.gather(*(fetch(status) for status in due))
+    for status, metrics in zip(due, results):
+        session.add_all(
+            PostMetric(
+                post_id=status.post_id,
+                network=status.network,
+                name=name,
+                value=int(value),
+                collected_at=now,
+            )
+            for name, value in (metrics or {}).items()
+        )
+        status.metrics_due_at = next_metrics_due(
+            status.published_at or status.updated_at, now
+        )
+    session.commit()
+    return len(due)
+
+
+@register_task_handler("harvest_metrics")
+async def handle_harvest_metrics(task: Task, session: Session) -> None:
+    """Harvest due engagement metrics and schedule the next run."""
+    try:
+        count = await harvest_metrics(session)
+        logger.info("Harvested metrics for %d post(s)", count)
+    finally:
+        next_run = datetime.now(timezone.utc) + timedelta(
+            seconds=get_metrics_harvest_interval()
+        )
+        session.add(Task(type="harvest_metrics", scheduled_at=next_run))
+
+
+def ensure_initial_task(session: Session) -> None:
+    """Ensure at least one harvest_metrics task exists."""
+    exists = session.query(Task).filter(Task.type == "harvest_metrics").first()
+    if not exists:
+        session.add(Task(type="harvest_metrics"))
@@ -10,6 +10,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     UniqueConstraint,
     text,
 )
@@ -62,6 +63,14 @@ class Post(Base):
 
 class PostStatus(Base):
     __tablename__ = "post_status"
+    __table_args__ = (
+        Index(
+            "ix_post_status_metrics_due_at",
+            "metrics_due_at",
+            postgresql_where=text("metrics_due_at IS NOT NULL"),
+            sqlite_where=text("metrics_due_at IS NOT NULL"),
+        ),
+    )
 
     post_id = Column(String, ForeignKey("posts.id"), primary_key=True)
     network = Column(String, primary_key=True)
@@ -73,6 +82,11 @@ class PostStatus(Base):
     status = Column(String, nullable=False, server_default="pending")
     attempts = Column(Integer, nullable=False, server_default="0")
     last_error = Column(Text)
+    # Id of the published post on the network, used to fetch engagement.
+    remote_id = Column(String)
+    published_at = Column(TZDateTime())
+    # When engagement metrics should next be harvested.
+    metrics_due_at = Column(TZDateTime())
     updated_at = Column(
         TZDateTime(),
         nullable=False,
@@ -81,6 +95,28 @@ class PostStatus(Base):
     )
 
 
+class PostMetric(Base):
+    """One engagement sample, e.g. the favourites of a post at a point in time."""
+
+    __tablename__ = "post_metrics"
+    __table_args__ = (
+        Index(
+            "ix_post_metrics_series",
+            "post_id",
+            "network",
+            "name",
+            "collected_at",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    post_id = Column(String, ForeignKey("posts.id"), nullable=False)
+    network = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    value = Column(Integer, nullable=False)
+    collected_at = Column(TZDateTime(), nullable=False)
+
+
 class PostPreview(Base):
     __tablename__ = "post_previews"
 
@@ -97,6 +133,15 @@ class PostPreview(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index(
+            "ix_tasks_status_scheduled_at",
+            "status",
+            "scheduled_at",
+            postgresql_where=text("status IN ('pending', 'error', 'running')"),
+            sqlite_where=text("status IN ('pending', 'error', 'running')"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     type = Column(String, nullable=False)
@@ -109,6 +154,8 @@ class Task(Base):
     status = Column(String, nullable=False, server_default="pending")
     attempts = Column(Integer, nullable=False, server_default="0")
     last_error = Column(Text)
+    claimed_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(
         DateTime(timezone=True),
         nullable=False,
@@ -122,6 +169,79 @@ class Task(Base):
     )
 
 
+class TaskArchive(Base):
+    """Finished task moved out of ``tasks`` by :mod:`auto.task_archive`."""
+
+    __tablename__ = "tasks_archive"
+
+    # ``tasks`` ids can be reused on SQLite once the newest task is archived,
+    # so the archive keys rows itself and keeps the original id in ``task_id``.
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False, index=True)
+    type = Column(String, nullable=False)
+    payload = Column(Text)
+    scheduled_at = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False)
+    last_error = Column(Text)
+    claimed_by = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP"),
+    )
+
+
+class Feed(Base):
+    """Polling and conditional-fetch state for one feed URL."""
+
+    __tablename__ = "feeds"
+
+    url = Column(String, primary_key=True, nullable=False)
+    etag = Column(String)
+    last_modified = Column(String)
+    content_hash = Column(String)
+    last_fetched_at = Column(TZDateTime())
+    # Seconds between polls; ``INGEST_INTERVAL`` applies when unset.
+    poll_interval = Column(Integer)
+    last_success_at = Column(TZDateTime())
+    error_count = Column(Integer, nullable=False, server_default="0")
+    # Newest entry date seen by a streaming fetch; reading stops there.
+    latest_entry_at = Column(TZDateTime())
+
+
+class SyncCursor(Base):
+    """Position reached by an incremental sync, such as a Mastodon status id."""
+
+    __tablename__ = "sync_cursors"
+
+    name = Column(String, primary_key=True, nullable=False)
+    position = Column(String, nullable=False)
+    updated_at = Column(
+        TZDateTime(),
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP"),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+
+class LLMResponse(Base):
+    """Cached LLM completion keyed by a hash of the model and prompt."""
+
+    __tablename__ = "llm_responses"
+
+    key = Column(String, primary_key=True, nullable=False)
+    model = Column(String, nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(
+        TZDateTime(),
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP"),
+    )
+
+
 class InstagramPipelineRun(Base):
     __tablename__ = "instagram_pipeline_runs"
     __table_args__ = (
@@ -177,6 +297,7 @@ class InstagramPipelineConcept(Base):
     score_total = Column(Float, nullable=True)
     score_breakdown = Column(Text)
     rank = Column(Integer, nullable=True)
+    content_hash = Column(String, nullable=True)
     created_at = Column(
         TZDateTime(),
         nullable=False,
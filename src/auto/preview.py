@@ -1,19 +1,136 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
 import json
 import re
 import logging
 from pathlib import Path
+from typing import Any, Iterable, Optional
 
 import dspy
-from jinja2 import Template
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from .models import Post, PostStatus, PostPreview
+from .config import get_preview_api_base, get_preview_concurrency, get_preview_model
+from .models import LLMResponse, Post, PostStatus, PostPreview
+from .templating import render_template
 
 logger = logging.getLogger(__name__)
 
+_lm: Optional[dspy.LM] = None
+
+
+def get_preview_lm() -> dspy.LM:
+    """Return the shared preview LM, rebuilt only when its settings change."""
+    global _lm
+    model = get_preview_model()
+    api_base = get_preview_api_base()
+    if _lm is None or (_lm.model, _lm.kwargs.get("api_base")) != (model, api_base):
+        _lm = dspy.LM(model, api_base=api_base, api_key="")
+    return _lm
+
+
+def _template_path(network: str, template_path: str | None) -> Path:
+    if template_path is None:
+        template_path = os.getenv("PREVIEW_TEMPLATE_PATH")
+    if template_path is None:
+        return (
+            Path(__file__).resolve().parent
+            / "templates"
+            / f"{network}_preview_prompt.txt"
+        )
+    return Path(template_path)
+
+
+def _render_prompt(template_str: str, post: Post) -> str:
+    return render_template(template_str, content=post.content or "", post_id=post.id)
+
+
+def response_cache_key(model: str, prompt: str) -> str:
+    """Return the ``llm_responses`` key for ``prompt`` sent to ``model``."""
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+def _response_text(response: Any) -> str:
+    if isinstance(response, list):
+        response = response[0]
+    return str(response).strip()
+
+
+def parse_preview_response(raw: str) -> dict:
+    """Return the preview fields in an LLM response.
+
+    JSON inside a fenced code block or as the whole response is used as is;
+    anything else becomes ``{"tweet": raw}``.
+    """
+    m = re.search(r"```(?:json)?\s*(.*?)```", raw, flags=re.DOTALL)
+    if m:
+        inner = m.group(1)
+        try:
+            data = json.loads(inner)
+        except json.JSONDecodeError as e:
+            logger.debug("JSON parse error: %s", e)
+            data = None
+    else:
+        logger.debug("No code-block found; using raw string")
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            data = None
+
+    if not isinstance(data, dict):
+        logger.debug("not instance error: %s", data)
+        data = {"tweet": raw}
+    return data
+
+
+def _fallback_preview(post: Post) -> dict:
+    return {"tweet": post.summary or post.title}
+
+
+def _save_preview(
+    session: Session, post_id: str, network: str, data: dict
+) -> PostPreview:
+    content = json.dumps(data)
+    preview = session.get(PostPreview, {"post_id": post_id, "network": network})
+    if preview is None:
+        preview = PostPreview(post_id=post_id, network=network, content=content)
+        session.add(preview)
+    else:
+        preview.content = content
+    logger.debug(content)
+    return preview
+
+
+def _preview_prompt(
+    session: Session, post_id: str, network: str, template_path: str | None
+) -> tuple[Post, str]:
+    status = session.get(PostStatus, {"post_id": post_id, "network": network})
+    if status is None:
+        raise ValueError(f"Post {post_id} is not scheduled for {network}")
+
+    post = session.get(Post, post_id)
+    if post is None:
+        raise ValueError(f"Post {post_id} not found")
+
+    template_str = _template_path(network, template_path).read_text()
+    return post, _render_prompt(template_str, post)
+
+
+def _complete(lm: dspy.LM, message: str) -> str:
+    """Send ``message`` to ``lm`` and return the response text."""
+    return _response_text(lm(messages=[{"role": "user", "content": message}]))
+
+
+def _store_preview(
+    session: Session, post: Post, network: str, raw: Optional[str]
+) -> None:
+    data = _fallback_preview(post) if raw is None else parse_preview_response(raw)
+    _save_preview(session, post.id, network, data)
+    session.commit()
+
 
 def create_preview(
     session: Session,
@@ -24,72 +141,158 @@ def create_preview(
     use_llm: bool = True,
 ) -> None:
     """Generate or update a preview for ``post_id`` and ``network``."""
+    post, message = _preview_prompt(session, post_id, network, template_path)
 
-    status = session.get(PostStatus, {"post_id": post_id, "network": network})
-    if status is None:
-        raise ValueError(f"Post {post_id} is not scheduled for {network}")
+    raw = None
+    if use_llm:
+        try:
+            lm = get_preview_lm()
+            key = response_cache_key(lm.model, message)
+            cached = session.get(LLMResponse, key)
+            if cached is not None:
+                raw = cached.response
+            else:
+                raw = _complete(lm, message)
+                session.add(LLMResponse(key=key, model=lm.model, response=raw))
+        except Exception:
+            logger.debug("LLM preview generation failed", exc_info=True)
+            raw = None
 
-    post = session.get(Post, post_id)
-    if post is None:
-        raise ValueError(f"Post {post_id} not found")
+    _store_preview(session, post, network, raw)
 
-    if template_path is None:
-        template_path = os.getenv("PREVIEW_TEMPLATE_PATH")
-    if template_path is None:
-        template_path = (
-            Path(__file__).resolve().parent
-            / "templates"
-            / f"{network}_preview_prompt.txt"
-        )
-    template_str = Path(template_path).read_text()
-    message = Template(template_str).render(content=post.content or "", post_id=post_id)
 
+async def create_preview_async(
+    session: Session,
+    post_id: str,
+    network: str = "mastodon",
+    *,
+    template_path: str | None = None,
+    use_llm: bool = True,
+) -> None:
+    """Like :func:`create_preview`, but keep the LLM call off the event loop.
+
+    Only the prompt and response text cross into the worker thread; ``session``
+    is used on the calling thread alone.
+    """
+    post, message = _preview_prompt(session, post_id, network, template_path)
+
+    raw = None
     if use_llm:
         try:
-            lm = dspy.LM(
-                "ollama_chat/gemma3:12b",
-                api_base="http://localhost:11434",
-                api_key="",
-            )
-            dspy.configure(lm=lm)
-            response = lm(messages=[{"role": "user", "content": message}])
-            if isinstance(response, list):
-                response = response[0]
-            raw = str(response).strip()
-
-            m = re.search(r"```(?:json)?\s*(.*?)```", raw, flags=re.DOTALL)
-            if m:
-                inner = m.group(1)
-                try:
-                    data = json.loads(inner)
-                except json.JSONDecodeError as e:
-                    logger.debug("JSON parse error: %s", e)
-                    data = None
+            lm = get_preview_lm()
+            key = response_cache_key(lm.model, message)
+            cached = session.get(LLMResponse, key)
+            if cached is not None:
+                raw = cached.response
             else:
-                logger.debug("No code-block found; using raw string")
-                try:
-                    data = json.loads(raw)
-                except json.JSONDecodeError:
-                    data = None
-
-            if not isinstance(data, dict):
-                logger.debug("not instance error: %s", data)
-                data = {"tweet": raw}
+                raw = await asyncio.to_thread(_complete, lm, message)
+                session.add(LLMResponse(key=key, model=lm.model, response=raw))
         except Exception:
             logger.debug("LLM preview generation failed", exc_info=True)
-            data = {"tweet": post.summary or post.title}
-    else:
-        data = {"tweet": post.summary or post.title}
+            raw = None
 
-    preview = session.get(PostPreview, {"post_id": post_id, "network": network})
-    if preview is not None:
-        session.delete(preview)
+    _store_preview(session, post, network, raw)
+
+
+def missing_preview_pairs(session: Session) -> list[tuple[str, str]]:
+    """Return ``(post_id, network)`` for every scheduled post without a preview."""
+    stmt = (
+        select(PostStatus.post_id, PostStatus.network)
+        .outerjoin(
+            PostPreview,
+            (PostPreview.post_id == PostStatus.post_id)
+            & (PostPreview.network == PostStatus.network),
+        )
+        .where(PostPreview.post_id.is_(None))
+        .order_by(PostStatus.post_id, PostStatus.network)
+    )
+    return [(post_id, network) for post_id, network in session.execute(stmt)]
+
+
+async def generate_previews(
+    session: Session,
+    pairs: Iterable[tuple[str, str]],
+    *,
+    template_path: str | None = None,
+    use_llm: bool = True,
+    concurrency: int | None = None,
+) -> int:
+    """Generate previews for many ``(post_id, network)`` pairs.
 
-    preview = PostPreview(
-        post_id=post_id,
-        network=network,
-        content=json.dumps(data),
+    Posts and templates are loaded once per batch, the shared LM is called for
+    up to ``concurrency`` prompts at a time (``PREVIEW_CONCURRENCY`` by default)
+    and responses are cached in ``llm_responses``, so rerunning a batch only
+    calls the model for prompts that changed. Pairs without a scheduled post
+    are skipped. Returns the number of previews saved.
+    """
+    pairs = list(dict.fromkeys(pairs))
+    post_ids = {post_id for post_id, _ in pairs}
+    posts = {
+        post.id: post
+        for post in session.scalars(select(Post).where(Post.id.in_(post_ids)))
+    }
+    scheduled = set(
+        session.execute(
+            select(PostStatus.post_id, PostStatus.network).where(
+                PostStatus.post_id.in_(post_ids)
+            )
+        ).tuples()
     )
-    session.add(preview)
+
+    templates: dict[Path, str] = {}
+    prompts: dict[tuple[str, str], str] = {}
+    for post_id, network in pairs:
+        if (post_id, network) not in scheduled or post_id not in posts:
+            logger.warning(
+                "Post %s is not scheduled for %s; skipping", post_id, network
+            )
+            continue
+        path = _template_path(network, template_path)
+        if path not in templates:
+            templates[path] = path.read_text()
+        prompts[(post_id, network)] = _render_prompt(templates[path], posts[post_id])
+
+    responses: dict[str, str] = {}
+    keys: dict[tuple[str, str], str] = {}
+    if use_llm and prompts:
+        lm = get_preview_lm()
+        keys = {pair: response_cache_key(lm.model, p) for pair, p in prompts.items()}
+        responses.update(
+            session.execute(
+                select(LLMResponse.key, LLMResponse.response).where(
+                    LLMResponse.key.in_(set(keys.values()))
+                )
+            ).all()
+        )
+        pending = {
+            keys[pair]: prompt
+            for pair, prompt in prompts.items()
+            if keys[pair] not in responses
+        }
+        semaphore = asyncio.Semaphore(concurrency or get_preview_concurrency())
+
+        async def complete(key: str, prompt: str) -> None:
+            async with semaphore:
+                try:
+                    response = await lm.acall(
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                except Exception:
+                    logger.debug("LLM preview generation failed", exc_info=True)
+                    return
+            responses[key] = _response_text(response)
+            session.add(LLMResponse(key=key, model=lm.model, response=responses[key]))
+
+        await asyncio.gather(*(complete(k, p) for k, p in pending.items()))
+
+    # Load existing previews into the identity map for ``_save_preview``.
+    session.scalars(select(PostPreview).where(PostPreview.post_id.in_(post_ids))).all()
+    for post_id, network in prompts:
+        raw = responses.get(keys.get((post_id, network), ""))
+        if raw is None:
+            data = _fallback_preview(posts[post_id])
+        else:
+            data = parse_preview_response(raw)
+        _save_preview(session, post_id, network, data)
     session.commit()
-    logger.debug(json.dumps(data))
+    return len(prompts)
@@ -0,0 +1,96 @@
+"""cProfile captures of scheduler iterations, task handlers and CLI commands.
+
+Set ``PROFILE_ENABLED=1`` (or pass ``--profile`` to ``auto.cli``) to profile.
+Runs slower than ``PROFILE_THRESHOLD_MS`` are written to ``PROFILE_DIR`` as
+``.pstats`` files that can be opened with ``python -m pstats`` or snakeviz.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .config import (
+    get_profile_dir,
+    get_profile_enabled,
+    get_profile_scope,
+    get_profile_threshold_ms,
+)
+
+logger = logging.getLogger(__name__)
+
+# cProfile hooks the interpreter, so only one capture may run at a time.
+_active = threading.Lock()
+
+
+class Profile:
+    """A single capture named ``name`` that is saved if it ran long enough."""
+
+    def __init__(self, name: str, *, threshold_ms: Optional[float] = None) -> None:
+        self.name = name
+        self.threshold_ms = (
+            get_profile_threshold_ms() if threshold_ms is None else threshold_ms
+        )
+        self.path: Optional[Path] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._started = 0.0
+
+    def start(self) -> bool:
+        """Start profiling; return False if another capture is running."""
+        if not _active.acquire(blocking=False):
+            logger.debug("Profiler busy; not profiling %s", self.name)
+            return False
+        self._profiler = cProfile.Profile()
+        self._started = time.perf_counter()
+        self._profiler.enable()
+        return True
+
+    def stop(self) -> Optional[Path]:
+        """Stop profiling and return the ``.pstats`` path if it was saved."""
+        if self._profiler is None:
+            return None
+        self._profiler.disable()
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        profiler, self._profiler = self._profiler, None
+        _active.release()
+        if elapsed_ms < self.threshold_ms:
+            return None
+        directory = Path(get_profile_dir())
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        slug = re.sub(r"[^\w.-]+", "_", self.name)
+        self.path = directory / f"{slug}-{stamp}-{os.getpid()}.pstats"
+        profiler.dump_stats(self.path)
+        logger.info("Profiled %s (%.0f ms): %s", self.name, elapsed_ms, self.path)
+        return self.path
+
+
+@contextmanager
+def profiled(name: str, *, scope: Optional[str] = None) -> Iterator[None]:
+    """Profile the block when profiling is enabled for ``scope``.
+
+    ``scope`` is ``"iteration"`` or ``"handler"`` and is compared with
+    ``PROFILE_SCOPE``; blocks without a scope are profiled whenever profiling
+    is enabled. Profiling a coroutine captures every task the event loop runs
+    meanwhile.
+    """
+    if not get_profile_enabled() or (
+        scope is not None and scope != get_profile_scope()
+    ):
+        yield
+        return
+    profile = Profile(name)
+    started = profile.start()
+    try:
+        yield
+    finally:
+        if started:
+            profile.stop()
@@ -1,27 +1,50 @@
 import asyncio
 import anyio
 import logging
-from datetime import datetime, timezone
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Callable, Awaitable, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import json
 
-from jinja2 import Template
-
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, bindparam, func, or_, update
 
 from .models import PostStatus, Post, PostPreview, Task
 
-from .db import SessionLocal, get_engine
+from .db import AsyncSessionLocal, SessionLocal, dispose_async_engine, get_engine
 from .socials.registry import get_registry
+from .socials.rate_limit import get_rate_limiter
+from .templating import render_template
+from .profiling import profiled
+from .tracing import span
 
 # Temporary alias for tests using the old PLUGINS mapping
-from .metrics import POSTS_PUBLISHED, POSTS_FAILED
+from .metrics import (
+    POSTS_FAILED,
+    POSTS_PUBLISHED,
+    TASK_COMMIT_DURATION,
+    TASK_DURATION,
+    TASK_QUEUE_WAIT,
+    refresh_queue_metrics,
+    track_task_status,
+)
 from .utils.periodic import PeriodicWorker
+from .task_notify import TaskWakeup
+from .export_queue import close_export_queue
+from .http import close_http_client
 from .config import (
     get_poll_interval,
-    get_post_delay,
     get_max_attempts,
+    get_scheduler_batch_size,
+    get_scheduler_concurrency,
+    get_scheduler_event_driven,
+    get_scheduler_lease_seconds,
+    get_scheduler_max_sleep,
+    get_scheduler_task_limits,
     get_instagram_pipeline_enabled,
     get_instagram_pipeline_auto_publish,
     get_instagram_pipeline_quality_threshold,
@@ -29,11 +52,16 @@ from .config import (
     get_instagram_pipeline_export_enabled,
     get_instagram_pipeline_export_dir,
 )
-from .instagram_pipeline import execute_instagram_pipeline_run
+from .instagram_pipeline import (
+    execute_instagram_pipeline_batch,
+    execute_instagram_pipeline_run,
+)
 
 logger = logging.getLogger(__name__)
 
 TASK_HANDLERS: Dict[str, Callable[[Task, Session], Awaitable[None]]] = {}
+# Task types whose handlers receive an ``AsyncSession`` instead of a ``Session``.
+ASYNC_SESSION_HANDLERS: set[str] = set()
 
 
 def _load_default_handlers() -> None:
@@ -43,55 +71,90 @@ def _load_default_handlers() -> None:
         ingest_scheduler,
         mark_published,
         mastodon_sync,
+        metrics_harvest,
         replay_fixture,
         replay_scanner,
+        task_archive,
     )
 
 
-def register_task_handler(
-    name: str,
-) -> Callable[
+def register_task_handler(name: str, *, async_session: bool = False) -> Callable[
     [Callable[[Task, Session], Awaitable[None]]],
     Callable[[Task, Session], Awaitable[None]],
 ]:
+    """Register the decorated coroutine as the handler for ``name`` tasks.
+
+    With ``async_session=True`` the handler is passed an ``AsyncSession`` so
+    its queries do not block the event loop.
+    """
+
     def decorator(func: Callable[[Task, Session], Awaitable[None]]):
         TASK_HANDLERS[name] = func
+        if async_session:
+            ASYNC_SESSION_HANDLERS.add(name)
+        else:
+            ASYNC_SESSION_HANDLERS.discard(name)
         return func
 
     return decorator
 
 
-def _create_preview_for_task(session: Session, post_id: str, network: str) -> None:
-    from .preview import create_preview as _create_preview
+class TaskDeferred(Exception):
+    """Raised by a handler to put its task back in the queue until later.
 
-    _create_preview(session, post_id, network)
+    The task returns to ``pending`` with ``scheduled_at`` moved ``seconds``
+    ahead and the attempt is not counted.
+    """
 
+    def __init__(self, seconds: float) -> None:
+        super().__init__(f"deferred for {seconds:.1f}s")
+        self.until = datetime.now(timezone.utc) + timedelta(seconds=seconds)
 
-async def _publish(status: PostStatus, session: Session) -> None:
-    post = session.get(Post, status.post_id)
+
+async def _create_preview_for_task(
+    session: Session, post_id: str, network: str
+) -> None:
+    from .preview import create_preview_async
+
+    await create_preview_async(session, post_id, network)
+
+
+async def _publish(status: PostStatus, session: AsyncSession) -> None:
+    post = await session.get(Post, status.post_id)
     if not post:
         logger.error("Post %s not found", status.post_id)
         status.status = "error"
         status.last_error = "post not found"
         status.attempts += 1
-        session.commit()
+        await session.commit()
         return
+    delay = get_rate_limiter(status.network).try_acquire()
+    if delay > 0:
+        # Sleeping here would hold a dispatch slot for the whole cooldown.
+        raise TaskDeferred(delay)
     try:
         plugin_registry = get_registry()
         plugin = plugin_registry.get(status.network)
         if plugin is None:
             raise ValueError(f"Unsupported network {status.network}")
-        preview = session.get(
+        preview = await session.get(
             PostPreview,
             {"post_id": status.post_id, "network": status.network},
         )
         if preview:
-            text = Template(preview.content).render(post=post)
+            text = render_template(preview.content, post=post)
         else:
             text = f"{post.title} {post.link}"
-        await plugin.post(text, visibility="unlisted")
+        with span("plugin.post", network=status.network, post_id=status.post_id):
+            remote_id = await plugin.post(text, visibility="unlisted")
         status.status = "published"
         status.last_error = None
+        status.remote_id = remote_id
+        status.published_at = datetime.now(timezone.utc)
+        if remote_id is not None:
+            from .metrics_harvest import next_metrics_due
+
+            status.metrics_due_at = next_metrics_due(status.published_at)
         POSTS_PUBLISHED.labels(network=status.network).inc()
     except Exception as exc:
         status.status = "error"
@@ -100,16 +163,15 @@ async def _publish(status: PostStatus, session: Session) -> None:
         POSTS_FAILED.labels(network=status.network).inc()
     finally:
         status.attempts += 1
-        session.commit()
-        await asyncio.sleep(get_post_delay())
+        await session.commit()
 
 
-@register_task_handler("publish_post")
-async def handle_publish_post(task: Task, session: Session) -> None:
+@register_task_handler("publish_post", async_session=True)
+async def handle_publish_post(task: Task, session: AsyncSession) -> None:
     data = json.loads(task.payload or "{}")
     post_id = data.get("post_id")
     network = data.get("network")
-    status = session.get(PostStatus, {"post_id": post_id, "network": network})
+    status = await session.get(PostStatus, {"post_id": post_id, "network": network})
     if status is None:
         raise ValueError(f"status not found for {post_id}/{network}")
     await _publish(status, session)
@@ -120,15 +182,16 @@ async def handle_create_preview(task: Task, session: Session) -> None:
     data = json.loads(task.payload or "{}")
     post_id = data.get("post_id")
     network = data.get("network", "mastodon")
-    _create_preview_for_task(session, post_id, network)
+    await _create_preview_for_task(session, post_id, network)
 
 
 @register_task_handler("instagram_pipeline_run")
 async def handle_instagram_pipeline_run(task: Task, session: Session) -> None:
     data = json.loads(task.payload or "{}")
     post_id = data.get("post_id")
-    if not post_id:
-        raise ValueError("instagram_pipeline_run requires post_id")
+    post_ids = data.get("post_ids")
+    if not post_id and not post_ids:
+        raise ValueError("instagram_pipeline_run requires post_id or post_ids")
 
     network = data.get("network") or "instagram"
     pipeline_version = data.get("pipeline_version") or "v1"
@@ -138,63 +201,544 @@ async def handle_instagram_pipeline_run(task: Task, session: Session) -> None:
     else:
         auto_publish = bool(payload_auto_publish)
 
-    await execute_instagram_pipeline_run(
-        session,
-        post_id=post_id,
-        network=network,
-        pipeline_version=pipeline_version,
-        auto_publish=auto_publish,
-        quality_threshold=get_instagram_pipeline_quality_threshold(),
-        banned_terms=get_instagram_pipeline_banned_terms(),
-        pipeline_enabled=get_instagram_pipeline_enabled(),
-        export_enabled=get_instagram_pipeline_export_enabled(),
-        export_dir=get_instagram_pipeline_export_dir(),
+    options = {
+        "network": network,
+        "pipeline_version": pipeline_version,
+        "auto_publish": auto_publish,
+        "quality_threshold": get_instagram_pipeline_quality_threshold(),
+        "banned_terms": get_instagram_pipeline_banned_terms(),
+        "pipeline_enabled": get_instagram_pipeline_enabled(),
+        "export_enabled": get_instagram_pipeline_export_enabled(),
+        "export_dir": get_instagram_pipeline_export_dir(),
+    }
+    if post_ids:
+        await execute_instagram_pipeline_batch(session, post_ids=post_ids, **options)
+    else:
+        await execute_instagram_pipeline_run(session, post_id=post_id, **options)
+
+
+class _DispatchLimiter:
+    """Bound concurrent task execution globally and per task type."""
+
+    def __init__(self, concurrency: int, type_limits: Dict[str, int]) -> None:
+        self._global = asyncio.Semaphore(concurrency)
+        self._type_limits = type_limits
+        self._per_type: Dict[str, asyncio.Semaphore] = {}
+
+    def _type_semaphore(self, task_type: str) -> Optional[asyncio.Semaphore]:
+        limit = self._type_limits.get(task_type)
+        if limit is None:
+            return None
+        if task_type not in self._per_type:
+            self._per_type[task_type] = asyncio.Semaphore(limit)
+        return self._per_type[task_type]
+
+    async def run(self, task_type: str, coro: Awaitable[None]) -> None:
+        # Take the per-type slot first so a saturated type never holds global
+        # slots that other task types could use.
+        type_sem = self._type_semaphore(task_type)
+        if type_sem is None:
+            async with self._global:
+                await coro
+            return
+        async with type_sem:
+            async with self._global:
+                await coro
+
+
+def default_worker_id() -> str:
+    """Return an identifier for this scheduler process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# Statuses the poll query considers. The ``tasks`` partial index uses the same
+# predicate, and the list is rendered as literals so planners can match it.
+CLAIMABLE_STATUSES = ("pending", "error", "running")
+
+
+def _claimable_status():
+    """Return the status predicate matching the ``tasks`` partial index."""
+    return Task.status.in_(
+        bindparam(
+            "claimable_statuses",
+            CLAIMABLE_STATUSES,
+            expanding=True,
+            literal_execute=True,
+        )
     )
 
 
-async def process_pending(max_attempts: Optional[int] = None) -> None:
-    """Fetch due tasks and dispatch them to registered handlers."""
-    _load_default_handlers()
+def _claimable(now: datetime, max_attempts: int):
+    """Return the filter matching tasks a worker may claim at ``now``."""
+    return and_(
+        _claimable_status(),
+        Task.scheduled_at <= now,
+        or_(
+            Task.status == "pending",
+            and_(Task.status == "error", Task.attempts < max_attempts),
+            and_(
+                Task.status == "running",
+                Task.lease_expires_at.is_not(None),
+                Task.lease_expires_at < now,
+            ),
+        ),
+    )
+
+
+def claim_due_tasks(
+    session: Session,
+    *,
+    worker_id: str,
+    max_attempts: int,
+    lease_seconds: int,
+    limit: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> list[tuple[int, str]]:
+    """Atomically mark up to ``limit`` due tasks as running for ``worker_id``.
+
+    Postgres locks candidate rows with ``FOR UPDATE SKIP LOCKED`` so
+    concurrent schedulers never see the same rows. Other databases use a
+    compare-and-set ``UPDATE`` per candidate that only succeeds while the row
+    is still claimable. Tasks whose lease expired are reclaimed. Returns the
+    ``(id, type)`` pairs this worker now owns.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    claimable = _claimable(now, max_attempts)
+    claim_values = {
+        "status": "running",
+        "claimed_by": worker_id,
+        "lease_expires_at": now + timedelta(seconds=lease_seconds),
+    }
+    query = session.query(Task.id, Task.type, Task.status).filter(claimable)
+    query = query.order_by(Task.scheduled_at)
+    if limit is not None:
+        query = query.limit(limit)
+
+    if session.get_bind().dialect.name == "postgresql":
+        rows = query.with_for_update(skip_locked=True).all()
+        if rows:
+            session.execute(
+                update(Task)
+                .where(Task.id.in_([task_id for task_id, _, _ in rows]))
+                .values(**claim_values)
+            )
+        for _, task_type, status in rows:
+            track_task_status(session, task_type, status, "running")
+        session.commit()
+        return [(task_id, task_type) for task_id, task_type, _ in rows]
+
+    claimed: list[tuple[int, str]] = []
+    for task_id, task_type, status in query.all():
+        result = session.execute(
+            update(Task).where(Task.id == task_id, claimable).values(**claim_values)
+        )
+        if result.rowcount == 1:
+            claimed.append((task_id, task_type))
+            track_task_status(session, task_type, status, "running")
+    session.commit()
+    return claimed
+
+
+def renew_task_lease(task_id: int, worker_id: str, lease_seconds: int) -> bool:
+    """Extend the lease on ``task_id`` if ``worker_id`` still owns it."""
+    with SessionLocal() as session:
+        result = session.execute(
+            update(Task)
+            .where(
+                Task.id == task_id,
+                Task.claimed_by == worker_id,
+                Task.status == "running",
+            )
+            .values(
+                lease_expires_at=datetime.now(timezone.utc)
+                + timedelta(seconds=lease_seconds)
+            )
+        )
+        session.commit()
+        return result.rowcount == 1
+
+
+def _start_lease_stmt(task_id: int, worker_id: str, lease_seconds: int):
+    """Return an ``UPDATE`` renewing a still-valid lease before a task starts.
+
+    A claimed task may wait for a dispatch slot past its lease, and another
+    worker may then reclaim it at any moment, so it only starts if this
+    matches a row.
+    """
     now = datetime.now(timezone.utc)
+    return (
+        update(Task)
+        .where(
+            Task.id == task_id,
+            Task.claimed_by == worker_id,
+            Task.status == "running",
+            Task.lease_expires_at > now,
+        )
+        .values(lease_expires_at=now + timedelta(seconds=lease_seconds))
+    )
+
+
+def _lease_started(rowcount: int, task_id: int) -> bool:
+    if rowcount != 1:
+        logger.warning("Lease on task %s expired before it started; skipping", task_id)
+    return rowcount == 1
+
+
+def _keep_lease(
+    task_id: int, worker_id: str, lease_seconds: int, stop: threading.Event
+) -> None:
+    """Renew the lease on ``task_id`` until ``stop`` is set."""
+    while not stop.wait(lease_seconds / 3):
+        try:
+            renewed = renew_task_lease(task_id, worker_id, lease_seconds)
+        except Exception as exc:
+            logger.warning("Failed to renew lease on task %s: %s", task_id, exc)
+            continue
+        if not renewed:
+            logger.warning("Lost lease on task %s", task_id)
+            return
+
+
+def _start_lease_renewal(
+    task_id: int, worker_id: str, lease_seconds: int
+) -> threading.Event:
+    """Renew the lease from a thread; set the returned event to stop.
+
+    A thread keeps renewing while a handler blocks the event loop, so such
+    tasks are not reclaimed and run twice.
+    """
+    stop = threading.Event()
+    threading.Thread(
+        target=_keep_lease,
+        args=(task_id, worker_id, lease_seconds, stop),
+        name=f"lease-{task_id}",
+        daemon=True,
+    ).start()
+    return stop
+
+
+def _finish_task_stmt(
+    task_id: int, worker_id: str, status: str, last_error: Optional[str]
+):
+    """Return the final ``UPDATE`` for a task, applied only if still owned."""
+    return (
+        update(Task)
+        .where(Task.id == task_id, Task.claimed_by == worker_id)
+        .values(
+            status=status,
+            last_error=last_error,
+            lease_expires_at=None,
+            attempts=Task.attempts + 1,
+        )
+    )
+
+
+def _defer_tasks_stmt(task_ids: list[int], worker_id: str, until: datetime):
+    """Return an ``UPDATE`` handing owned tasks back as pending until ``until``."""
+    return (
+        update(Task)
+        .where(Task.id.in_(task_ids), Task.claimed_by == worker_id)
+        .values(
+            status="pending",
+            scheduled_at=until,
+            claimed_by=None,
+            lease_expires_at=None,
+        )
+    )
+
+
+def _defer_tasks(
+    task_ids: list[int], task_type: str, worker_id: str, until: datetime
+) -> None:
+    """Release claimed tasks that have not started until ``until``."""
+    with SessionLocal() as session:
+        result = session.execute(_defer_tasks_stmt(task_ids, worker_id, until))
+        track_task_status(session, task_type, "running", "pending", result.rowcount)
+        session.commit()
+
+
+def _record_finish(
+    session: Session | AsyncSession,
+    rowcount: int,
+    task_id: int,
+    task_type: str,
+    status: str,
+) -> None:
+    if rowcount == 1:
+        track_task_status(session, task_type, "running", status)
+    else:
+        logger.warning(
+            "Task %s was reclaimed by another worker; not recording its %s result",
+            task_id,
+            status,
+        )
+
+
+def _observe_queue_wait(task: Task) -> None:
+    scheduled_at = task.scheduled_at
+    if scheduled_at is None:
+        return
+    if scheduled_at.tzinfo is None:
+        scheduled_at = scheduled_at.replace(tzinfo=timezone.utc)
+    wait = (datetime.now(timezone.utc) - scheduled_at).total_seconds()
+    TASK_QUEUE_WAIT.labels(type=task.type).observe(max(0.0, wait))
+
+
+def _handler_span(task: Task):
+    return span(f"task {task.type}", **{"task.id": task.id, "task.type": task.type})
+
+
+async def _run_task(task_id: int, worker_id: str, lease_seconds: int) -> None:
+    """Execute a task claimed by ``worker_id`` using its own session."""
+    with SessionLocal() as session:
+        result = session.execute(_start_lease_stmt(task_id, worker_id, lease_seconds))
+        session.commit()
+        if not _lease_started(result.rowcount, task_id):
+            return
+        task = session.get(Task, task_id)
+        task_type = task.type
+        handler = TASK_HANDLERS.get(task_type)
+        if handler is None:
+            status, last_error = "error", f"no handler for {task_type}"
+            result = session.execute(
+                _finish_task_stmt(task_id, worker_id, status, last_error)
+            )
+            _record_finish(session, result.rowcount, task_id, task_type, status)
+            session.commit()
+            return
+        _observe_queue_wait(task)
+        stop_renewal = _start_lease_renewal(task_id, worker_id, lease_seconds)
+        started = time.perf_counter()
+        status, last_error = "completed", None
+        deferred_until: Optional[datetime] = None
+        try:
+            with _handler_span(task), profiled(f"task {task_type}", scope="handler"):
+                await handler(task, session)
+        except TaskDeferred as exc:
+            if not session.is_active:
+                session.rollback()
+            status, deferred_until = "pending", exc.until
+            logger.info("Task %s deferred until %s", task_id, exc.until)
+        except Exception as exc:
+            if not session.is_active:
+                session.rollback()
+            status, last_error = "error", str(exc)
+            logger.error("Task %s failed: %s", task_type, exc)
+        finally:
+            TASK_DURATION.labels(type=task_type).observe(time.perf_counter() - started)
+            stop_renewal.set()
+            started = time.perf_counter()
+            if deferred_until is None:
+                stmt = _finish_task_stmt(task_id, worker_id, status, last_error)
+            else:
+                stmt = _defer_tasks_stmt([task_id], worker_id, deferred_until)
+            result = session.execute(stmt)
+            _record_finish(session, result.rowcount, task_id, task_type, status)
+            session.commit()
+            TASK_COMMIT_DURATION.labels(type=task_type).observe(
+                time.perf_counter() - started
+            )
+
+
+async def _run_task_async(task_id: int, worker_id: str, lease_seconds: int) -> None:
+    """Execute a claimed task whose handler was registered with an async session."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            _start_lease_stmt(task_id, worker_id, lease_seconds)
+        )
+        await session.commit()
+        if not _lease_started(result.rowcount, task_id):
+            return
+        task = await session.get(Task, task_id)
+        task_type = task.type
+        handler = TASK_HANDLERS[task_type]
+        _observe_queue_wait(task)
+        stop_renewal = _start_lease_renewal(task_id, worker_id, lease_seconds)
+        started = time.perf_counter()
+        status, last_error = "completed", None
+        deferred_until: Optional[datetime] = None
+        try:
+            with _handler_span(task), profiled(f"task {task_type}", scope="handler"):
+                await handler(task, session)
+        except TaskDeferred as exc:
+            if not session.is_active:
+                await session.rollback()
+            status, deferred_until = "pending", exc.until
+            logger.info("Task %s deferred until %s", task_id, exc.until)
+        except Exception as exc:
+            if not session.is_active:
+                await session.rollback()
+            status, last_error = "error", str(exc)
+            logger.error("Task %s failed: %s", task_type, exc)
+        finally:
+            TASK_DURATION.labels(type=task_type).observe(time.perf_counter() - started)
+            stop_renewal.set()
+            started = time.perf_counter()
+            if deferred_until is None:
+                stmt = _finish_task_stmt(task_id, worker_id, status, last_error)
+            else:
+                stmt = _defer_tasks_stmt([task_id], worker_id, deferred_until)
+            result = await session.execute(stmt)
+            _record_finish(session, result.rowcount, task_id, task_type, status)
+            await session.commit()
+            TASK_COMMIT_DURATION.labels(type=task_type).observe(
+                time.perf_counter() - started
+            )
+
+
+def _publish_lanes(
+    session: Session, due: list[tuple[int, str]]
+) -> dict[str, list[int]]:
+    """Group claimed ``publish_post`` task ids by registered network, oldest first.
+
+    Tasks for networks without a plugin get no lane; they are dispatched like
+    any other task and fail as unsupported.
+    """
+    task_ids = [task_id for task_id, task_type in due if task_type == "publish_post"]
+    if not task_ids:
+        return {}
+    registry = get_registry()
+    payloads = dict(
+        session.query(Task.id, Task.payload).filter(Task.id.in_(task_ids)).all()
+    )
+    lanes: dict[str, list[int]] = {}
+    for task_id in task_ids:
+        network = json.loads(payloads.get(task_id) or "{}").get("network") or ""
+        if registry.get(network) is not None:
+            lanes.setdefault(network, []).append(task_id)
+    return lanes
+
+
+def _task_runner(task_type: str):
+    return _run_task_async if task_type in ASYNC_SESSION_HANDLERS else _run_task
+
+
+async def process_pending(
+    max_attempts: Optional[int] = None, *, worker_id: Optional[str] = None
+) -> int:
+    """Claim a batch of due tasks and dispatch them to registered handlers.
+
+    Up to ``SCHEDULER_BATCH_SIZE`` tasks are claimed atomically with a lease so
+    several schedulers can share one ``tasks`` table. Claimed tasks run concurrently up to
+    ``SCHEDULER_CONCURRENCY`` with optional per-type caps from
+    ``SCHEDULER_TASK_LIMITS``. Each task gets its own session so a handler's
+    commit or rollback cannot affect another task.
+
+    ``publish_post`` tasks are grouped into one lane per registered network.
+    A lane posts its tasks in order while lanes for other networks run in
+    parallel. When the network's rate limiter is blocked the lane hands its
+    remaining tasks back as ``pending`` until the limiter's reset time instead
+    of waiting, so it never holds a dispatch slot through a cooldown.
+    """
+    _load_default_handlers()
     if max_attempts is None:
         max_attempts = get_max_attempts()
+    if worker_id is None:
+        worker_id = default_worker_id()
+    lease_seconds = get_scheduler_lease_seconds()
     with SessionLocal() as session:
-        logger.debug("Searching for tasks due before %s", now.isoformat())
-        tasks = (
-            session.query(Task)
-            .filter(
-                Task.scheduled_at <= now,
-                or_(
-                    Task.status == "pending",
-                    and_(Task.status == "error", Task.attempts < max_attempts),
-                ),
+        logger.debug("Claiming due tasks for %s", worker_id)
+        due = claim_due_tasks(
+            session,
+            worker_id=worker_id,
+            max_attempts=max_attempts,
+            lease_seconds=lease_seconds,
+            limit=get_scheduler_batch_size(),
+        )
+        lanes = _publish_lanes(session, due)
+    logger.debug("Claimed %d task(s)", len(due))
+    if not due:
+        return 0
+
+    lane_ids = {task_id for task_ids in lanes.values() for task_id in task_ids}
+
+    limiter = _DispatchLimiter(get_scheduler_concurrency(), get_scheduler_task_limits())
+
+    async def dispatch(task_id: int, task_type: str) -> None:
+        try:
+            await limiter.run(
+                task_type, _task_runner(task_type)(task_id, worker_id, lease_seconds)
             )
-            .order_by(Task.scheduled_at)
-            .all()
+        except Exception as exc:
+            logger.error("Dispatching task %s (%s) failed: %s", task_id, task_type, exc)
+
+    async def run_lane(network: str, task_ids: list[int]) -> None:
+        bucket = get_rate_limiter(network)
+        for index, task_id in enumerate(task_ids):
+            delay = bucket.delay()
+            if delay > 0:
+                until = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                logger.info(
+                    "%s is rate limited; deferring %d post(s) until %s",
+                    network,
+                    len(task_ids) - index,
+                    until,
+                )
+                _defer_tasks(task_ids[index:], "publish_post", worker_id, until)
+                return
+            await dispatch(task_id, "publish_post")
+
+    await asyncio.gather(
+        *(run_lane(network, task_ids) for network, task_ids in lanes.items()),
+        *(
+            dispatch(task_id, task_type)
+            for task_id, task_type in due
+            if task_id not in lane_ids
+        ),
+    )
+    return len(due)
+
+
+def seconds_until_next_task(
+    session: Session,
+    *,
+    max_attempts: int,
+    retry_interval: float,
+    now: Optional[datetime] = None,
+) -> Optional[float]:
+    """Return how long until a task becomes claimable, or ``None`` if idle.
+
+    Pending tasks count from their ``scheduled_at`` and running tasks from
+    their lease expiry. Retryable failures are retried every
+    ``retry_interval`` seconds rather than immediately.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    statuses = _claimable_status()
+    candidates: list[float] = []
+
+    next_pending = (
+        session.query(func.min(Task.scheduled_at))
+        .filter(statuses, Task.status == "pending")
+        .scalar()
+    )
+    next_lease = (
+        session.query(func.min(Task.lease_expires_at))
+        .filter(statuses, Task.status == "running")
+        .scalar()
+    )
+    for moment in (next_pending, next_lease):
+        if moment is not None:
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+            candidates.append((moment - now).total_seconds())
+
+    retryable = (
+        session.query(Task.id)
+        .filter(
+            statuses,
+            Task.status == "error",
+            Task.attempts < max_attempts,
         )
-        logger.debug("Found %d task(s)", len(tasks))
-
-        for task in tasks:
-            handler = TASK_HANDLERS.get(task.type)
-            if handler is None:
-                task.status = "error"
-                task.last_error = f"no handler for {task.type}"
-                task.attempts += 1
-                session.commit()
-                continue
-            task.status = "running"
-            session.commit()
-            try:
-                await handler(task, session)
-                task.status = "completed"
-                task.last_error = None
-            except Exception as exc:
-                task.status = "error"
-                task.last_error = str(exc)
-                logger.error("Task %s failed: %s", task.type, exc)
-            finally:
-                task.attempts += 1
-                session.commit()
+        .first()
+    )
+    if retryable is not None:
+        candidates.append(retry_interval)
+
+    if not candidates:
+        return None
+    return max(0.0, min(candidates))
 
 
 async def _scheduler_iteration() -> None:
@@ -222,8 +766,50 @@ async def run_scheduler() -> None:
 class Scheduler:
     """Manage the background scheduler task without relying on globals."""
 
-    def __init__(self) -> None:
-        self._worker = PeriodicWorker(_scheduler_iteration, get_poll_interval)
+    def __init__(self, worker_id: Optional[str] = None) -> None:
+        self.worker_id = worker_id or default_worker_id()
+        self._worker = PeriodicWorker(self._iteration, self._next_delay)
+        self._wakeup = TaskWakeup(self._worker.wake)
+
+    def _next_delay(self) -> float:
+        """Return how long to sleep before the next iteration.
+
+        In event-driven mode the scheduler sleeps until the next task is due,
+        capped at ``SCHEDULER_MAX_SLEEP``, and is woken early by
+        :func:`auto.task_notify.notify_task_enqueued`. Otherwise it polls every
+        ``SCHEDULER_POLL_INTERVAL`` seconds.
+        """
+        poll_interval = get_poll_interval()
+        if not get_scheduler_event_driven():
+            return poll_interval
+        max_sleep = get_scheduler_max_sleep()
+        try:
+            with SessionLocal() as session:
+                delay = seconds_until_next_task(
+                    session,
+                    max_attempts=get_max_attempts(),
+                    retry_interval=poll_interval,
+                )
+        except Exception as exc:
+            logger.warning("Failed to compute next wakeup: %s", exc)
+            return poll_interval
+        if delay is None:
+            return max_sleep
+        return min(delay, max_sleep)
+
+    async def _iteration(self) -> None:
+        # Drain full batches back to back instead of waiting a poll interval.
+        batch_size = get_scheduler_batch_size()
+        while True:
+            with profiled("process_pending", scope="iteration"):
+                claimed = await process_pending(worker_id=self.worker_id)
+            if claimed < batch_size:
+                break
+        try:
+            with SessionLocal() as session:
+                refresh_queue_metrics(session)
+        except Exception as exc:
+            logger.warning("Failed to refresh queue metrics: %s", exc)
 
     async def start(self) -> Optional[asyncio.Task]:
         """Start the background scheduler loop."""
@@ -236,19 +822,32 @@ class Scheduler:
                 return None
 
             # ensure built-in task handlers are registered
-            from . import ingest_scheduler, replay_scanner  # noqa: F401
+            from . import (  # noqa: F401
+                ingest_scheduler,
+                metrics_harvest,
+                replay_scanner,
+                task_archive,
+            )
 
             with SessionLocal() as session:
                 ingest_scheduler.ensure_initial_task(session)
+                metrics_harvest.ensure_initial_task(session)
                 replay_scanner.ensure_initial_task(session)
+                task_archive.ensure_initial_task(session)
                 session.commit()
 
             await self._worker.start()
+            if get_scheduler_event_driven():
+                await self._wakeup.start()
         return self._worker.task
 
     async def stop(self) -> None:
         """Stop the background scheduler loop."""
+        await self._wakeup.stop()
         await self._worker.stop()
+        await close_export_queue()
+        await close_http_client()
+        await dispose_async_engine()
 
 
 def main():
@@ -1,4 +1,4 @@
-from typing import Protocol, Dict
+from typing import Protocol, Dict, Optional
 
 
 class SocialPlugin(Protocol):
@@ -6,8 +6,8 @@ class SocialPlugin(Protocol):
 
     network: str
 
-    async def post(self, text: str, visibility: str = "unlisted") -> None:
-        """Publish ``text`` to the network."""
+    async def post(self, text: str, visibility: str = "unlisted") -> Optional[str]:
+        """Publish ``text`` and return the network's id for it, if known."""
 
     async def fetch_metrics(self, post_id: str) -> Dict[str, int]:
-        """Return engagement metrics for ``post_id``."""
+        """Return engagement metrics for the network's post ``post_id``."""
@@ -1,55 +1,69 @@
 import asyncio
 import anyio
 import logging
-from typing import Dict
-import httpx
+from typing import Dict, Optional
 
 from .base import SocialPlugin
 from ..config import get_mastodon_instance, get_mastodon_token
+from ..http import get_http_client, with_http_client
+from .rate_limit import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 
+def status_id_key(status_id) -> tuple[int, str]:
+    """Sort key ordering Mastodon's numeric string ids by age."""
+    status_id = str(status_id)
+    return len(status_id), status_id
+
+
 class MastodonClient(SocialPlugin):
     """SocialPlugin implementation for Mastodon."""
 
     network = "mastodon"
 
-    async def post(self, status: str, visibility: str = "private") -> None:
+    async def post(self, status: str, visibility: str = "private") -> Optional[str]:
         token = get_mastodon_token()
         instance = get_mastodon_instance()
         headers = {"Authorization": f"Bearer {token}"} if token else {}
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.post(
-                    f"{instance}/api/v1/statuses",
-                    data={"status": status, "visibility": visibility},
-                    headers=headers,
-                )
-                resp.raise_for_status()
+            resp = await get_http_client().post(
+                f"{instance}/api/v1/statuses",
+                data={"status": status, "visibility": visibility},
+                headers=headers,
+            )
+            get_rate_limiter(self.network).update_from_headers(resp.headers)
+            resp.raise_for_status()
             logger.info("Posted to Mastodon")
         except Exception as exc:
             logger.error("Failed to post to Mastodon: %s", exc)
             raise
+        try:
+            return str(resp.json()["id"])
+        except (ValueError, KeyError, TypeError):
+            return None
 
     async def fetch_metrics(self, post_id: str) -> Dict[str, int]:
         token = get_mastodon_token()
         instance = get_mastodon_instance()
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(
-                f"{instance}/api/v1/statuses/{post_id}", headers=headers
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return {
-                "replies": data.get("replies_count", 0),
-                "reblogs": data.get("reblogs_count", 0),
-                "favourites": data.get("favourites_count", 0),
-            }
-
-    async def fetch_all_statuses(self) -> list[dict]:
-        """Return all statuses for the authenticated account."""
+        resp = await get_http_client().get(
+            f"{instance}/api/v1/statuses/{post_id}", headers=headers
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        return {
+            "replies": data.get("replies_count", 0),
+            "reblogs": data.get("reblogs_count", 0),
+            "favourites": data.get("favourites_count", 0),
+        }
+
+    async def fetch_all_statuses(self, since_id: Optional[str] = None) -> list[dict]:
+        """Return statuses for the authenticated account.
+
+        With ``since_id`` only statuses newer than it are fetched, paging
+        forward with ``min_id`` so no new status is skipped.
+        """
         from mastodon import Mastodon
 
         token = get_mastodon_token()
@@ -60,6 +74,15 @@ class MastodonClient(SocialPlugin):
             me = masto.account_verify_credentials()
             account_id = me["id"]
             statuses: list[dict] = []
+            if since_id is not None:
+                min_id = since_id
+                while True:
+                    page = masto.account_statuses(account_id, min_id=min_id, limit=40)
+                    if not page:
+                        break
+                    statuses.extend(page)
+                    min_id = max((s["id"] for s in page), key=status_id_key)
+                return statuses
             max_id = None
             while True:
                 page = masto.account_statuses(account_id, max_id=max_id, limit=40)
@@ -80,7 +103,7 @@ async def post_to_mastodon_async(status: str, visibility: str = "private") -> No
 
 def post_to_mastodon(status: str, visibility: str = "private") -> None:
     """Synchronous wrapper for :func:`post_to_mastodon_async`."""
-    anyio.run(post_to_mastodon_async, status, visibility)
+    anyio.run(with_http_client, post_to_mastodon_async, status, visibility)
 
 
 if __name__ == "__main__":
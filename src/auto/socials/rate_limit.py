@@ -0,0 +1,129 @@
+"""Per-network pacing for outbound posts."""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional
+
+from dateutil import parser
+
+from ..config import get_publish_burst, get_publish_delay
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket that also honours server-announced rate-limit windows.
+
+    Tokens are taken synchronously, so concurrent coroutines on one event loop
+    never need a lock and the bucket can be shared across loops. Callers never
+    wait on the bucket: :meth:`try_acquire` reports how long until a token is
+    available and the scheduler reschedules the post for then.
+    """
+
+    def __init__(self, interval: float, burst: int = 1) -> None:
+        self.configure(interval, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def configure(self, interval: float, burst: int) -> None:
+        """Set the seconds per token and the bucket capacity."""
+        self.interval = max(0.0, interval)
+        self.burst = max(1, burst)
+
+    def _refill(self, now: float) -> None:
+        if self.interval == 0:
+            self._tokens = float(self.burst)
+        else:
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed / self.interval)
+        self._updated = now
+
+    def delay(self) -> float:
+        """Return seconds until a token is available, without taking one."""
+        now = time.monotonic()
+        self._refill(now)
+        wait = (1 - self._tokens) * self.interval if self._tokens < 1 else 0.0
+        return max(wait, self._blocked_until - now, 0.0)
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available now.
+
+        Returns 0 when a token was taken, otherwise the seconds until one will
+        be; the bucket is left untouched in that case.
+        """
+        wait = self.delay()
+        if wait == 0:
+            self._tokens -= 1
+        return wait
+
+    def block_for(self, seconds: float) -> None:
+        """Hold every caller back for ``seconds`` from now."""
+        until = time.monotonic() + max(0.0, seconds)
+        self._blocked_until = max(self._blocked_until, until)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Apply ``Retry-After`` and ``X-RateLimit-*`` hints from a response.
+
+        When ``X-RateLimit-Remaining`` reaches zero the bucket is blocked until
+        ``X-RateLimit-Reset``, which Mastodon sends as an ISO timestamp; epoch
+        seconds and relative seconds are accepted as well.
+        """
+        retry_after = _seconds_until(headers.get("Retry-After"))
+        if retry_after is not None:
+            self.block_for(retry_after)
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            exhausted = float(remaining) <= 0
+        except ValueError:
+            return
+        if exhausted:
+            reset = _seconds_until(headers.get("X-RateLimit-Reset"))
+            if reset is not None:
+                logger.info("Rate limit exhausted; pausing for %.0fs", reset)
+                self.block_for(reset)
+
+
+def _seconds_until(value: Optional[str]) -> Optional[float]:
+    """Return seconds until ``value``, a delay, epoch time or HTTP/ISO date."""
+    if not value:
+        return None
+    now = datetime.now(timezone.utc)
+    try:
+        number = float(value)
+    except ValueError:
+        try:
+            when = parser.parse(value)
+        except (ValueError, OverflowError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - now).total_seconds())
+    if number > 1_000_000_000:
+        return max(0.0, number - now.timestamp())
+    return max(0.0, number)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(network: str) -> TokenBucket:
+    """Return the shared bucket for ``network`` using the current config."""
+    interval = get_publish_delay(network)
+    burst = get_publish_burst()
+    limiter = _limiters.get(network)
+    if limiter is None:
+        limiter = _limiters[network] = TokenBucket(interval, burst)
+    elif (limiter.interval, limiter.burst) != (interval, burst):
+        limiter.configure(interval, burst)
+    return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Forget all buckets (for tests)."""
+    _limiters.clear()
@@ -5,9 +5,8 @@ import json
 import logging
 from typing import Dict
 
-from jinja2 import Template
-
 from ..automation.safari import SafariController
+from ..templating import render_template
 from ..utils import project_root
 from .base import SocialPlugin
 
@@ -32,7 +31,7 @@ class TwitterClient(SocialPlugin):
     def _run_commands(self, text: str) -> None:
         for entry in self.commands:
             cmd = entry[0]
-            args = [Template(arg).render(tweet=text) for arg in entry[1:]]
+            args = [render_template(arg, tweet=text) for arg in entry[1:]]
             if cmd == "open" and args:
                 self.safari.open(args[0])
             elif cmd == "click" and args:
@@ -0,0 +1,118 @@
+"""Move finished tasks out of the hot ``tasks`` table."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime, and_, delete, func, insert, literal, or_, select
+from sqlalchemy.orm import Session
+
+from .config import (
+    get_max_attempts,
+    get_task_archive_batch_size,
+    get_task_archive_interval,
+    get_task_retention_days,
+)
+from .metrics import track_tasks_deleted
+from .models import Task, TaskArchive
+from .scheduler import register_task_handler
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_COLUMNS = (
+    "type",
+    "payload",
+    "scheduled_at",
+    "status",
+    "attempts",
+    "last_error",
+    "claimed_by",
+    "created_at",
+    "updated_at",
+)
+
+
+def archive_tasks(
+    session: Session,
+    *,
+    older_than: timedelta,
+    max_attempts: int,
+    batch_size: int,
+    now: Optional[datetime] = None,
+) -> int:
+    """Move finished tasks last updated before ``now - older_than``.
+
+    Completed tasks and failures that exhausted ``max_attempts`` are copied to
+    ``tasks_archive`` and deleted from ``tasks`` in batches of ``batch_size``,
+    committing after each batch. Returns the number of tasks archived.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    cutoff = now - older_than
+    finished = or_(
+        Task.status == "completed",
+        and_(Task.status == "error", Task.attempts >= max_attempts),
+    )
+    columns = [Task.id, *(getattr(Task, name) for name in ARCHIVED_COLUMNS)]
+
+    total = 0
+    while True:
+        ids = [
+            task_id
+            for (task_id,) in session.query(Task.id)
+            .filter(finished, Task.updated_at < cutoff)
+            .order_by(Task.id)
+            .limit(batch_size)
+        ]
+        if not ids:
+            break
+        session.execute(
+            insert(TaskArchive).from_select(
+                ["task_id", *ARCHIVED_COLUMNS, "archived_at"],
+                select(*columns, literal(now, DateTime(timezone=True))).where(
+                    Task.id.in_(ids)
+                ),
+            )
+        )
+        track_tasks_deleted(
+            session,
+            session.execute(
+                select(Task.type, Task.status, func.count())
+                .where(Task.id.in_(ids))
+                .group_by(Task.type, Task.status)
+            ).tuples(),
+        )
+        session.execute(delete(Task).where(Task.id.in_(ids)))
+        session.commit()
+        total += len(ids)
+        logger.debug("Archived %d task(s)", len(ids))
+        if len(ids) < batch_size:
+            break
+    return total
+
+
+@register_task_handler("archive_tasks")
+async def handle_archive_tasks(task: Task, session: Session) -> None:
+    """Archive old finished tasks and schedule the next run."""
+    try:
+        count = archive_tasks(
+            session,
+            older_than=timedelta(days=get_task_retention_days()),
+            max_attempts=get_max_attempts(),
+            batch_size=get_task_archive_batch_size(),
+        )
+        logger.info("Archived %d finished task(s)", count)
+    finally:
+        next_run = datetime.now(timezone.utc) + timedelta(
+            seconds=get_task_archive_interval()
+        )
+        session.add(Task(type="archive_tasks", scheduled_at=next_run))
+
+
+def ensure_initial_task(session: Session) -> None:
+    """Ensure at least one archive_tasks task exists."""
+    exists = session.query(Task).filter(Task.type == "archive_tasks").first()
+    if not exists:
+        session.add(Task(type="archive_tasks"))
@@ -0,0 +1,177 @@
+"""Wake sleeping schedulers when new tasks are enqueued.
+
+Schedulers in the same process register a callback that runs on every
+:func:`notify_task_enqueued`. Schedulers in other processes are reached through
+``LISTEN``/``NOTIFY`` on Postgres and through a directory of Unix datagram
+sockets ("doorbells") on SQLite.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import secrets
+import socket
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .config import get_scheduler_doorbell_dir
+from .db import get_engine
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "auto_tasks"
+
+_listeners: set[Callable[[], None]] = set()
+
+
+def doorbell_dir(engine: Engine) -> Optional[Path]:
+    """Return the doorbell directory shared by processes using ``engine``."""
+    if engine.dialect.name != "sqlite" or not hasattr(socket, "AF_UNIX"):
+        return None
+    configured = get_scheduler_doorbell_dir()
+    if configured:
+        return Path(configured)
+    database = engine.url.database
+    if not database or database == ":memory:":
+        return None
+    digest = hashlib.sha1(str(Path(database).resolve()).encode("utf-8")).hexdigest()[
+        :12
+    ]
+    return Path(tempfile.gettempdir()) / f"auto-doorbell-{digest}"
+
+
+def _ring_doorbells(directory: Path) -> None:
+    if not directory.is_dir():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.setblocking(False)
+        for path in directory.glob("*.sock"):
+            try:
+                sock.sendto(b"1", str(path))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The owning scheduler exited without cleaning up.
+                path.unlink(missing_ok=True)
+            except BlockingIOError:
+                # A wakeup is already queued for that scheduler.
+                pass
+            except OSError as exc:
+                logger.debug("Failed to ring doorbell %s: %s", path, exc)
+
+
+def notify_task_enqueued(engine: Optional[Engine] = None) -> None:
+    """Tell schedulers that a task was added or rescheduled.
+
+    Call this after committing the task. Failures are logged and ignored
+    because schedulers still poll at ``SCHEDULER_MAX_SLEEP``.
+    """
+    for callback in list(_listeners):
+        callback()
+
+    engine = engine or get_engine()
+    try:
+        if engine.dialect.name == "postgresql":
+            with engine.connect() as conn:
+                conn.execute(text(f"NOTIFY {NOTIFY_CHANNEL}"))
+                conn.commit()
+            return
+        directory = doorbell_dir(engine)
+        if directory is not None:
+            _ring_doorbells(directory)
+    except Exception as exc:
+        logger.warning("Failed to notify schedulers: %s", exc)
+
+
+class TaskWakeup:
+    """Invoke ``callback`` whenever a task is enqueued anywhere."""
+
+    def __init__(self, callback: Callable[[], None]) -> None:
+        self._callback = callback
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sock: Optional[socket.socket] = None
+        self._sock_path: Optional[Path] = None
+        self._pg_conn = None
+
+    async def start(self, engine: Optional[Engine] = None) -> None:
+        """Start listening in-process and, when supported, across processes."""
+        _listeners.add(self._callback)
+        self._loop = asyncio.get_running_loop()
+        engine = engine or get_engine()
+        try:
+            if engine.dialect.name == "postgresql":
+                self._listen_postgres(engine)
+            else:
+                directory = doorbell_dir(engine)
+                if directory is not None:
+                    self._listen_doorbell(directory)
+        except Exception as exc:
+            logger.warning("Cross-process task wakeups unavailable: %s", exc)
+
+    async def stop(self) -> None:
+        """Stop listening and release sockets or connections."""
+        _listeners.discard(self._callback)
+        if self._sock is not None:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+        if self._sock_path is not None:
+            self._sock_path.unlink(missing_ok=True)
+            self._sock_path = None
+        if self._pg_conn is not None:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self._pg_conn.driver_connection.fileno())
+            self._pg_conn.close()
+            self._pg_conn = None
+
+    def _listen_doorbell(self, directory: Path) -> None:
+        assert self._loop is not None
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{os.getpid()}-{secrets.token_hex(4)}.sock"
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            sock.bind(str(path))
+        except OSError:
+            sock.close()
+            raise
+        sock.setblocking(False)
+        self._sock, self._sock_path = sock, path
+        self._loop.add_reader(sock.fileno(), self._on_doorbell)
+
+    def _on_doorbell(self) -> None:
+        assert self._sock is not None
+        try:
+            while True:
+                self._sock.recv(16)
+        except BlockingIOError:
+            pass
+        self._callback()
+
+    def _listen_postgres(self, engine: Engine) -> None:
+        assert self._loop is not None
+        conn = engine.raw_connection()
+        # Keep the LISTEN session out of the pool; close() really closes it.
+        conn.detach()
+        dbapi_conn = conn.driver_connection
+        if not hasattr(dbapi_conn, "poll") or not hasattr(dbapi_conn, "notifies"):
+            conn.close()
+            raise RuntimeError("LISTEN requires the psycopg2 driver")
+        dbapi_conn.autocommit = True
+        with dbapi_conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        self._pg_conn = conn
+        self._loop.add_reader(dbapi_conn.fileno(), self._on_postgres_notify)
+
+    def _on_postgres_notify(self) -> None:
+        assert self._pg_conn is not None
+        dbapi_conn = self._pg_conn.driver_connection
+        dbapi_conn.poll()
+        if dbapi_conn.notifies:
+            dbapi_conn.notifies.clear()
+            self._callback()
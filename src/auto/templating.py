@@ -0,0 +1,94 @@
+"""Shared Jinja environment with a cache of compiled templates.
+
+Preview texts and replay command arguments are rendered over and over from a
+small set of strings. :func:`render_template` compiles each distinct source
+once and keeps it in an LRU cache keyed by a hash of the source.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from jinja2 import Environment, Template
+from jinja2.sandbox import SandboxedEnvironment
+from prometheus_client import Counter
+
+from .config import get_template_cache_size, get_template_sandbox
+
+TEMPLATE_CACHE_LOOKUPS = Counter(
+    "template_cache_lookups_total",
+    "Compiled template cache lookups by result (hit or miss)",
+    ["result"],
+)
+
+
+class TemplateEngine:
+    """Compile template strings once and reuse them.
+
+    ``sandboxed`` renders with :class:`jinja2.sandbox.SandboxedEnvironment`,
+    which blocks access to unsafe attributes for templates that come from LLM
+    output or other untrusted sources. Extra keyword arguments are passed to
+    the environment.
+    """
+
+    def __init__(
+        self, *, sandboxed: bool = False, max_size: int = 512, **options: Any
+    ) -> None:
+        environment_class = SandboxedEnvironment if sandboxed else Environment
+        self.environment = environment_class(**options)
+        self.sandboxed = sandboxed
+        self.max_size = max_size
+        self._cache: OrderedDict[bytes, Template] = OrderedDict()
+        # Templates are rendered from worker threads as well as the event loop.
+        self._lock = threading.Lock()
+
+    def get_template(self, source: str) -> Template:
+        """Return the compiled template for ``source``."""
+        key = hashlib.blake2b(source.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            template = self._cache.get(key)
+            if template is not None:
+                self._cache.move_to_end(key)
+                TEMPLATE_CACHE_LOOKUPS.labels(result="hit").inc()
+                return template
+        TEMPLATE_CACHE_LOOKUPS.labels(result="miss").inc()
+        template = self.environment.from_string(source)
+        with self._lock:
+            self._cache[key] = template
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return template
+
+    def render(self, source: str, **variables: Any) -> str:
+        """Render ``source`` with ``variables``."""
+        return self.get_template(source).render(**variables)
+
+    def clear(self) -> None:
+        """Drop every compiled template."""
+        with self._lock:
+            self._cache.clear()
+
+
+_engine: Optional[TemplateEngine] = None
+
+
+def get_template_engine() -> TemplateEngine:
+    """Return the application's template engine configured from settings."""
+    global _engine
+    sandboxed = get_template_sandbox()
+    max_size = get_template_cache_size()
+    if (
+        _engine is None
+        or _engine.sandboxed != sandboxed
+        or _engine.max_size != max_size
+    ):
+        _engine = TemplateEngine(sandboxed=sandboxed, max_size=max_size)
+    return _engine
+
+
+def render_template(source: str, **variables: Any) -> str:
+    """Render ``source`` through the shared :class:`TemplateEngine`."""
+    return get_template_engine().render(source, **variables)
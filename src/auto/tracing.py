@@ -0,0 +1,48 @@
+"""Optional OpenTelemetry spans.
+
+Spans are only recorded when ``TRACING_ENABLED=1`` and the
+``opentelemetry-api`` package is installed; otherwise :func:`span` is a no-op.
+Exporters are configured the usual OpenTelemetry way, for example with
+``opentelemetry-instrument`` and the ``OTEL_*`` environment variables.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from .config import get_tracing_enabled
+
+
+class _NoopSpan:
+    """Stand-in for an OpenTelemetry span when tracing is disabled."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def tracing_active() -> bool:
+    """Return True when spans are recorded."""
+    return (
+        get_tracing_enabled() and importlib.util.find_spec("opentelemetry") is not None
+    )
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Run the block inside a span named ``name`` with ``attributes``.
+
+    Exceptions are recorded on the span and re-raised.
+    """
+    if not tracing_active():
+        yield _NOOP_SPAN
+        return
+    from opentelemetry import trace
+
+    tracer = trace.get_tracer("auto")
+    with tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
@@ -14,12 +14,36 @@ class PeriodicWorker:
         self._interval = interval
         self._task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
+        self._wake_event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     @property
     def task(self) -> Optional[asyncio.Task]:
         """Return the underlying asyncio task if running."""
         return self._task
 
+    def wake(self) -> None:
+        """Cut the current sleep short and run the callable again.
+
+        Safe to call from any thread; does nothing when the worker is stopped.
+        """
+        loop, event = self._loop, self._wake_event
+        if loop is None or event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # The worker's loop has already closed.
+            pass
+
+    async def _sleep(self, wait: float) -> None:
+        assert self._wake_event is not None
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+        self._wake_event.clear()
+
     async def _run(self) -> None:
         try:
             while not self._stop_event.is_set():
@@ -28,13 +52,15 @@ class PeriodicWorker:
                 else:
                     await asyncio.to_thread(self._func)
                 wait = self._interval() if callable(self._interval) else self._interval
-                await asyncio.sleep(wait)
+                await self._sleep(wait)
         except asyncio.CancelledError:
             pass
 
     async def start(self) -> Optional[asyncio.Task]:
         if self._task is None or self._task.done():
             self._stop_event.clear()
+            self._loop = asyncio.get_running_loop()
+            self._wake_event = asyncio.Event()
             self._task = asyncio.create_task(self._run())
         return self._task
 
@@ -47,3 +73,5 @@ class PeriodicWorker:
             except asyncio.CancelledError:
                 pass
             self._task = None
+            self._loop = None
+            self._wake_event = None
@@ -7,7 +7,7 @@ from fastapi import APIRouter, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 
-from .db import SessionLocal
+from .db import AsyncSessionLocal
 from .models import Post
 
 TEMPLATES = Jinja2Templates(
@@ -43,7 +43,7 @@ async def create_post(
         created_at=datetime.now(timezone.utc),
         updated_at=datetime.now(timezone.utc),
     )
-    with SessionLocal() as session:
+    async with AsyncSessionLocal() as session:
         session.add(post)
-        session.commit()
+        await session.commit()
     return RedirectResponse(url="/posts/new", status_code=303)
@@ -1,9 +1,10 @@
 class DummyResponse:
     """Simple mock response for requests.get."""
 
-    def __init__(self, content=b"<rss></rss>", status_code=200):
+    def __init__(self, content=b"<rss></rss>", status_code=200, headers=None):
         self.content = content
         self.status_code = status_code
+        self.headers = headers or {}
 
     def raise_for_status(self):
         """Pretend to raise for HTTP errors."""
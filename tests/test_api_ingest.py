@@ -10,11 +10,11 @@ from sqlalchemy import create_engine
 from auto.feeds import ingestion
 
 
-def test_ingest_endpoint(tmp_path, monkeypatch):
+def test_ingest_endpoint(tmp_path, monkeypatch, test_db_engine):
     sample_xml = Path(__file__).with_name("sample_feed.xml").read_bytes()
     parsed = BeautifulSoup(sample_xml, "xml").find_all("item")
 
-    async def fake_fetch_feed(url=None):
+    async def fake_fetch_feed(url=None, **kwargs):
         return parsed
 
     monkeypatch.setattr(ingestion, "fetch_feed_async", fake_fetch_feed)
@@ -49,7 +49,7 @@ def test_ingest_endpoint(tmp_path, monkeypatch):
     assert all(r[0] is not None and r[0] != "" for r in rows)
 
 
-def test_run_ingest_uses_env_variable(monkeypatch):
+def test_run_ingest_uses_env_variable(monkeypatch, test_db_engine):
     """run_ingest() should fetch the URL from SUBSTACK_FEED_URL."""
     monkeypatch.setenv("SUBSTACK_FEED_URL", "http://env.example/feed")
 
@@ -57,7 +57,7 @@ def test_run_ingest_uses_env_variable(monkeypatch):
 
     called = {}
 
-    async def fake_get(self, url):
+    async def fake_get(self, url, **kwargs):
         called["url"] = url
         return DummyResponse()
 
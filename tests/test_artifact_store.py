@@ -0,0 +1,84 @@
+import os
+import time
+
+import pytest
+
+from auto.artifact_store import ArtifactStore
+from auto.cli import maintenance
+
+
+def _age(path, seconds):
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+def test_identical_files_share_one_blob(tmp_path):
+    store = ArtifactStore(tmp_path)
+
+    assert store.write_manifest("a", {"x.txt": b"same", "y.txt": b"other"})
+    assert store.write_manifest("b", {"z.txt": b"same"}, run_id=2)
+
+    blobs = list(store.blob_dir.glob("*/*"))
+    assert len(blobs) == 2
+    assert store.read_file("b", "z.txt") == b"same"
+    assert store.read_manifest("b")["run_id"] == 2
+    with pytest.raises(FileNotFoundError):
+        store.read_file("b", "x.txt")
+
+
+def test_unchanged_manifest_is_not_rewritten(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.write_manifest("run", {"a": b"1"})
+    manifest = store.manifest_path("run")
+    _age(manifest, 60)
+    mtime = manifest.stat().st_mtime
+
+    assert store.write_manifest("run", {"a": b"1"}) is False
+    assert manifest.stat().st_mtime == mtime
+
+    assert store.write_manifest("run", {"a": b"2"}) is True
+    assert store.read_file("run", "a") == b"2"
+    assert not list(tmp_path.rglob(".*"))
+
+
+def test_written_files_follow_the_umask(tmp_path, monkeypatch):
+    import stat
+
+    monkeypatch.setattr("auto.artifact_store._UMASK", 0o022)
+    store = ArtifactStore(tmp_path)
+    store.write_manifest("a", {"x.txt": b"data"})
+
+    [blob] = store.blob_dir.glob("*/*")
+    for path in (blob, store.manifest_path("a")):
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_gc_removes_only_old_unreferenced_blobs(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.write_manifest("run", {"a": b"old"})
+    stale = store.blob_path(store.put(b"old"))
+    store.write_manifest("run", {"a": b"new"})
+    fresh = store.blob_path(store.put(b"orphan"))
+    _age(stale, 7200)
+
+    assert store.gc(dry_run=True) == 1
+    assert stale.exists()
+
+    assert store.gc() == 1
+    assert not stale.exists()
+    assert fresh.exists()
+    assert store.read_file("run", "a") == b"new"
+
+    assert store.gc(grace_seconds=0) == 1
+    assert not fresh.exists()
+
+
+def test_gc_artifacts_cli(tmp_path, capsys):
+    store = ArtifactStore(tmp_path)
+    _age(store.blob_path(store.put(b"orphan")), 7200)
+
+    maintenance.gc_artifacts(
+        export_dir=str(tmp_path), grace_seconds=3600, dry_run=False
+    )
+
+    assert "Removed 1 unreferenced blob(s)" in capsys.readouterr().out
@@ -0,0 +1,93 @@
+import pytest
+
+from auto import db
+
+
+def test_sqlite_engine_applies_pragmas(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT", "1234")
+    engine = db.create_configured_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    try:
+        with engine.connect() as conn:
+            pragma = conn.exec_driver_sql
+            assert pragma("PRAGMA journal_mode").scalar() == "wal"
+            assert pragma("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert pragma("PRAGMA busy_timeout").scalar() == 1234
+            assert pragma("PRAGMA cache_size").scalar() == -65536
+    finally:
+        engine.dispose()
+
+
+def test_memory_sqlite_skips_wal():
+    pragmas = db.sqlite_pragmas(":memory:")
+    assert not any("journal_mode" in p for p in pragmas)
+
+
+def test_invalid_sqlite_setting_is_rejected(monkeypatch):
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "NORMAL; DROP TABLE posts")
+    with pytest.raises(ValueError):
+        db.sqlite_pragmas("test.db")
+
+
+def test_server_engine_options_come_from_config(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "3")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "0")
+
+    options = db.engine_options("postgresql://user@localhost/auto")
+
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == 3
+    assert options["pool_pre_ping"] is False
+
+
+def test_sessionmaker_is_cached_per_engine(test_db_engine, monkeypatch):
+    factory = db.get_sessionmaker()
+    assert db.get_sessionmaker() is factory
+    with db.SessionLocal() as session:
+        assert session.get_bind() is test_db_engine
+
+    other = db.create_configured_engine("sqlite://")
+    monkeypatch.setattr("auto.db.get_engine", lambda: other)
+    try:
+        assert db.get_sessionmaker() is not factory
+        assert db.get_sessionmaker().kw["bind"] is other
+    finally:
+        other.dispose()
+
+
+def test_async_database_url_uses_async_drivers():
+    assert (
+        str(db.async_database_url("sqlite:///./x.db")) == "sqlite+aiosqlite:///./x.db"
+    )
+    assert (
+        db.async_database_url("postgresql+psycopg2://u@h/d").drivername
+        == "postgresql+asyncpg"
+    )
+    with pytest.raises(ValueError):
+        db.async_database_url("mysql://u@h/d")
+
+
+def test_async_database_url_rejects_in_memory_sqlite():
+    for url in ("sqlite://", "sqlite:///:memory:", "sqlite:///file::memory:?uri=true"):
+        with pytest.raises(ValueError, match="In-memory"):
+            db.async_database_url(url)
+
+
+def test_async_session_shares_the_sync_database(test_db_engine):
+    import asyncio
+
+    from auto.models import Post
+
+    with db.SessionLocal() as session:
+        session.add(Post(id="1", title="t", link="http://1"))
+        session.commit()
+
+    async def read():
+        try:
+            async with db.AsyncSessionLocal() as session:
+                post = await session.get(Post, "1")
+                return post.title, session.get_bind().url.drivername
+        finally:
+            await db.dispose_async_engine()
+
+    assert asyncio.run(read()) == ("t", "sqlite+aiosqlite")
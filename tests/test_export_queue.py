@@ -0,0 +1,128 @@
+import asyncio
+import threading
+
+from auto.export_queue import ExportQueue, close_export_queue, get_export_queue
+from auto.instagram_pipeline import write_instagram_pipeline_export
+from auto.metrics import ARTIFACT_EXPORT_BACKLOG
+
+
+def test_submit_waits_for_a_slot_without_blocking_the_loop():
+    queue = ExportQueue(workers=1, backlog=1)
+    release = threading.Event()
+    order: list[str] = []
+
+    def first() -> None:
+        release.wait(5)
+        order.append("first")
+
+    async def main() -> None:
+        await queue.submit(first)
+        second = asyncio.create_task(queue.submit(order.append, "second"))
+        # The loop keeps running while the second export waits for a slot.
+        await asyncio.sleep(0.05)
+        assert not second.done()
+        assert ARTIFACT_EXPORT_BACKLOG._value.get() >= 1
+        release.set()
+        await second
+
+    asyncio.run(main())
+    assert queue.flush(timeout=5)
+    assert order == ["first", "second"]
+    queue.shutdown()
+
+
+def test_failed_exports_are_logged(monkeypatch):
+    errors: list[str] = []
+    monkeypatch.setattr(
+        "auto.export_queue.logger.error", lambda msg, **kwargs: errors.append(msg)
+    )
+    queue = ExportQueue(workers=1, backlog=2)
+
+    def boom() -> None:
+        raise OSError("disk full")
+
+    async def main() -> None:
+        await queue.submit(boom)
+        await queue.submit(lambda: None)
+
+    asyncio.run(main())
+    queue.shutdown()
+    assert errors == ["Artifact export failed"]
+
+
+def test_close_export_queue_flushes_pending_exports(monkeypatch):
+    writes: list[str] = []
+
+    def slow_write(*args) -> None:
+        threading.Event().wait(0.05)
+        writes.append(threading.current_thread().name)
+
+    async def main() -> None:
+        queue = get_export_queue()
+        for _ in range(3):
+            await queue.submit(slow_write)
+        await close_export_queue()
+
+    asyncio.run(main())
+    assert len(writes) == 3
+    assert all(name.startswith("artifact-export") for name in writes)
+
+
+def test_pipeline_exports_run_off_the_event_loop(test_db_engine, monkeypatch, tmp_path):
+    from auto.db import SessionLocal
+    from auto.instagram_pipeline import execute_instagram_pipeline_run
+    from auto.models import Post
+
+    threads: list[str] = []
+
+    def record(export, export_dir):
+        threads.append(threading.current_thread().name)
+        return write_instagram_pipeline_export(export, export_dir)
+
+    monkeypatch.setattr(
+        "auto.instagram_pipeline.write_instagram_pipeline_export", record
+    )
+
+    with SessionLocal() as session:
+        session.add(Post(id="ig-export", title="Export", link="l", published=""))
+        session.commit()
+
+        async def main() -> None:
+            await execute_instagram_pipeline_run(
+                session,
+                post_id="ig-export",
+                network="instagram",
+                pipeline_version="v1",
+                auto_publish=False,
+                quality_threshold=0.1,
+                banned_terms=set(),
+                pipeline_enabled=True,
+                export_enabled=True,
+                export_dir=str(tmp_path),
+            )
+            await close_export_queue()
+
+        asyncio.run(main())
+
+    assert len(threads) == 1
+    assert threads[0].startswith("artifact-export")
+    assert list((tmp_path / "manifests").glob("ig-export.*.json"))
+
+
+def test_cancelled_submit_returns_its_slot():
+    queue = ExportQueue(workers=1, backlog=1)
+    release = threading.Event()
+
+    async def main() -> None:
+        await queue.submit(release.wait, 5)
+        waiting = asyncio.create_task(queue.submit(lambda: None))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        release.set()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert queue.flush(timeout=5)
+        # The cancelled waiter handed its slot back, so this submit proceeds.
+        await asyncio.wait_for(queue.submit(lambda: None), timeout=1)
+
+    asyncio.run(main())
+    queue.shutdown()
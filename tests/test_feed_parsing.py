@@ -56,7 +56,7 @@ def test_parse_entry_from_dummy_object():
 def test_fetch_feed_returns_items(monkeypatch):
     sample_xml = Path(__file__).with_name("sample_feed.xml").read_bytes()
 
-    async def fake_get(self, url):
+    async def fake_get(self, url, **kwargs):
         return DummyResponse(sample_xml)
 
     monkeypatch.setattr("auto.feeds.ingestion.httpx.AsyncClient.get", fake_get)
@@ -72,7 +72,7 @@ def test_fetch_feed_uses_env_variable(monkeypatch):
 
     called = {}
 
-    async def fake_get(self, url):
+    async def fake_get(self, url, **kwargs):
         called["url"] = url
         return DummyResponse()
 
@@ -82,3 +82,100 @@ def test_fetch_feed_uses_env_variable(monkeypatch):
 
     ingestion_module.fetch_feed()
     assert called.get("url") == "http://env.example/feed"
+
+
+def test_run_ingest_sends_validators_and_skips_unchanged(monkeypatch, test_db_engine):
+    """A second poll sends stored validators and skips parsing on 304."""
+    import anyio
+    from prometheus_client import REGISTRY
+
+    from auto.db import SessionLocal
+    from auto.feeds import ingestion as ingestion_module
+    from auto.models import Feed
+
+    monkeypatch.setenv("SUBSTACK_FEED_URL", "http://env.example/feed")
+    sample_xml = Path(__file__).with_name("sample_feed.xml").read_bytes()
+    requests = []
+    responses = [
+        DummyResponse(sample_xml, headers={"ETag": '"v1"', "Last-Modified": "Mon"}),
+        DummyResponse(b"", status_code=304),
+        DummyResponse(sample_xml, headers={"ETag": '"v2"'}),
+    ]
+
+    async def fake_get(self, url, headers=None):
+        requests.append(headers)
+        return responses.pop(0)
+
+    def fetches(result):
+        return REGISTRY.get_sample_value("feed_fetches_total", {"result": result}) or 0
+
+    before = {r: fetches(r) for r in ("changed", "not_modified", "unchanged")}
+    saved = []
+    monkeypatch.setattr("auto.feeds.ingestion.httpx.AsyncClient.get", fake_get)
+    monkeypatch.setattr(ingestion_module, "save_entries", saved.append)
+
+    for _ in range(3):
+        anyio.run(ingestion_module.run_ingest_async)
+
+    assert requests == [
+        {},
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Mon"},
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Mon"},
+    ]
+    # 304 and an identical body both skip parsing and saving.
+    assert len(saved) == 1
+    assert {r: fetches(r) - before[r] for r in before} == {
+        "changed": 1,
+        "not_modified": 1,
+        "unchanged": 1,
+    }
+    with SessionLocal() as session:
+        feed = session.get(Feed, "http://env.example/feed")
+        assert feed.etag == '"v2"'
+        assert feed.last_modified is None
+        assert feed.content_hash is not None
+        assert feed.last_fetched_at is not None
+
+
+def test_run_ingest_fetches_feeds_concurrently(monkeypatch, test_db_engine):
+    """Feeds are fetched in parallel and one failure does not stop the rest."""
+    import asyncio
+
+    import anyio
+    import httpx
+    import pytest
+
+    from auto.db import SessionLocal
+    from auto.feeds import ingestion as ingestion_module
+    from auto.models import Feed
+
+    urls = [f"http://{name}.example/feed" for name in ("a", "b", "c", "bad")]
+    monkeypatch.setenv("SUBSTACK_FEED_URLS", ",".join(urls))
+    monkeypatch.setenv("INGEST_CONCURRENCY", "3")
+    sample_xml = Path(__file__).with_name("sample_feed.xml").read_bytes()
+    state = {"active": 0, "peak": 0}
+
+    async def fake_get(self, url, **kwargs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.02)
+        state["active"] -= 1
+        if "bad" in url:
+            raise httpx.ConnectError("down")
+        return DummyResponse(sample_xml)
+
+    saved = []
+    monkeypatch.setattr("auto.feeds.ingestion.httpx.AsyncClient.get", fake_get)
+    monkeypatch.setattr(ingestion_module, "save_entries", saved.append)
+
+    with pytest.raises(httpx.ConnectError):
+        anyio.run(ingestion_module.run_ingest_async)
+
+    assert state["peak"] == 3
+    assert len(saved) == 3
+    with SessionLocal() as session:
+        feeds = {feed.url: feed for feed in session.query(Feed)}
+    assert feeds["http://bad.example/feed"].error_count == 1
+    assert feeds["http://bad.example/feed"].last_success_at is None
+    assert feeds["http://a.example/feed"].error_count == 0
+    assert feeds["http://a.example/feed"].last_success_at is not None
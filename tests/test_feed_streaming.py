@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import anyio
+import httpx
+from bs4 import BeautifulSoup
+
+from auto.db import SessionLocal
+from auto.feeds import ingestion
+from auto.feeds.ingestion import _parse_entry
+from auto.feeds.streaming import iter_entries
+from auto.models import Feed, Post
+
+SAMPLE_XML = Path(__file__).with_name("sample_feed.xml").read_bytes()
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def _collect(data: bytes, size: int = 7):
+    return [entry async for entry in iter_entries(_chunks(data, size))]
+
+
+def test_streamed_entries_match_soup_entries():
+    streamed = anyio.run(_collect, SAMPLE_XML)
+    soup_items = BeautifulSoup(SAMPLE_XML, "xml").find_all("item")
+
+    assert [_parse_entry(e) for e in streamed] == [_parse_entry(i) for i in soup_items]
+
+
+def test_streamed_atom_entries_use_link_href():
+    atom = (
+        b'<feed xmlns="http://www.w3.org/2005/Atom">'
+        b"<entry><id>tag:1</id><title>Atom</title>"
+        b'<link rel="alternate" href="http://example.com/a"/>'
+        b"<updated>2025-01-01T00:00:00Z</updated></entry></feed>"
+    )
+
+    (entry,) = anyio.run(_collect, atom)
+
+    guid, title, link, *_ = _parse_entry(entry)
+    assert (guid, title, link) == ("tag:1", "Atom", "http://example.com/a")
+
+
+def _item(guid: str, day: int) -> str:
+    return (
+        f"<item><guid>{guid}</guid><title>Post {guid}</title>"
+        f"<link>http://example.com/{guid}</link>"
+        f"<pubDate>Mon, {day:02d} Jan 2001 00:00:00 +0000</pubDate></item>"
+    )
+
+
+def test_streaming_ingest_stops_at_known_entries(test_db_engine, monkeypatch):
+    feed_url = "http://stream.example/feed"
+    monkeypatch.setenv("SUBSTACK_FEED_URL", feed_url)
+    monkeypatch.setenv("INGEST_STREAMING", "1")
+    bodies = [
+        _item("2", 2) + _item("1", 1),
+        _item("3", 3) + _item("2", 2) + _item("1", 1),
+    ]
+
+    def handler(request):
+        body = "<rss><channel>" + bodies.pop(0) + "</channel></rss>"
+        return httpx.Response(200, content=body.encode())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(ingestion, "get_http_client", lambda: client)
+    saved = []
+    orig_save_entries = ingestion.save_entries
+
+    def save_entries(items):
+        saved.append([item.findtext("guid") for item in items])
+        orig_save_entries(items)
+
+    monkeypatch.setattr(ingestion, "save_entries", save_entries)
+
+    anyio.run(ingestion.run_ingest_async)
+    anyio.run(ingestion.run_ingest_async)
+
+    assert saved == [["2", "1"], ["3"]]
+    with SessionLocal() as session:
+        assert session.query(Post).count() == 3
+        feed = session.get(Feed, feed_url)
+        assert feed.latest_entry_at.day == 3
+        assert feed.content_hash is None
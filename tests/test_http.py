@@ -0,0 +1,59 @@
+import asyncio
+
+import httpx
+
+from auto.http import (
+    _HostLimitedTransport,
+    close_http_client,
+    get_http_client,
+    with_http_client,
+)
+
+
+def test_http_client_is_shared_within_a_loop():
+    async def run():
+        first = get_http_client()
+        second = get_http_client()
+        await close_http_client()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert first.is_closed
+
+
+def test_http_client_is_not_shared_across_loops():
+    async def grab():
+        return get_http_client()
+
+    first = asyncio.run(with_http_client(grab))
+    second = asyncio.run(with_http_client(grab))
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
+
+
+def test_host_limited_transport_caps_concurrency_per_host():
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request):
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        return httpx.Response(200, text="ok")
+
+    async def run():
+        transport = _HostLimitedTransport(httpx.MockTransport(handler), 2)
+        async with httpx.AsyncClient(transport=transport) as client:
+            urls = ["http://a.example/"] * 6 + ["http://b.example/"] * 3
+            responses = await asyncio.gather(*(client.get(u) for u in urls))
+        return responses
+
+    responses = asyncio.run(run())
+
+    assert all(r.text == "ok" for r in responses)
+    assert peak == {"a.example": 2, "b.example": 2}
@@ -63,3 +63,42 @@ def test_save_entries_inserts_and_ignores_duplicates(tmp_path):
     ]
     assert all(r[2] is not None for r in rows)
     assert all(r[3] is not None for r in rows)
+
+
+def test_save_entries_uses_bulk_statements(tmp_path):
+    from sqlalchemy import event
+
+    db_path = tmp_path / "test.db"
+    engine = create_engine(
+        f"sqlite:///{db_path}", connect_args={"check_same_thread": False}
+    )
+    init_db(str(db_path), engine=engine)
+    save_entries(
+        DummyFeed([DummyEntry("0", "Existing", "http://example.com/0")]),
+        str(db_path),
+        engine=engine,
+    )
+
+    entries = [
+        DummyEntry(str(i), f"Post {i}", f"http://example.com/{i}") for i in range(1000)
+    ]
+    entries[0].content = "backfilled"
+    # A repeated item in the same feed is only inserted once.
+    entries.append(DummyEntry("5", "Post 5 again", "http://example.com/5"))
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    save_entries(DummyFeed(entries), str(db_path), engine=engine)
+
+    writes = [s for s in statements if s.startswith(("INSERT", "UPDATE"))]
+    assert len(writes) == 2
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+    content = conn.execute("SELECT content FROM posts WHERE id = '0'").fetchone()[0]
+    conn.close()
+    assert count == 1000
+    assert content == "backfilled"
@@ -2,10 +2,20 @@ from __future__ import annotations
 
 import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from sqlalchemy import event
+
+from auto.artifact_store import ArtifactStore
+from auto.cli.publish import schedule_instagram_pipeline
 from auto.db import SessionLocal
+from auto.export_queue import get_export_queue
+from auto.instagram_pipeline import (
+    execute_instagram_pipeline_batch,
+    execute_instagram_pipeline_run,
+)
 from auto.models import (
     InstagramPipelineConcept,
     InstagramPipelineRun,
@@ -305,21 +315,217 @@ def test_instagram_pipeline_exports_artifacts_and_preview(test_db_engine, monkey
         session.commit()
 
     _run_pending()
+    assert get_export_queue().flush(timeout=10)
+
+    store = ArtifactStore(export_dir)
+    manifests = sorted(store.manifest_dir.glob("ig-pipeline-5.instagram.v1.run_*.json"))
+    assert manifests, "expected at least one run manifest"
+    name = manifests[-1].stem
+
+    for filename in (
+        "run.json",
+        "concepts_ranked.json",
+        "publish_payload.json",
+        "preview.md",
+        "preview.html",
+    ):
+        assert store.read_file(name, filename)
+
+    preview = store.read_file(name, "preview.md").decode("utf-8")
+    assert "Instagram Pipeline Preview" in preview
+    assert "Ranked Concepts" in preview
+    assert "Adapter Version" in preview
+
 
-    root = export_dir / "ig-pipeline-5" / "instagram" / "v1"
-    run_dirs = sorted(
-        p for p in root.iterdir() if p.is_dir() and p.name.startswith("run_")
+def _add_posts(session, count: int) -> list[str]:
+    post_ids = [f"ig-batch-{idx}" for idx in range(count)]
+    session.add_all(
+        Post(
+            id=post_id,
+            title=f"Batch Pipeline Post {post_id}",
+            link=f"https://example.com/{post_id}",
+            summary="Batch summary",
+            published="",
+        )
+        for post_id in post_ids
+    )
+    session.commit()
+    return post_ids
+
+
+def _pipeline_options(tmp_path) -> dict:
+    return {
+        "network": "instagram",
+        "pipeline_version": "v1",
+        "auto_publish": False,
+        "quality_threshold": 0.1,
+        "banned_terms": set(),
+        "pipeline_enabled": True,
+        "export_enabled": False,
+        "export_dir": str(tmp_path),
+    }
+
+
+def _run_snapshot(session, post_id: str) -> tuple:
+    run = (
+        session.query(InstagramPipelineRun)
+        .filter(InstagramPipelineRun.post_id == post_id)
+        .one()
+    )
+    concepts = [
+        (c.concept_key, c.rank, c.score_total, c.concept_payload)
+        for c in session.query(InstagramPipelineConcept)
+        .filter(InstagramPipelineConcept.run_id == run.id)
+        .order_by(InstagramPipelineConcept.rank)
+    ]
+    selected = session.get(InstagramPipelineConcept, run.selected_concept_id)
+    return (
+        run.status,
+        run.score_summary,
+        run.publish_payload,
+        selected.concept_key,
+        concepts,
     )
-    assert run_dirs, "expected at least one run artifact directory"
-    latest = run_dirs[-1]
 
-    assert (latest / "run.json").exists()
-    assert (latest / "concepts_ranked.json").exists()
-    assert (latest / "publish_payload.json").exists()
-    assert (latest / "preview.md").exists()
-    assert (latest / "preview.html").exists()
 
-    preview = (latest / "preview.md").read_text()
-    assert "Instagram Pipeline Preview" in preview
-    assert "Ranked Concepts" in preview
-    assert "Adapter Version" in preview
+def test_instagram_pipeline_batch_matches_single_runs(test_db_engine, tmp_path):
+    options = _pipeline_options(tmp_path)
+    with SessionLocal() as session:
+        post_ids = _add_posts(session, 5)
+
+        async def run_single() -> None:
+            for post_id in post_ids:
+                await execute_instagram_pipeline_run(
+                    session, post_id=post_id, **options
+                )
+
+        asyncio.run(run_single())
+        session.commit()
+        expected = {post_id: _run_snapshot(session, post_id) for post_id in post_ids}
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            runs = asyncio.run(
+                execute_instagram_pipeline_batch(
+                    session,
+                    post_ids=post_ids + ["missing"],
+                    chunk_size=2,
+                    executor=executor,
+                    **options,
+                )
+            )
+
+        assert [run.post_id for run in runs] == post_ids
+        session.expire_all()
+        for post_id in post_ids:
+            assert _run_snapshot(session, post_id) == expected[post_id]
+        assert session.query(InstagramPipelineRun).count() == 5
+        assert session.query(InstagramPipelineConcept).count() == 15
+
+
+def test_instagram_pipeline_task_runs_batch_payload(
+    test_db_engine, monkeypatch, tmp_path
+):
+    reset_registry()
+    monkeypatch.setenv("INSTAGRAM_PIPELINE_QUALITY_THRESHOLD", "0.1")
+    monkeypatch.setenv("INSTAGRAM_PIPELINE_EXPORT_ENABLED", "0")
+    monkeypatch.setenv("INSTAGRAM_PIPELINE_BATCH_SIZE", "2")
+
+    with SessionLocal() as session:
+        post_ids = _add_posts(session, 3)
+        session.add(
+            Task(
+                type="instagram_pipeline_run",
+                payload=json.dumps({"post_ids": post_ids, "auto_publish": False}),
+                scheduled_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+            )
+        )
+        session.commit()
+
+    _run_pending()
+
+    with SessionLocal() as session:
+        statuses = {
+            run.post_id: run.status for run in session.query(InstagramPipelineRun)
+        }
+        assert statuses == {post_id: "ready" for post_id in post_ids}
+        task = session.query(Task).filter(Task.type == "instagram_pipeline_run").one()
+        assert task.status == "completed"
+
+
+def test_schedule_instagram_pipeline_all_unpublished(test_db_engine, monkeypatch):
+    monkeypatch.setattr("auto.cli.publish.notify_task_enqueued", lambda: None)
+    with SessionLocal() as session:
+        post_ids = _add_posts(session, 5)
+        session.add(
+            PostStatus(post_id=post_ids[0], network="instagram", status="published")
+        )
+        session.commit()
+
+    schedule_instagram_pipeline(
+        post_id=None,
+        time="in 0s",
+        pipeline_version="v1",
+        auto_publish=False,
+        all_unpublished=True,
+        batch_size=3,
+    )
+
+    with SessionLocal() as session:
+        payloads = [
+            json.loads(task.payload)
+            for task in session.query(Task)
+            .filter(Task.type == "instagram_pipeline_run")
+            .order_by(Task.id)
+        ]
+    assert [p["post_ids"] for p in payloads] == [post_ids[1:4], post_ids[4:]]
+
+
+def test_instagram_pipeline_rerun_keeps_unchanged_concepts(test_db_engine, tmp_path):
+    options = _pipeline_options(tmp_path)
+    writes: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split()[0].upper() in {"INSERT", "UPDATE", "DELETE"}:
+            writes.append(statement)
+
+    def concept_rows(session, run_id: int) -> dict:
+        return {
+            c.concept_key: (c.id, c.updated_at, c.content_hash)
+            for c in session.query(InstagramPipelineConcept).filter(
+                InstagramPipelineConcept.run_id == run_id
+            )
+        }
+
+    with SessionLocal() as session:
+        (post_id,) = _add_posts(session, 1)
+
+        async def run_once() -> InstagramPipelineRun:
+            run = await execute_instagram_pipeline_run(
+                session, post_id=post_id, **options
+            )
+            session.commit()
+            return run
+
+        run = asyncio.run(run_once())
+        before = concept_rows(session, run.id)
+        assert all(content_hash for _, _, content_hash in before.values())
+        selected_id = run.selected_concept_id
+
+        event.listen(test_db_engine, "before_cursor_execute", record)
+        try:
+            asyncio.run(run_once())
+        finally:
+            event.remove(test_db_engine, "before_cursor_execute", record)
+        assert writes == []
+        session.expire_all()
+        assert concept_rows(session, run.id) == before
+        assert run.selected_concept_id == selected_id
+
+        session.get(Post, post_id).summary = "A different summary"
+        session.commit()
+        asyncio.run(run_once())
+        after = concept_rows(session, run.id)
+        assert {key: row[0] for key, row in after.items()} == {
+            key: row[0] for key, row in before.items()
+        }
+        assert all(after[key][2] != before[key][2] for key in before)
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from auto.instagram_pipeline import (
+    generate_instagram_native_concepts,
+    rank_instagram_concepts_batch,
+    score_instagram_concept_weighted,
+    select_instagram_publish_candidate,
+)
+from auto.instagram_scoring import (
+    FEATURES,
+    concept_feature_matrix,
+    score_instagram_concepts,
+)
+from auto.models import Post
+
+EDGE_CASES = [
+    {},
+    {"format": "carousel", "visual_rhythm": ["a", "b", "c", "d"]},
+    {"format": "reel", "visual_rhythm": ["a", "b", "c"], "hashtags": ["#a"] * 5},
+    {"format": "single_image", "cta_strategy": "share_prompt"},
+    {"format": "story", "cta_strategy": "unknown", "hashtags": ["#a"] * 11},
+    {"format": None, "visual_rhythm": None, "hashtags": None, "caption_seed": None},
+    {"format": "carousel", "caption_seed": "x" * 1100},
+    {"format": "carousel", "caption_seed": "x" * 1101, "hashtags": ["#a"] * 30},
+    {"format": "reel", "visual_rhythm": list(range(9)), "hashtags": ["#a"] * 4},
+]
+
+
+def _random_concept(rng: random.Random) -> dict:
+    return {
+        "format": rng.choice(["carousel", "reel", "single_image", "story", ""]),
+        "visual_rhythm": ["beat"] * rng.randint(0, 8),
+        "hashtags": ["#tag"] * rng.randint(0, 15),
+        "caption_seed": "c" * rng.randint(0, 1500),
+        "cta_strategy": rng.choice(
+            ["save_and_share", "comment_prompt", "share_prompt", "none", ""]
+        ),
+    }
+
+
+def _reference(concepts, weights=None):
+    kwargs = {}
+    if weights is not None:
+        kwargs = {
+            "visual_weight": weights["visual"],
+            "engagement_weight": weights["engagement"],
+            "risk_weight": weights["risk"],
+        }
+    return [score_instagram_concept_weighted(c, **kwargs) for c in concepts]
+
+
+def test_vectorized_scores_match_reference_for_edge_cases():
+    assert score_instagram_concepts(EDGE_CASES) == _reference(EDGE_CASES)
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [
+        None,
+        {"visual": 0.45, "engagement": 0.4, "risk": 0.15},
+        {"visual": 0.2, "engagement": 0.7, "risk": 0.1},
+        {"visual": 1 / 3, "engagement": 1 / 3, "risk": 1 / 3},
+    ],
+)
+def test_vectorized_scores_match_reference_for_random_concepts(weights):
+    rng = random.Random(1234)
+    concepts = [_random_concept(rng) for _ in range(2000)]
+    assert score_instagram_concepts(concepts, weights=weights) == _reference(
+        concepts, weights
+    )
+
+
+def test_feature_matrix_columns():
+    matrix = concept_feature_matrix(EDGE_CASES[:3])
+    assert matrix.shape == (3, len(FEATURES))
+    assert matrix[1].tolist() == [0, 4, 0, 0, 0]
+    assert matrix[2].tolist() == [1, 3, 5, 0, 0]
+
+
+def test_empty_batch():
+    assert score_instagram_concepts([]) == []
+    assert rank_instagram_concepts_batch([]) == []
+
+
+def test_weights_come_from_config(monkeypatch):
+    concepts = EDGE_CASES[1:4]
+    monkeypatch.setenv("INSTAGRAM_SCORING_WEIGHTS", "visual=0.1,risk=0.5")
+    expected = _reference(concepts, {"visual": 0.1, "engagement": 0.4, "risk": 0.5})
+    assert score_instagram_concepts(concepts) == expected
+
+    monkeypatch.setenv("INSTAGRAM_SCORING_WEIGHTS", "beauty=1")
+    with pytest.raises(ValueError):
+        score_instagram_concepts(concepts)
+
+
+def test_batch_ranking_matches_per_concept_scoring():
+    posts = [
+        Post(
+            id=f"post-{idx}",
+            title=f"Scoring post number {idx} about visuals",
+            link=f"https://example.com/{idx}",
+            summary="summary " * idx,
+            content="content " * (idx * 40),
+        )
+        for idx in range(20)
+    ]
+    expected = []
+    for post in posts:
+        scored = []
+        for concept in generate_instagram_native_concepts(post):
+            scores = score_instagram_concept_weighted(concept)
+            scored.append(
+                {
+                    **concept,
+                    "score_total": scores["total"],
+                    "score_breakdown": {
+                        "visual": scores["visual"],
+                        "engagement": scores["engagement"],
+                        "risk": scores["risk"],
+                    },
+                }
+            )
+        expected.append(select_instagram_publish_candidate(scored))
+
+    assert rank_instagram_concepts_batch(posts) == expected
@@ -11,7 +11,7 @@ async def run(task, session):
 
 
 def test_sync_marks_published(monkeypatch, test_db_engine):
-    async def fake_fetch_all_statuses(self):
+    async def fake_fetch_all_statuses(self, since_id=None):
         return [
             {"id": "a", "content": "check http://one"},
             {"id": "b", "content": "id:2"},
@@ -39,7 +39,7 @@ def test_sync_marks_published(monkeypatch, test_db_engine):
 
 
 def test_sync_debug_output(monkeypatch, test_db_engine, capsys):
-    async def fake_fetch_all_statuses(self):
+    async def fake_fetch_all_statuses(self, since_id=None):
         return [{"id": "a", "content": "check http://one"}]
 
     monkeypatch.setattr(MastodonClient, "fetch_all_statuses", fake_fetch_all_statuses)
@@ -59,3 +59,87 @@ def test_sync_debug_output(monkeypatch, test_db_engine, capsys):
         assert "Fetched 1 Mastodon statuses" in out
         assert "STATUS: check http://one" in out
         assert "Post 1 already published" in out
+
+
+def test_sync_resumes_from_cursor(monkeypatch, test_db_engine):
+    calls = []
+    pages = [
+        [
+            {"id": "9", "content": '<p><a href="http://one">one</a></p>'},
+            {"id": "10", "content": "<p>nothing here</p>"},
+        ],
+        [{"id": "11", "content": "<p>see http://two.</p>"}],
+        [],
+    ]
+
+    async def fake_fetch_all_statuses(self, since_id=None):
+        calls.append(since_id)
+        return pages.pop(0)
+
+    monkeypatch.setattr(MastodonClient, "fetch_all_statuses", fake_fetch_all_statuses)
+
+    with SessionLocal() as session:
+        session.add_all(
+            [
+                Post(id="1", title="One", link="http://one", summary="", published=""),
+                Post(id="2", title="Two", link="http://two", summary="", published=""),
+                Post(id="3", title="Three", link="http://three", published=""),
+                PostStatus(post_id="2", network="mastodon", status="pending"),
+            ]
+        )
+        session.commit()
+
+        for _ in range(3):
+            asyncio.run(run(Task(type="sync_mastodon_posts"), session))
+
+        assert calls == [None, "10", "11"]
+        statuses = {
+            s.post_id: s.status
+            for s in session.query(PostStatus).filter_by(network="mastodon")
+        }
+        assert statuses == {"1": "published", "2": "published"}
+
+
+def test_sync_matches_links_with_tracking_parameters(monkeypatch, test_db_engine):
+    async def fake_fetch_all_statuses(self, since_id=None):
+        return [
+            {
+                "id": "a",
+                "content": '<p><a href="https://blog.example/p/one?utm_source='
+                'mastodon&amp;utm_medium=social">read</a></p>',
+            },
+            {"id": "b", "content": "<p>https://blog.example/p/two/#comments</p>"},
+        ]
+
+    monkeypatch.setattr(MastodonClient, "fetch_all_statuses", fake_fetch_all_statuses)
+
+    with SessionLocal() as session:
+        session.add_all(
+            [
+                Post(
+                    id="1", title="One", link="https://blog.example/p/one", published=""
+                ),
+                Post(
+                    id="2", title="Two", link="https://blog.example/p/two", published=""
+                ),
+                Post(
+                    id="3",
+                    title="Three",
+                    link="https://blog.example/p/three",
+                    published="",
+                ),
+            ]
+        )
+        task = Task(type="sync_mastodon_posts")
+        session.add(task)
+        session.commit()
+
+        asyncio.run(run(task, session))
+
+        published = {
+            status.post_id
+            for status in session.query(PostStatus).filter(
+                PostStatus.status == "published"
+            )
+        }
+        assert published == {"1", "2"}
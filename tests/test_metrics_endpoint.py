@@ -17,3 +17,118 @@ def test_metrics_endpoint(test_db_engine):
         assert resp.status_code == 200
         assert "posts_published_total" in resp.text
     assert POSTS_COLLECTED._value.get() == 2
+
+
+def test_metrics_endpoint_exports_latest_engagement(test_db_engine):
+    from datetime import datetime, timedelta, timezone
+
+    from auto.metrics import POST_ENGAGEMENT
+    from auto.models import PostMetric
+
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as session:
+        session.add(Post(id="1", title="t1", link="http://1"))
+        session.add(Post(id="2", title="t2", link="http://2"))
+        for post_id, value, age in [("1", 2, 60), ("1", 5, 0), ("2", 4, 0)]:
+            session.add(
+                PostMetric(
+                    post_id=post_id,
+                    network="mastodon",
+                    name="favourites",
+                    value=value,
+                    collected_at=now - timedelta(seconds=age),
+                )
+            )
+        session.commit()
+
+    with TestClient(main.app) as client:
+        resp = client.get("/metrics")
+        assert 'post_engagement{metric="favourites",network="mastodon"}' in resp.text
+    gauge = POST_ENGAGEMENT.labels(network="mastodon", metric="favourites")
+    assert gauge._value.get() == 9
+
+
+def _task_gauge(task_type, status):
+    from auto.metrics import TASKS
+
+    return TASKS.labels(task_type, status)._value.get()
+
+
+def test_commits_update_gauges_incrementally(test_db_engine):
+    from auto.models import Task
+
+    pending = _task_gauge("gauge_test", "pending")
+    done = _task_gauge("gauge_test", "completed")
+    posts = POSTS_COLLECTED._value.get()
+
+    with SessionLocal() as session:
+        session.add(Post(id="1", title="t1", link="http://1"))
+        session.add(Task(type="gauge_test"))
+        session.commit()
+        assert POSTS_COLLECTED._value.get() == posts + 1
+        assert _task_gauge("gauge_test", "pending") == pending + 1
+
+        task = session.query(Task).filter_by(type="gauge_test").one()
+        task.status = "completed"
+        session.commit()
+        assert _task_gauge("gauge_test", "pending") == pending
+        assert _task_gauge("gauge_test", "completed") == done + 1
+
+        session.add(Task(type="gauge_test"))
+        session.flush()
+        session.rollback()
+    assert _task_gauge("gauge_test", "pending") == pending
+
+
+def test_reconcile_reports_queue_depth_and_lag(test_db_engine):
+    from datetime import datetime, timedelta, timezone
+
+    from auto.metrics import (
+        TASK_OLDEST_DUE_AGE,
+        TASK_QUEUE_DEPTH,
+        reconcile_metrics,
+    )
+    from auto.models import Task
+
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as session:
+        session.add_all(
+            [
+                Task(type="lag", scheduled_at=now - timedelta(minutes=10)),
+                Task(type="lag", scheduled_at=now - timedelta(minutes=1)),
+                Task(type="lag", scheduled_at=now + timedelta(hours=1)),
+                Task(type="lag", status="completed", scheduled_at=now),
+            ]
+        )
+        session.commit()
+        reconcile_metrics(session, now=now)
+
+    assert TASK_QUEUE_DEPTH._value.get() == 2
+    assert _task_gauge("lag", "pending") == 3
+    assert _task_gauge("lag", "completed") == 1
+    age = TASK_OLDEST_DUE_AGE.collect()[0].samples[0].value
+    assert 600 <= age < 700
+
+
+def test_scheduler_iteration_refreshes_queue_depth(test_db_engine, monkeypatch):
+    import asyncio
+    from datetime import datetime, timedelta, timezone
+
+    from auto.metrics import TASK_QUEUE_DEPTH
+    from auto.models import Task
+    from auto.scheduler import Scheduler
+
+    async def no_claims(**kwargs):
+        return 0
+
+    monkeypatch.setattr("auto.scheduler.process_pending", no_claims)
+    TASK_QUEUE_DEPTH.set(0)
+    with SessionLocal() as session:
+        session.add(
+            Task(type="queued", scheduled_at=datetime.now(timezone.utc) - timedelta(1))
+        )
+        session.commit()
+
+    asyncio.run(Scheduler()._iteration())
+
+    assert TASK_QUEUE_DEPTH._value.get() == 1
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from auto.db import SessionLocal
+from auto.metrics_harvest import harvest_metrics, next_metrics_due
+from auto.models import Post, PostMetric, PostStatus
+from auto.socials.registry import get_registry, reset_registry
+
+
+class FakePlugin:
+    network = "fake"
+
+    def __init__(self):
+        self.fetched = []
+
+    async def post(self, text, visibility="unlisted"):
+        return "remote-new"
+
+    async def fetch_metrics(self, post_id):
+        self.fetched.append(post_id)
+        if post_id == "broken":
+            raise RuntimeError("boom")
+        return {"favourites": 3, "reblogs": 1}
+
+
+@pytest.fixture
+def plugin():
+    reset_registry()
+    plugin = FakePlugin()
+    get_registry().register(plugin)
+    yield plugin
+    reset_registry()
+
+
+def test_poll_interval_decays_with_age():
+    now = datetime(2026, 1, 10, tzinfo=timezone.utc)
+
+    assert next_metrics_due(now - timedelta(minutes=5), now) == now + timedelta(
+        minutes=5
+    )
+    assert next_metrics_due(now - timedelta(hours=5), now) == now + timedelta(hours=1)
+    assert next_metrics_due(now - timedelta(days=3), now) == now + timedelta(hours=6)
+    assert next_metrics_due(now - timedelta(days=8), now) is None
+
+
+def _published(session, post_id, remote_id, published_at, due_at):
+    session.add(Post(id=post_id, title=post_id, link=f"http://{post_id}"))
+    session.add(
+        PostStatus(
+            post_id=post_id,
+            network="fake",
+            status="published",
+            remote_id=remote_id,
+            published_at=published_at,
+            metrics_due_at=due_at,
+        )
+    )
+
+
+def test_harvest_stores_samples_for_due_posts(test_db_engine, plugin):
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as session:
+        _published(session, "fresh", "r1", now - timedelta(minutes=1), now)
+        _published(session, "old", "r2", now - timedelta(days=30), now)
+        _published(session, "later", "r3", now, now + timedelta(hours=1))
+        _published(session, "failing", "broken", now, now)
+        session.commit()
+
+        assert asyncio.run(harvest_metrics(session, now=now)) == 3
+
+        assert sorted(plugin.fetched) == ["broken", "r1", "r2"]
+        samples = {
+            (m.post_id, m.name): m.value for m in session.query(PostMetric).all()
+        }
+        assert samples == {
+            ("fresh", "favourites"): 3,
+            ("fresh", "reblogs"): 1,
+            ("old", "favourites"): 3,
+            ("old", "reblogs"): 1,
+        }
+        fresh = session.get(PostStatus, {"post_id": "fresh", "network": "fake"})
+        old = session.get(PostStatus, {"post_id": "old", "network": "fake"})
+        failing = session.get(PostStatus, {"post_id": "failing", "network": "fake"})
+        assert fresh.metrics_due_at == now + timedelta(minutes=5)
+        assert old.metrics_due_at is None
+        assert failing.metrics_due_at == now + timedelta(minutes=5)
+
+
+def test_publish_records_remote_id(test_db_engine, plugin, monkeypatch):
+    import json
+
+    from auto.models import Task
+    from auto.scheduler import process_pending
+
+    monkeypatch.setenv("POST_DELAY", "0")
+    with SessionLocal() as session:
+        session.add(Post(id="p", title="T", link="http://p"))
+        session.add(PostStatus(post_id="p", network="fake"))
+        session.add(
+            Task(
+                type="publish_post",
+                payload=json.dumps({"post_id": "p", "network": "fake"}),
+            )
+        )
+        session.commit()
+
+    asyncio.run(process_pending())
+
+    with SessionLocal() as session:
+        status = session.get(PostStatus, {"post_id": "p", "network": "fake"})
+        assert status.remote_id == "remote-new"
+        assert status.metrics_due_at > status.published_at
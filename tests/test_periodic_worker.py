@@ -19,3 +19,23 @@ def test_periodic_worker_runs_and_stops():
 
     assert worker.task is None
     assert counter["count"] >= 2
+
+
+def test_periodic_worker_wake_cuts_sleep_short():
+    counter = {"count": 0}
+
+    async def work():
+        counter["count"] += 1
+
+    worker = PeriodicWorker(work, 60)
+
+    async def run():
+        await worker.start()
+        await asyncio.sleep(0.01)
+        worker.wake()
+        await asyncio.sleep(0.01)
+        await worker.stop()
+
+    asyncio.run(run())
+
+    assert counter["count"] == 2
@@ -36,3 +36,127 @@ def test_create_preview_replaces(session, tmp_path):
     second = session.get(PostPreview, {"post_id": "p1", "network": "mastodon"})
     assert second is not None
     assert session.query(PostPreview).count() == 1
+
+
+class FakeLM:
+    model = "fake/model"
+
+    def __init__(self):
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+
+    async def acall(self, messages):
+        import asyncio
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        prompt = messages[0]["content"]
+        self.prompts.append(prompt)
+        return ['```json\n{"tweet": "%s"}\n```' % prompt.replace("\n", " ")]
+
+
+def _schedule(session, count):
+    for i in range(count):
+        session.add_all(
+            [
+                Post(id=f"p{i}", title=f"T{i}", link=f"http://ex/{i}", content=f"C{i}"),
+                PostStatus(
+                    post_id=f"p{i}",
+                    network="mastodon",
+                    scheduled_at=datetime.now(timezone.utc),
+                ),
+            ]
+        )
+    session.commit()
+
+
+def test_generate_previews_reuses_cached_responses(session, tmp_path, monkeypatch):
+    import asyncio
+    import json
+
+    from auto import preview
+
+    _schedule(session, 5)
+    template = tmp_path / "tmpl.txt"
+    template.write_text("Summary: {{ content }}")
+    lm = FakeLM()
+    monkeypatch.setattr(preview, "get_preview_lm", lambda: lm)
+    pairs = [(f"p{i}", "mastodon") for i in range(5)] + [("missing", "mastodon")]
+
+    async def run():
+        return await preview.generate_previews(
+            session, pairs, template_path=str(template), concurrency=2
+        )
+
+    assert asyncio.run(run()) == 5
+    assert len(lm.prompts) == 5
+    assert lm.max_active == 2
+    saved = session.get(PostPreview, {"post_id": "p3", "network": "mastodon"})
+    assert json.loads(saved.content) == {"tweet": "Summary: C3"}
+
+    session.get(Post, "p1").content = "changed"
+    session.commit()
+    assert asyncio.run(run()) == 5
+    assert lm.prompts[5:] == ["Summary: changed"]
+
+
+def test_generate_previews_cli_fills_missing(test_db_engine):
+    from auto.cli import publish
+    from auto.db import SessionLocal
+
+    with SessionLocal() as session:
+        _schedule(session, 3)
+        session.add(PostPreview(post_id="p0", network="mastodon", content="keep"))
+        session.commit()
+
+    publish.generate_previews(
+        post_ids=None,
+        network="mastodon",
+        all_missing=True,
+        use_llm=False,
+        concurrency=None,
+    )
+
+    with SessionLocal() as session:
+        previews = {p.post_id: p.content for p in session.query(PostPreview)}
+    assert previews["p0"] == "keep"
+    assert set(previews) == {"p0", "p1", "p2"}
+
+
+def test_create_preview_async_calls_only_the_lm_in_a_thread(
+    session, tmp_path, monkeypatch
+):
+    import asyncio
+    import json
+    import threading
+
+    from auto import preview
+    from auto.models import LLMResponse
+
+    threads = []
+
+    class BlockingLM:
+        model = "fake/model"
+
+        def __call__(self, messages):
+            threads.append(threading.get_ident())
+            return ['{"tweet": "from thread"}']
+
+    monkeypatch.setattr(preview, "get_preview_lm", lambda: BlockingLM())
+    _schedule(session, 1)
+    template = tmp_path / "tmpl.txt"
+    template.write_text("{{ content }}")
+
+    asyncio.run(
+        preview.create_preview_async(
+            session, "p0", "mastodon", template_path=str(template)
+        )
+    )
+
+    assert threads and threads[0] != threading.get_ident()
+    saved = session.get(PostPreview, {"post_id": "p0", "network": "mastodon"})
+    assert json.loads(saved.content) == {"tweet": "from thread"}
+    assert session.query(LLMResponse).count() == 1
@@ -0,0 +1,69 @@
+import pstats
+import time
+
+from typer.testing import CliRunner
+
+from auto.profiling import Profile, profiled
+
+
+def _busy(ms: float) -> None:
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def test_slow_runs_are_saved(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("PROFILE_ENABLED", "1")
+    monkeypatch.setenv("PROFILE_THRESHOLD_MS", "20")
+
+    with profiled("fast run"):
+        pass
+    with profiled("slow run"):
+        _busy(30)
+
+    (path,) = tmp_path.iterdir()
+    assert path.name.startswith("slow_run-") and path.suffix == ".pstats"
+    stats = pstats.Stats(str(path))
+    assert any(func[2] == "_busy" for func in stats.stats)
+
+
+def test_profiling_is_off_by_default_and_scoped(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("PROFILE_THRESHOLD_MS", "0")
+    monkeypatch.delenv("PROFILE_ENABLED", raising=False)
+
+    with profiled("disabled"):
+        pass
+    monkeypatch.setenv("PROFILE_ENABLED", "1")
+    monkeypatch.setenv("PROFILE_SCOPE", "handler")
+    with profiled("iteration", scope="iteration"):
+        pass
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_nested_captures_are_skipped(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    outer = Profile("outer", threshold_ms=0)
+    inner = Profile("inner", threshold_ms=0)
+
+    assert outer.start()
+    assert not inner.start()
+    assert inner.stop() is None
+    assert outer.stop() is not None
+    assert inner.start()
+    inner.stop()
+
+
+def test_cli_profile_flag(tmp_path, monkeypatch, test_db_engine):
+    from auto.cli import build_app
+
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setenv("PROFILE_THRESHOLD_MS", "0")
+
+    result = CliRunner().invoke(build_app(), ["--profile", "publish", "list-posts"])
+
+    assert result.exit_code == 0, result.output
+    (path,) = (tmp_path / "profiles").iterdir()
+    assert path.name.startswith("cli_publish-")
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from auto.socials.rate_limit import TokenBucket, get_rate_limiter, reset_rate_limiters
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters():
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
+
+
+def test_token_bucket_allows_a_burst_then_paces():
+    bucket = TokenBucket(interval=10, burst=2)
+
+    waits = [bucket.try_acquire() for _ in range(4)]
+
+    assert waits[:2] == [0, 0]
+    assert waits[2] == pytest.approx(10, abs=0.1)
+    assert waits[3] == pytest.approx(10, abs=0.1)
+
+
+def test_zero_interval_never_waits():
+    bucket = TokenBucket(interval=0)
+    assert all(bucket.try_acquire() == 0 for _ in range(10))
+
+
+def test_exhausted_rate_limit_headers_block_until_reset():
+    bucket = TokenBucket(interval=0)
+    reset = datetime.now(timezone.utc) + timedelta(seconds=60)
+
+    bucket.update_from_headers(
+        {"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": reset.isoformat()}
+    )
+    assert bucket.delay() == 0
+
+    bucket.update_from_headers(
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset.isoformat()}
+    )
+    assert bucket.delay() == pytest.approx(60, abs=2)
+
+
+def test_retry_after_blocks_the_bucket():
+    bucket = TokenBucket(interval=0)
+    bucket.update_from_headers({"Retry-After": "30"})
+    assert bucket.delay() == pytest.approx(30, abs=1)
+
+
+def test_limiter_follows_network_config(monkeypatch):
+    monkeypatch.setenv("POST_DELAY", "1")
+    monkeypatch.setenv("PUBLISH_NETWORK_DELAYS", "medium=60")
+
+    assert get_rate_limiter("medium").interval == 60
+    assert get_rate_limiter("mastodon").interval == 1
+
+    monkeypatch.setenv("POST_DELAY", "0")
+    limiter = get_rate_limiter("mastodon")
+    assert limiter is get_rate_limiter("mastodon")
+    assert limiter.interval == 0
+
+
+def test_try_acquire_reports_wait_without_taking_a_token():
+    bucket = TokenBucket(interval=10)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.delay() == pytest.approx(10, abs=0.1)
+    assert bucket.try_acquire() == pytest.approx(10, abs=0.1)
+    # Refused attempts leave the bucket as it was.
+    assert bucket.delay() == pytest.approx(10, abs=0.1)
+
+    bucket.block_for(60)
+    assert bucket.try_acquire() == pytest.approx(60, abs=1)
@@ -1,6 +1,7 @@
 import asyncio
 from datetime import datetime, timedelta, timezone
 import json
+import time
 
 from auto.db import SessionLocal
 from auto.models import Post, PostStatus, Task, PostPreview
@@ -78,6 +79,133 @@ def test_publish_post_task(test_db_engine, monkeypatch):
     assert POSTS_FAILED.labels(network="mastodon")._value.get() == fail_start
 
 
+def _add_publish_tasks(networks, count, scheduled_at):
+    with SessionLocal() as session:
+        for i in range(count):
+            session.add(Post(id=str(i), title=f"T{i}", link=f"http://{i}"))
+            for network in networks:
+                session.add(PostStatus(post_id=str(i), network=network))
+                session.add(
+                    Task(
+                        type="publish_post",
+                        payload=json.dumps({"post_id": str(i), "network": network}),
+                        scheduled_at=scheduled_at,
+                    )
+                )
+        session.commit()
+
+
+class FakePlugin:
+    def __init__(self, network, order):
+        self.network = network
+        self.order = order
+
+    async def post(self, text, visibility="unlisted"):
+        self.order.append(self.network)
+
+
+def _publish_tasks(session, network):
+    return [
+        task
+        for task in session.query(Task).filter(Task.type == "publish_post")
+        if json.loads(task.payload)["network"] == network
+    ]
+
+
+def test_publish_lanes_defer_paced_networks(test_db_engine, monkeypatch):
+    from auto.socials.rate_limit import reset_rate_limiters
+
+    reset_rate_limiters()
+    order = []
+    reg = get_registry()
+    reg.register(FakePlugin("slow", order))
+    reg.register(FakePlugin("fast", order))
+    monkeypatch.setenv("POST_DELAY", "0")
+    monkeypatch.setenv("PUBLISH_NETWORK_DELAYS", "slow=30")
+    now = datetime.now(timezone.utc)
+    _add_publish_tasks(("slow", "fast"), 3, now - timedelta(seconds=1))
+
+    asyncio.run(run_process())
+    reset_rate_limiters()
+
+    # The slow network posts once and hands the rest back instead of waiting.
+    assert order.count("fast") == 3
+    assert order.count("slow") == 1
+    with SessionLocal() as session:
+        slow = _publish_tasks(session, "slow")
+        assert sorted(t.status for t in slow) == ["completed", "pending", "pending"]
+        for task in slow:
+            if task.status == "pending":
+                assert task.claimed_by is None
+                assert task.lease_expires_at is None
+                assert task.attempts == 0
+                deferred = task.scheduled_at.replace(tzinfo=timezone.utc) - now
+                assert timedelta(seconds=25) < deferred < timedelta(seconds=35)
+        assert {t.status for t in _publish_tasks(session, "fast")} == {"completed"}
+
+
+def test_rate_limited_network_does_not_hold_dispatch_slot(test_db_engine, monkeypatch):
+    from auto.socials.rate_limit import get_rate_limiter, reset_rate_limiters
+
+    reset_rate_limiters()
+    order = []
+    reg = get_registry()
+    reg.register(FakePlugin("mastodon", order))
+    reg.register(FakePlugin("medium", order))
+    monkeypatch.setenv("SCHEDULER_CONCURRENCY", "1")
+    monkeypatch.setenv("POST_DELAY", "0")
+    reset = datetime.now(timezone.utc) + timedelta(seconds=600)
+    get_rate_limiter("mastodon").update_from_headers(
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset.isoformat()}
+    )
+    _add_publish_tasks(("mastodon", "medium"), 2, reset - timedelta(seconds=601))
+
+    started = time.monotonic()
+    asyncio.run(run_process())
+    elapsed = time.monotonic() - started
+    reset_rate_limiters()
+
+    assert elapsed < 5
+    assert order == ["medium", "medium"]
+    with SessionLocal() as session:
+        for task in _publish_tasks(session, "mastodon"):
+            assert task.status == "pending"
+            scheduled_at = task.scheduled_at.replace(tzinfo=timezone.utc)
+            assert abs((scheduled_at - reset).total_seconds()) < 2
+        statuses = session.query(PostStatus).filter_by(network="mastodon").all()
+        assert {s.status for s in statuses} == {"pending"}
+
+
+def test_deferred_handler_returns_task_to_pending(test_db_engine):
+    from auto.scheduler import TaskDeferred, TASK_HANDLERS, register_task_handler
+
+    @register_task_handler("defer_test")
+    async def handler(task, session):
+        raise TaskDeferred(60)
+
+    try:
+        with SessionLocal() as session:
+            task = Task(
+                type="defer_test",
+                scheduled_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+            )
+            session.add(task)
+            session.commit()
+            task_id = task.id
+
+        asyncio.run(run_process())
+    finally:
+        TASK_HANDLERS.pop("defer_test", None)
+
+    with SessionLocal() as session:
+        task = session.get(Task, task_id)
+        assert task.status == "pending"
+        assert task.attempts == 0
+        assert task.claimed_by is None
+        scheduled_at = task.scheduled_at.replace(tzinfo=timezone.utc)
+        assert scheduled_at > datetime.now(timezone.utc) + timedelta(seconds=50)
+
+
 def test_import_before_plugin_setup(test_db_engine, monkeypatch):
     """Importing scheduler before registering plugins should not break."""
     reset_registry()
@@ -157,6 +285,91 @@ def test_ingest_feed_task(test_db_engine, monkeypatch):
         assert next_task is not None
 
 
+def test_ingest_feed_task_reschedules_its_own_feed(test_db_engine, monkeypatch):
+    from auto.ingest_scheduler import ensure_initial_task
+    from auto.models import Feed
+
+    called = []
+
+    async def fake_ingest_feed_async(feed_url):
+        called.append(feed_url)
+
+    monkeypatch.setattr(
+        "auto.ingest_scheduler.ingest_feed_async", fake_ingest_feed_async
+    )
+    monkeypatch.setenv(
+        "SUBSTACK_FEED_URLS", "http://a.example/feed,http://b.example/feed"
+    )
+
+    with SessionLocal() as session:
+        ensure_initial_task(session)
+        session.add(Feed(url="http://c.example/feed"))
+        session.commit()
+        assert session.get(Feed, "http://a.example/feed") is not None
+        session.get(Feed, "http://b.example/feed").poll_interval = 60
+        session.commit()
+        ensure_initial_task(session)
+        session.commit()
+        tasks = session.query(Task).filter(Task.type == "ingest_feed").all()
+        assert sorted(json.loads(t.payload)["feed_url"] for t in tasks) == [
+            "http://a.example/feed",
+            "http://b.example/feed",
+        ]
+
+    asyncio.run(run_process())
+
+    assert sorted(called) == ["http://a.example/feed", "http://b.example/feed"]
+    with SessionLocal() as session:
+        pending = (
+            session.query(Task)
+            .filter(Task.type == "ingest_feed", Task.status == "pending")
+            .all()
+        )
+        delays = {
+            json.loads(t.payload)["feed_url"]: t.scheduled_at - t.created_at
+            for t in pending
+        }
+    assert set(delays) == {"http://a.example/feed", "http://b.example/feed"}
+    assert delays["http://b.example/feed"] < timedelta(seconds=120)
+    assert delays["http://a.example/feed"] > timedelta(seconds=500)
+
+
+def test_async_session_handler_failure_is_recorded(test_db_engine, monkeypatch):
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from auto.scheduler import TASK_HANDLERS, register_task_handler
+
+    seen = {}
+
+    async def handler(task, session):
+        seen["session"] = session
+        await session.get(Post, "missing")
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(TASK_HANDLERS, "async_probe", handler)
+    monkeypatch.setattr("auto.scheduler.ASYNC_SESSION_HANDLERS", set())
+    register_task_handler("async_probe", async_session=True)(handler)
+
+    with SessionLocal() as session:
+        session.add(
+            Task(
+                type="async_probe",
+                scheduled_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+            )
+        )
+        session.commit()
+
+    asyncio.run(run_process())
+
+    assert isinstance(seen["session"], AsyncSession)
+    with SessionLocal() as session:
+        task = session.query(Task).filter(Task.type == "async_probe").one()
+        assert task.status == "error"
+        assert task.last_error == "boom"
+        assert task.attempts == 1
+        assert task.lease_expires_at is None
+
+
 def test_publish_failure_metrics(test_db_engine, monkeypatch):
     with SessionLocal() as session:
         post = Post(
@@ -199,16 +412,16 @@ def test_publish_failure_metrics(test_db_engine, monkeypatch):
 
 
 def test_create_preview_task(test_db_engine, monkeypatch):
-    monkeypatch.setattr(
-        "auto.scheduler._create_preview_for_task",
-        lambda session, post_id, network: session.add(
+    async def fake_create_preview(session, post_id, network):
+        session.add(
             PostPreview(
                 post_id=post_id,
                 network=network,
                 content="Generated preview",
             )
-        ),
-    )
+        )
+
+    monkeypatch.setattr("auto.scheduler._create_preview_for_task", fake_create_preview)
     with SessionLocal() as session:
         post = Post(
             id="3", title="T3", link="http://example3", summary="", published=""
@@ -302,3 +515,340 @@ def test_scheduler_start_stop(test_db_engine, monkeypatch):
         assert sched._worker.task is None
 
     asyncio.run(run())
+
+
+def _add_due_tasks(task_type: str, count: int) -> None:
+    with SessionLocal() as session:
+        for _ in range(count):
+            session.add(
+                Task(
+                    type=task_type,
+                    scheduled_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+                )
+            )
+        session.commit()
+
+
+def test_concurrent_dispatch_respects_limits(test_db_engine, monkeypatch):
+    from auto.scheduler import TASK_HANDLERS
+
+    in_flight = {"slow": 0, "fast": 0, "total": 0}
+    peak = {"slow": 0, "fast": 0, "total": 0}
+
+    def make_handler(kind):
+        async def handler(task, session):
+            in_flight[kind] += 1
+            in_flight["total"] += 1
+            peak[kind] = max(peak[kind], in_flight[kind])
+            peak["total"] = max(peak["total"], in_flight["total"])
+            await asyncio.sleep(0.01)
+            in_flight[kind] -= 1
+            in_flight["total"] -= 1
+
+        return handler
+
+    monkeypatch.setitem(TASK_HANDLERS, "slow_test", make_handler("slow"))
+    monkeypatch.setitem(TASK_HANDLERS, "fast_test", make_handler("fast"))
+    monkeypatch.setenv("SCHEDULER_CONCURRENCY", "3")
+    monkeypatch.setenv("SCHEDULER_TASK_LIMITS", "slow_test=1")
+
+    _add_due_tasks("slow_test", 3)
+    _add_due_tasks("fast_test", 3)
+
+    asyncio.run(run_process())
+
+    assert peak["slow"] == 1
+    assert peak["total"] == 3
+    with SessionLocal() as session:
+        statuses = {t.status for t in session.query(Task).all()}
+    assert statuses == {"completed"}
+
+
+def test_failing_task_does_not_affect_others(test_db_engine, monkeypatch):
+    from auto.scheduler import TASK_HANDLERS
+
+    async def failing(task, session):
+        session.add(Post(id="boom", title="t", link="l"))
+        raise RuntimeError("boom")
+
+    async def ok(task, session):
+        await asyncio.sleep(0)
+
+    monkeypatch.setitem(TASK_HANDLERS, "failing_test", failing)
+    monkeypatch.setitem(TASK_HANDLERS, "ok_test", ok)
+    monkeypatch.setenv("SCHEDULER_CONCURRENCY", "2")
+
+    _add_due_tasks("failing_test", 1)
+    _add_due_tasks("ok_test", 1)
+
+    asyncio.run(run_process())
+
+    with SessionLocal() as session:
+        by_type = {t.type: t for t in session.query(Task).all()}
+        assert by_type["failing_test"].status == "error"
+        assert by_type["failing_test"].last_error == "boom"
+        assert by_type["ok_test"].status == "completed"
+
+
+def test_claim_due_tasks_is_exclusive(test_db_engine):
+    from auto.scheduler import claim_due_tasks
+
+    _add_due_tasks("claim_test", 2)
+
+    with SessionLocal() as session:
+        first = claim_due_tasks(
+            session, worker_id="worker-a", max_attempts=3, lease_seconds=60
+        )
+    with SessionLocal() as session:
+        second = claim_due_tasks(
+            session, worker_id="worker-b", max_attempts=3, lease_seconds=60
+        )
+
+    assert len(first) == 2
+    assert second == []
+    with SessionLocal() as session:
+        tasks = session.query(Task).all()
+        assert {t.status for t in tasks} == {"running"}
+        assert {t.claimed_by for t in tasks} == {"worker-a"}
+        assert all(t.lease_expires_at is not None for t in tasks)
+
+
+def test_expired_lease_is_reclaimed(test_db_engine, monkeypatch):
+    from auto.scheduler import TASK_HANDLERS, claim_due_tasks
+
+    ran = []
+
+    async def handler(task, session):
+        ran.append(task.id)
+
+    monkeypatch.setitem(TASK_HANDLERS, "lease_test", handler)
+
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as session:
+        expired = Task(
+            type="lease_test",
+            status="running",
+            claimed_by="dead-worker",
+            lease_expires_at=now - timedelta(seconds=5),
+            scheduled_at=now - timedelta(minutes=1),
+        )
+        live = Task(
+            type="lease_test",
+            status="running",
+            claimed_by="live-worker",
+            lease_expires_at=now + timedelta(minutes=5),
+            scheduled_at=now - timedelta(minutes=1),
+        )
+        session.add_all([expired, live])
+        session.commit()
+        expired_id, live_id = expired.id, live.id
+
+    asyncio.run(process_pending(worker_id="new-worker"))
+
+    assert ran == [expired_id]
+    with SessionLocal() as session:
+        reclaimed = session.get(Task, expired_id)
+        assert reclaimed.status == "completed"
+        assert reclaimed.claimed_by == "new-worker"
+        assert reclaimed.lease_expires_at is None
+        assert session.get(Task, live_id).status == "running"
+        assert (
+            claim_due_tasks(
+                session, worker_id="other", max_attempts=3, lease_seconds=60
+            )
+            == []
+        )
+
+
+def test_renew_task_lease_requires_ownership(test_db_engine):
+    from auto.scheduler import claim_due_tasks, renew_task_lease
+
+    _add_due_tasks("renew_test", 1)
+    with SessionLocal() as session:
+        [(task_id, _)] = claim_due_tasks(
+            session, worker_id="worker-a", max_attempts=3, lease_seconds=1
+        )
+        before = session.get(Task, task_id).lease_expires_at
+
+    assert renew_task_lease(task_id, "worker-a", 600)
+    assert not renew_task_lease(task_id, "worker-b", 600)
+
+    with SessionLocal() as session:
+        assert session.get(Task, task_id).lease_expires_at > before
+
+
+def test_reclaimed_task_keeps_new_owners_state(test_db_engine, monkeypatch):
+    from auto.scheduler import TASK_HANDLERS, _run_task, claim_due_tasks
+
+    async def handler(task, session):
+        # Another scheduler reclaims the task while this handler runs.
+        with SessionLocal() as other:
+            stolen = other.get(Task, task.id)
+            stolen.claimed_by = "worker-b"
+            other.commit()
+
+    monkeypatch.setitem(TASK_HANDLERS, "stale_test", handler)
+    _add_due_tasks("stale_test", 1)
+    with SessionLocal() as session:
+        [(task_id, _)] = claim_due_tasks(
+            session, worker_id="worker-a", max_attempts=3, lease_seconds=60
+        )
+
+    asyncio.run(_run_task(task_id, "worker-a", 60))
+
+    with SessionLocal() as session:
+        task = session.get(Task, task_id)
+        assert task.status == "running"
+        assert task.claimed_by == "worker-b"
+        assert task.attempts == 0
+        assert task.lease_expires_at is not None
+
+
+def test_blocking_handler_keeps_its_lease(test_db_engine, monkeypatch):
+    import time
+
+    from auto.scheduler import TASK_HANDLERS, _run_task, claim_due_tasks
+
+    leases = []
+
+    async def handler(task, session):
+        # Block the event loop for longer than the lease.
+        time.sleep(0.6)
+        with SessionLocal() as other:
+            leases.append(other.get(Task, task.id).lease_expires_at)
+
+    monkeypatch.setitem(TASK_HANDLERS, "blocking_test", handler)
+    _add_due_tasks("blocking_test", 1)
+    with SessionLocal() as session:
+        [(task_id, _)] = claim_due_tasks(
+            session, worker_id="worker-a", max_attempts=3, lease_seconds=0.3
+        )
+        claimed_until = session.get(Task, task_id).lease_expires_at
+
+    asyncio.run(_run_task(task_id, "worker-a", 0.3))
+
+    assert leases[0] > claimed_until
+    with SessionLocal() as session:
+        assert session.get(Task, task_id).status == "completed"
+
+
+def test_expired_lease_is_not_started_twice(test_db_engine, monkeypatch):
+    import time
+
+    from auto.scheduler import TASK_HANDLERS, _run_task, claim_due_tasks
+
+    runs = []
+
+    async def handler(task, session):
+        runs.append(task.claimed_by)
+
+    monkeypatch.setitem(TASK_HANDLERS, "expired_test", handler)
+    _add_due_tasks("expired_test", 1)
+    with SessionLocal() as session:
+        [(task_id, _)] = claim_due_tasks(
+            session, worker_id="worker-a", max_attempts=3, lease_seconds=0.3
+        )
+
+    # Worker A waits for a dispatch slot past its lease.
+    time.sleep(0.5)
+    asyncio.run(_run_task(task_id, "worker-a", 0.3))
+    with SessionLocal() as session:
+        assert claim_due_tasks(
+            session, worker_id="worker-b", max_attempts=3, lease_seconds=60
+        ) == [(task_id, "expired_test")]
+    asyncio.run(_run_task(task_id, "worker-b", 60))
+
+    assert runs == ["worker-b"]
+    with SessionLocal() as session:
+        task = session.get(Task, task_id)
+        assert task.status == "completed"
+        assert task.attempts == 1
+
+
+def test_tasks_due_index_exists(test_db_engine):
+    from sqlalchemy import inspect
+
+    indexes = {ix["name"]: ix for ix in inspect(test_db_engine).get_indexes("tasks")}
+    assert indexes["ix_tasks_status_scheduled_at"]["column_names"] == [
+        "status",
+        "scheduled_at",
+    ]
+
+
+def test_claim_query_uses_due_index(test_db_engine):
+    from sqlalchemy import event
+    from auto.scheduler import claim_due_tasks
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT tasks.id"):
+            statements.append((statement, parameters))
+
+    event.listen(test_db_engine, "before_cursor_execute", capture)
+    try:
+        with SessionLocal() as session:
+            claim_due_tasks(
+                session, worker_id="w", max_attempts=3, lease_seconds=60, limit=10
+            )
+    finally:
+        event.remove(test_db_engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    with test_db_engine.connect() as conn:
+        plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    assert any("ix_tasks_status_scheduled_at" in row[-1] for row in plan)
+
+
+def test_claim_due_tasks_respects_batch_limit(test_db_engine, monkeypatch):
+    from auto.scheduler import TASK_HANDLERS
+
+    async def handler(task, session):
+        pass
+
+    monkeypatch.setitem(TASK_HANDLERS, "batch_test", handler)
+    monkeypatch.setenv("SCHEDULER_BATCH_SIZE", "2")
+    _add_due_tasks("batch_test", 3)
+
+    assert asyncio.run(process_pending()) == 2
+    with SessionLocal() as session:
+        statuses = sorted(t.status for t in session.query(Task).all())
+    assert statuses == ["completed", "completed", "pending"]
+
+
+def test_task_timings_are_recorded(test_db_engine, monkeypatch):
+    from prometheus_client import REGISTRY
+
+    from auto.scheduler import TASK_HANDLERS
+
+    def sample(name):
+        return REGISTRY.get_sample_value(name, {"type": "timed"}) or 0.0
+
+    names = [
+        "task_handler_duration_seconds_sum",
+        "task_handler_duration_seconds_count",
+        "task_queue_wait_seconds_sum",
+        "task_commit_duration_seconds_count",
+    ]
+    before = {name: sample(name) for name in names}
+
+    async def handler(task, session):
+        await asyncio.sleep(0.02)
+
+    monkeypatch.setitem(TASK_HANDLERS, "timed", handler)
+    with SessionLocal() as session:
+        session.add(
+            Task(
+                type="timed",
+                scheduled_at=datetime.now(timezone.utc) - timedelta(seconds=30),
+            )
+        )
+        session.commit()
+
+    asyncio.run(run_process())
+
+    delta = {name: sample(name) - before[name] for name in names}
+    assert delta["task_handler_duration_seconds_sum"] >= 0.02
+    assert delta["task_handler_duration_seconds_count"] == 1
+    assert delta["task_queue_wait_seconds_sum"] >= 30
+    assert delta["task_commit_duration_seconds_count"] == 1
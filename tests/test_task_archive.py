@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from auto.cli import maintenance
+from auto.db import SessionLocal
+from auto.models import Task, TaskArchive
+from auto.task_archive import archive_tasks, handle_archive_tasks
+
+
+def _add_tasks(now):
+    old = now - timedelta(days=10)
+    with SessionLocal() as session:
+        session.add_all(
+            [
+                Task(type="done", status="completed", updated_at=old, payload="{}"),
+                Task(type="failed", status="error", attempts=3, updated_at=old),
+                Task(type="retry", status="error", attempts=1, updated_at=old),
+                Task(type="waiting", status="pending", updated_at=old),
+                Task(type="recent", status="completed", updated_at=now),
+            ]
+        )
+        session.commit()
+
+
+def test_archive_moves_old_finished_tasks(test_db_engine):
+    now = datetime.now(timezone.utc)
+    _add_tasks(now)
+
+    with SessionLocal() as session:
+        count = archive_tasks(
+            session,
+            older_than=timedelta(days=7),
+            max_attempts=3,
+            batch_size=1,
+            now=now,
+        )
+
+    assert count == 2
+    with SessionLocal() as session:
+        remaining = sorted(t.type for t in session.query(Task).all())
+        archived = {a.type: a for a in session.query(TaskArchive).all()}
+    assert remaining == ["recent", "retry", "waiting"]
+    assert sorted(archived) == ["done", "failed"]
+    assert archived["done"].payload == "{}"
+    assert archived["failed"].attempts == 3
+    assert archived["done"].archived_at is not None
+
+
+def test_archive_tasks_handler_reschedules(test_db_engine, monkeypatch):
+    monkeypatch.setenv("TASK_RETENTION_DAYS", "7")
+    _add_tasks(datetime.now(timezone.utc))
+
+    with SessionLocal() as session:
+        task = Task(type="archive_tasks", status="running")
+        session.add(task)
+        session.commit()
+        asyncio.run(handle_archive_tasks(task, session))
+        session.commit()
+
+        assert session.query(TaskArchive).count() == 2
+        assert session.query(Task).filter(Task.type == "archive_tasks").count() == 2
+
+
+def test_archive_tasks_cli(test_db_engine, capsys):
+    _add_tasks(datetime.now(timezone.utc))
+
+    maintenance.archive_tasks(older_than_days=1, batch_size=None)
+
+    assert "Archived 2 task(s)" in capsys.readouterr().out
+
+
+def test_archive_updates_task_gauges(test_db_engine):
+    from auto.metrics import TASKS
+
+    def gauge(task_type, status):
+        return TASKS.labels(task_type, status)._value.get()
+
+    now = datetime.now(timezone.utc)
+    _add_tasks(now)
+    done, failed = gauge("done", "completed"), gauge("failed", "error")
+    recent = gauge("recent", "completed")
+
+    with SessionLocal() as session:
+        archive_tasks(
+            session,
+            older_than=timedelta(days=7),
+            max_attempts=3,
+            batch_size=10,
+            now=now,
+        )
+
+    assert gauge("done", "completed") == done - 1
+    assert gauge("failed", "error") == failed - 1
+    assert gauge("recent", "completed") == recent
+
+
+def test_archive_survives_reused_task_ids(test_db_engine):
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=10)
+
+    def archive_newest():
+        with SessionLocal() as session:
+            task = Task(type="done", status="completed", updated_at=old)
+            session.add(task)
+            session.commit()
+            task_id = task.id
+            archive_tasks(
+                session,
+                older_than=timedelta(days=7),
+                max_attempts=3,
+                batch_size=10,
+                now=now,
+            )
+        return task_id
+
+    # SQLite hands the id of an archived newest task to the next one.
+    first = archive_newest()
+    second = archive_newest()
+
+    with SessionLocal() as session:
+        archived = session.query(TaskArchive).order_by(TaskArchive.id).all()
+    assert [a.task_id for a in archived] == [first, second]
+    assert len({a.id for a in archived}) == 2
@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from auto.db import SessionLocal
+from auto.models import Task
+from auto.scheduler import Scheduler, seconds_until_next_task
+from auto.task_notify import TaskWakeup, doorbell_dir, notify_task_enqueued
+
+
+def test_notify_wakes_in_process_listener(test_db_engine, monkeypatch, tmp_path):
+    monkeypatch.setenv("SCHEDULER_DOORBELL_DIR", str(tmp_path / "bells"))
+    woken = []
+
+    async def run():
+        wakeup = TaskWakeup(lambda: woken.append("in-process"))
+        await wakeup.start()
+        notify_task_enqueued()
+        await wakeup.stop()
+        notify_task_enqueued()
+
+    asyncio.run(run())
+
+    assert woken == ["in-process"]
+
+
+def test_doorbell_wakes_listener_from_ring(test_db_engine, monkeypatch, tmp_path):
+    from auto.task_notify import _listeners, _ring_doorbells
+
+    bells = tmp_path / "bells"
+    monkeypatch.setenv("SCHEDULER_DOORBELL_DIR", str(bells))
+    assert doorbell_dir(test_db_engine) == bells
+
+    async def run():
+        rang = asyncio.Event()
+        wakeup = TaskWakeup(rang.set)
+        await wakeup.start()
+        # Drop the in-process hook so only the socket can deliver the wakeup.
+        _listeners.discard(wakeup._callback)
+        assert list(bells.glob("*.sock"))
+        _ring_doorbells(bells)
+        await asyncio.wait_for(rang.wait(), timeout=1)
+        await wakeup.stop()
+
+    asyncio.run(run())
+
+    assert not list(bells.glob("*.sock"))
+
+
+def test_seconds_until_next_task(test_db_engine):
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as session:
+        assert (
+            seconds_until_next_task(session, max_attempts=3, retry_interval=5, now=now)
+            is None
+        )
+        session.add(Task(type="later", scheduled_at=now + timedelta(seconds=30)))
+        session.commit()
+        delay = seconds_until_next_task(
+            session, max_attempts=3, retry_interval=5, now=now
+        )
+        assert 29 <= delay <= 30
+
+        session.add(Task(type="retry", status="error", attempts=1, scheduled_at=now))
+        session.commit()
+        assert (
+            seconds_until_next_task(session, max_attempts=3, retry_interval=5, now=now)
+            == 5
+        )
+
+
+def test_scheduler_wakes_when_task_enqueued(test_db_engine, monkeypatch, tmp_path):
+    from auto.scheduler import TASK_HANDLERS
+
+    monkeypatch.setattr("auto.ingest_scheduler.ensure_initial_task", lambda s: None)
+    monkeypatch.setattr("auto.replay_scanner.ensure_initial_task", lambda s: None)
+    monkeypatch.setenv("SCHEDULER_DOORBELL_DIR", str(tmp_path / "bells"))
+    monkeypatch.setenv("SCHEDULER_MAX_SLEEP", "60")
+
+    async def run():
+        done = asyncio.Event()
+
+        async def handler(task, session):
+            done.set()
+
+        monkeypatch.setitem(TASK_HANDLERS, "wake_test", handler)
+        sched = Scheduler()
+        await sched.start()
+        await asyncio.sleep(0.05)
+        with SessionLocal() as session:
+            session.add(Task(type="wake_test"))
+            session.commit()
+        notify_task_enqueued()
+        await asyncio.wait_for(done.wait(), timeout=2)
+        await sched.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,64 @@
+import pytest
+from jinja2 import Template
+from jinja2.exceptions import SecurityError
+
+from auto import templating
+from auto.templating import TEMPLATE_CACHE_LOOKUPS, TemplateEngine
+
+
+def _lookups(result: str) -> float:
+    return TEMPLATE_CACHE_LOOKUPS.labels(result=result)._value.get()
+
+
+def test_templates_are_compiled_once():
+    engine = TemplateEngine()
+    hits, misses = _lookups("hit"), _lookups("miss")
+
+    first = engine.get_template("Hello {{ name }}")
+    second = engine.get_template("Hello {{ name }}")
+
+    assert first is second
+    assert _lookups("miss") == misses + 1
+    assert _lookups("hit") == hits + 1
+
+
+def test_least_recently_used_template_is_evicted():
+    engine = TemplateEngine(max_size=2)
+    a = engine.get_template("a")
+    engine.get_template("b")
+    engine.get_template("a")
+    engine.get_template("c")
+
+    misses = _lookups("miss")
+
+    assert engine.get_template("a") is a
+    assert _lookups("miss") == misses
+    engine.get_template("b")
+    assert _lookups("miss") == misses + 1
+    assert len(engine._cache) == 2
+
+
+def test_output_matches_plain_jinja():
+    source = "{{ post.title | upper }} {% for t in tags %}#{{ t }} {% endfor %}"
+    variables = {"post": {"title": "hi"}, "tags": ["a", "b"]}
+
+    assert TemplateEngine().render(source, **variables) == Template(source).render(
+        **variables
+    )
+
+
+def test_sandbox_blocks_unsafe_attributes():
+    source = "{{ ''.__class__.__mro__ }}"
+    with pytest.raises(SecurityError):
+        TemplateEngine(sandboxed=True).render(source)
+
+
+def test_shared_engine_follows_config(monkeypatch):
+    monkeypatch.setenv("TEMPLATE_SANDBOX", "1")
+    monkeypatch.setenv("TEMPLATE_CACHE_SIZE", "3")
+
+    engine = templating.get_template_engine()
+
+    assert engine.sandboxed and engine.max_size == 3
+    assert templating.get_template_engine() is engine
+    assert templating.render_template("{{ x }}", x=1) == "1"
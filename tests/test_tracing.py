@@ -0,0 +1,35 @@
+import sys
+import types
+
+from auto import tracing
+
+
+def test_span_is_noop_when_disabled(monkeypatch):
+    monkeypatch.delenv("TRACING_ENABLED", raising=False)
+
+    with tracing.span("work", key="value") as current:
+        current.set_attribute("other", 1)
+
+    assert not tracing.tracing_active()
+
+
+def test_span_uses_opentelemetry_when_enabled(monkeypatch):
+    started = []
+
+    class FakeTracer:
+        def start_as_current_span(self, name, attributes=None):
+            started.append((name, attributes))
+            from contextlib import nullcontext
+
+            return nullcontext("span")
+
+    trace = types.SimpleNamespace(get_tracer=lambda name: FakeTracer())
+    otel = types.ModuleType("opentelemetry")
+    otel.trace = trace
+    monkeypatch.setitem(sys.modules, "opentelemetry", otel)
+    monkeypatch.setattr(tracing, "tracing_active", lambda: True)
+
+    with tracing.span("task publish_post", **{"task.id": 1}) as current:
+        assert current == "span"
+
+    assert started == [("task publish_post", {"task.id": 1})]